@@ -1,7 +1,20 @@
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./data/mod_checker.db"
+    DELETION_LOG_RETENTION_DAYS: int = 30  # Tombstones older than this are pruned, older since= tokens get 410
+    GZIP_MINIMUM_SIZE: int = 1024  # Responses at least this many bytes are gzip-compressed, 0 disables
+    PROJECT_ID_REVALIDATE_HOURS: int = 24  # Stored Modrinth project ids are re-resolved after this long
+    DEPENDENCY_VERSIONS_REVALIDATE_MINUTES: int = 60  # Version lists of untracked dependencies are refetched after this long
+    HEDGE_REQUESTS: bool = False  # Send a second Modrinth request when one takes longer than its endpoint's p95
+    HEDGE_MAX_RATIO: float = 0.05  # Hedges never exceed this fraction of all Modrinth requests
+    # Loaders that also run mods built for other loaders, e.g. Quilt loads Fabric mods
+    LOADER_COMPATIBILITY: Dict[str, List[str]] = {"quilt": ["fabric"]}
+    MANIFEST_POLL_INTERVAL: int = 60  # Seconds between conditional polls of the Mojang manifest, 0 disables
+    HASH_WORKERS: int = 8  # Threads hashing jar files during file imports
+    MODS_IMPORT_ROOT: str = ""  # Server directory whose mod folders may be imported by path, empty disables
 
     class Config:
         case_sensitive = True
@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from contextlib import contextmanager
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from app.core.config import settings
+from app.core import generation  # noqa: F401 - registers write tracking on all sessions
 
 engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -12,3 +14,15 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def read_transaction(db: Session):
+    """Run several reads against one consistent snapshot, discarding the transaction afterwards"""
+    # pysqlite only opens transactions before writes, so start one explicitly for reads
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(text("BEGIN"))
+    try:
+        yield db
+    finally:
+        db.rollback()
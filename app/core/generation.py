@@ -0,0 +1,58 @@
+import threading
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Distinguishes generations of this process from those of a previous run,
+# so a client holding an ETag from before a restart never gets a false 304.
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+_lock = threading.Lock()
+_generation = 0
+
+
+def current_generation() -> int:
+    """Get the current data generation"""
+    return _generation
+
+
+def bump_generation() -> int:
+    """Advance the data generation after a committed write"""
+    global _generation
+    with _lock:
+        _generation += 1
+        return _generation
+
+
+def generation_etag(generation: int) -> str:
+    """Build the ETag value for a data generation"""
+    return f'W/"{_BOOT_ID}-{generation}"'
+
+
+# Every session (routers, background service, tests) reports its writes here,
+# so individual write paths don't have to remember to bump the generation.
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["data_changed"] = True
+
+
+@event.listens_for(Session, "after_bulk_update")
+def _mark_bulk_update(update_context):
+    update_context.session.info["data_changed"] = True
+
+
+@event.listens_for(Session, "after_bulk_delete")
+def _mark_bulk_delete(delete_context):
+    delete_context.session.info["data_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    if session.info.pop("data_changed", False):
+        bump_generation()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("data_changed", None)
@@ -0,0 +1,41 @@
+from datetime import date, datetime
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Naive datetimes are UTC in this database, orjson tags them without a per-row replace()
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def _default(obj: Any):
+    """Encode types the JSON encoders don't know natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, datetime):
+        return format_datetime(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def format_datetime(value: datetime) -> str:
+    """Format a datetime like the API schemas do; naive values are stored as UTC"""
+    if value.tzinfo is None:
+        return value.isoformat() + "Z"
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for plain rows (dicts, lists, tuples) that skips per-row pydantic validation.
+    Endpoints keep their response_model for documentation only.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,28 +1,36 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, Response
 from contextlib import asynccontextmanager
 import asyncio
 
+from app.core.config import settings
 from app.core.database import Base, engine
-from app.routers import versions, mods, results
-from app.services.background import background_loop
+from app.core.generation import current_generation, generation_etag
+from app.routers import versions, mods, results, events, dashboard, jobs, upstream, profiles
+from app.services.background import background_loop, watch_manifest_loop
+from app.services.read_model import invalidate_read_model
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Start background job
-    bg_task = asyncio.create_task(background_loop())
+    # Startup: Warm the results read model and start background jobs
+    invalidate_read_model(engine)
+    tasks = [asyncio.create_task(background_loop())]
+    if settings.MANIFEST_POLL_INTERVAL > 0:
+        tasks.append(asyncio.create_task(watch_manifest_loop()))
     yield
-    # Shutdown: No specific cleanup for background loop needed as it's daemon-like, 
+    # Shutdown: No specific cleanup for background loops needed as they're daemon-like,
     # but could cancel if we kept a reference.
-    bg_task.cancel()
-    try:
-        await bg_task
-    except asyncio.CancelledError:
-        pass
+    for task in tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
 app = FastAPI(title="Minecraft Mod Compatibility Checker", lifespan=lifespan)
 
@@ -32,14 +40,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Sync-Token", "ETag"],
 )
 
+if settings.GZIP_MINIMUM_SIZE > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
+
+# Endpoints whose responses don't derive from the database
+ETAG_EXCLUDED_PATHS = ("/api/events", "/api/jobs", "/api/upstream")
+
+
+@app.middleware("http")
+async def generation_etag_middleware(request: Request, call_next):
+    """Answer conditional API reads with 304 while the data generation is unchanged"""
+    path = request.url.path
+    if request.method != "GET" or not path.startswith("/api/") or path.startswith(ETAG_EXCLUDED_PATHS):
+        return await call_next(request)
+
+    # Read the generation before the handler runs, so a concurrent write yields a stale tag, never a stale body
+    etag = generation_etag(current_generation())
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
 from fastapi.staticfiles import StaticFiles
 
 # Include routers
 app.include_router(versions.router)
 app.include_router(mods.router)
 app.include_router(results.router)
+app.include_router(events.router)
+app.include_router(dashboard.router)
+app.include_router(jobs.router)
+app.include_router(upstream.router)
+app.include_router(profiles.router)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    Column, Integer, SmallInteger, String, DateTime, Boolean, ForeignKey, UniqueConstraint, Index, LargeBinary, event
+)
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -13,9 +15,10 @@ class MCVersion(Base):
     loader = Column(String, nullable=False, index=True)   # fabric, forge, quilt
     type = Column(String)  # release, snapshot
     url = Column(String)
-    release_time = Column(DateTime)
+    release_time = Column(DateTime, index=True)
     is_current = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     __table_args__ = (
         UniqueConstraint('version', 'loader', name='uix_version_loader'),
@@ -27,14 +30,23 @@ class TrackedMod(Base):
     __tablename__ = "tracked_mods"
     
     slug = Column(String, primary_key=True)  # Mod slug is unique identifier
+    project_id = Column(String, nullable=True, index=True)  # Stable Modrinth id, survives slug renames
+    project_id_checked_at = Column(DateTime, nullable=True)  # Last time project_id was resolved or revalidated
     side = Column(String, nullable=False)  # client, server, both
     channel = Column(String, default="release", nullable=False)  # release, beta, alpha
     supported_client_side = Column(String, nullable=True)  # required, optional, unsupported
     supported_server_side = Column(String, nullable=True)  # required, optional, unsupported
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    catalog_updated_at = Column(DateTime, nullable=True)  # Last change of the stored catalog, NULL until first fetched
+    # Tracked only for profiles: catalogs are fetched, but global lists, results and exports leave it out
+    profile_only = Column(Boolean, nullable=False, default=False, server_default="0")
     
     # Relationship to mod versions
     mod_versions = relationship("ModVersion", back_populates="tracked_mod", cascade="all, delete-orphan")
+    outcome = relationship("ModOutcome", uselist=False, cascade="all, delete-orphan")
+    catalog = relationship("CatalogVersion", cascade="all, delete-orphan")
+    profile_entries = relationship("ProfileMod", cascade="all, delete-orphan")
 
 
 class ModVersion(Base):
@@ -47,7 +59,9 @@ class ModVersion(Base):
     version_number = Column(String, nullable=False)  # Human-readable version
     mc_version_id = Column(Integer, ForeignKey('mc_versions.id'), nullable=False, index=True)
     loader = Column(String, nullable=False, index=True)  # fabric, forge, quilt
+    source_loader = Column(String, nullable=True)  # Loader the version was built for when it isn't `loader`
     channel = Column(String, nullable=False)  # release, beta, alpha
+    installed = Column(Boolean, nullable=False, default=False, server_default="0")  # Baseline found by a file import
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -69,7 +83,9 @@ class CompatibilityResult(Base):
     mc_version_id = Column(Integer, ForeignKey('mc_versions.id'), nullable=False, index=True)
     status = Column(String, nullable=False, index=True)  # compatible, incompatible, error
     error = Column(String, nullable=True)
-    checked_at = Column(DateTime, default=datetime.utcnow)
+    checked_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Only moves when status, error or the installed baseline change, re-checks that confirm a result don't count
+    updated_at = Column(DateTime, default=datetime.utcnow, index=True)
     
     # Relationships
     mod_version = relationship("ModVersion", back_populates="compatibility_results")
@@ -80,9 +96,155 @@ class CompatibilityResult(Base):
     )
 
 
+class CatalogVersion(Base):
+    """Every Modrinth version of a tracked mod, compatibility is resolved from these without network calls"""
+    __tablename__ = "catalog_versions"
+
+    id = Column(String, primary_key=True)             # Modrinth version ID
+    mod_slug = Column(String, ForeignKey('tracked_mods.slug', ondelete='CASCADE'), nullable=False, index=True)
+    project_id = Column(String, nullable=True)        # Modrinth project ID
+    version_number = Column(String, nullable=False)
+    version_type = Column(String, nullable=False)     # release, beta, alpha
+    date_published = Column(DateTime)
+
+    game_versions = relationship("CatalogGameVersion", cascade="all, delete-orphan")
+    loaders = relationship("CatalogLoader", cascade="all, delete-orphan")
+    dependencies = relationship("CatalogDependency", cascade="all, delete-orphan")
+
+
+class CatalogGameVersion(Base):
+    """Minecraft versions a catalog version supports"""
+    __tablename__ = "catalog_game_versions"
+
+    version_id = Column(String, ForeignKey('catalog_versions.id', ondelete='CASCADE'), primary_key=True)
+    game_version = Column(String, primary_key=True, index=True)
+
+
+class CatalogLoader(Base):
+    """Loaders a catalog version supports"""
+    __tablename__ = "catalog_loaders"
+
+    version_id = Column(String, ForeignKey('catalog_versions.id', ondelete='CASCADE'), primary_key=True)
+    loader = Column(String, primary_key=True, index=True)
+
+
+class CatalogDependency(Base):
+    """Dependencies a catalog version declares, on a project and optionally a specific version of it"""
+    __tablename__ = "catalog_dependencies"
+
+    id = Column(Integer, primary_key=True)
+    version_id = Column(String, ForeignKey('catalog_versions.id', ondelete='CASCADE'), nullable=False, index=True)
+    project_id = Column(String, nullable=True)
+    dependency_version_id = Column(String, nullable=True)
+    dependency_type = Column(String, nullable=False)  # required, optional, incompatible, embedded
+
+
+class ModOutcome(Base):
+    """
+    Outcome of the latest check of a mod against every target, as bitsets over MCVersion ids.
+    Unlike CompatibilityResult this also records incompatible and failed checks.
+    """
+    __tablename__ = "mod_outcomes"
+
+    mod_slug = Column(String, ForeignKey('tracked_mods.slug', ondelete='CASCADE'), primary_key=True)
+    compatible = Column(LargeBinary, default=b"")    # little-endian bitsets, bit n is MCVersion.id n
+    incompatible = Column(LargeBinary, default=b"")
+    errored = Column(LargeBinary, default=b"")
+    checked = Column(LargeBinary, default=b"")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class OutcomeTransition(Base):
+    """
+    Append-only history of outcome changes: a row each time a mod's state on a target
+    changes, re-checks that confirm the state add nothing.
+    """
+    __tablename__ = "outcome_transitions"
+
+    id = Column(Integer, primary_key=True)
+    mod_slug = Column(String, nullable=False)
+    mc_version_id = Column(Integer, nullable=False)
+    state = Column(SmallInteger, nullable=False)  # index into outcomes.STATES
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_outcome_transitions_target_time", "mc_version_id", "changed_at"),
+        Index("ix_outcome_transitions_target_mod", "mc_version_id", "mod_slug", "state", "changed_at"),
+    )
+
+
+class Profile(Base):
+    """
+    A named mod list for one server, with its own current version.
+    Profiles share tracked mods and their catalogs, so overlapping lists are fetched once.
+    Mods added only through profiles are `profile_only` and dropped with their last profile entry.
+    """
+    __tablename__ = "profiles"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+    current_version_id = Column(Integer, ForeignKey('mc_versions.id'), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    current_version = relationship("MCVersion")
+    mods = relationship("ProfileMod", cascade="all, delete-orphan", order_by="ProfileMod.added_at")
+
+
+class ProfileMod(Base):
+    """A tracked mod in a profile, with the side and channel that profile uses it with"""
+    __tablename__ = "profile_mods"
+
+    profile_id = Column(Integer, ForeignKey('profiles.id', ondelete='CASCADE'), primary_key=True)
+    mod_slug = Column(String, ForeignKey('tracked_mods.slug', ondelete='CASCADE'), primary_key=True, index=True)
+    side = Column(String, nullable=False)  # client, server, both
+    channel = Column(String, default="release", nullable=False)  # release, beta, alpha
+    added_at = Column(DateTime, default=datetime.utcnow)
+
+
 class LogEntry(Base):
     __tablename__ = "logs"
     id = Column(Integer, primary_key=True)
     level = Column(String)  # INFO, WARNING, ERROR
     message = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Deletion(Base):
+    """Tombstones of deleted rows for incremental sync (?since=)"""
+    __tablename__ = "deletions"
+    id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)  # table name of the deleted row
+    key = Column(String, nullable=False)     # primary key of the deleted row
+    deleted_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+def _record_deletion(mapper, connection, target):
+    key = mapper.primary_key_from_instance(target)[0]
+    connection.execute(Deletion.__table__.insert().values(
+        entity=mapper.local_table.name, key=str(key), deleted_at=datetime.utcnow()
+    ))
+
+
+# Mapper events also fire for rows removed by relationship cascades
+for _model in (MCVersion, TrackedMod, CompatibilityResult):
+    event.listen(_model, "after_delete", _record_deletion)
+
+
+def _forget_mod_history(mapper, connection, target):
+    connection.execute(OutcomeTransition.__table__.delete().where(OutcomeTransition.mod_slug == target.slug))
+
+
+def _forget_target_history(mapper, connection, target):
+    # SQLite may hand a deleted target's id to a new one
+    connection.execute(OutcomeTransition.__table__.delete().where(OutcomeTransition.mc_version_id == target.id))
+
+
+def _release_profile_targets(mapper, connection, target):
+    connection.execute(Profile.__table__.update().where(
+        Profile.current_version_id == target.id
+    ).values(current_version_id=None))
+
+
+event.listen(TrackedMod, "after_delete", _forget_mod_history)
+event.listen(MCVersion, "after_delete", _forget_target_history)
+event.listen(MCVersion, "after_delete", _release_profile_targets)
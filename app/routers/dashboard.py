@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.core.database import get_db, read_transaction
+from app.core.serialization import FastJSONResponse
+from app.schemas.all import DashboardResponse
+from app.routers.mods import fetch_mods
+from app.routers.results import fetch_logs, fetch_summaries, get_status
+from app.routers.versions import get_current_version, fetch_versions
+
+router = APIRouter(
+    prefix="/api/dashboard",
+    tags=["dashboard"]
+)
+
+# Dashboard sections and the endpoint logic that loads each of them
+DASHBOARD_SECTIONS = {
+    "versions": fetch_versions,
+    "mods": fetch_mods,
+    "current_version": get_current_version,
+    "status": get_status,
+    "logs": fetch_logs,
+    # Not the read model, which may be newer or older than the transaction
+    "summaries": fetch_summaries,
+}
+
+
+@router.get("", response_model=DashboardResponse)
+def get_dashboard(
+    include: Optional[str] = Query(None, description="Comma-separated sections to return (default: all)"),
+    db: Session = Depends(get_db)
+):
+    """Get everything the dashboard needs in one round trip, read from a single transaction"""
+    if include:
+        sections = [s.strip() for s in include.split(",") if s.strip()]
+        unknown = [s for s in sections if s not in DASHBOARD_SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+    else:
+        sections = list(DASHBOARD_SECTIONS)
+
+    with read_transaction(db):
+        data = {section: DASHBOARD_SECTIONS[section](db=db) for section in sections}
+    # Sections are plain rows and schemas, only the requested keys are returned
+    return FastJSONResponse(data)
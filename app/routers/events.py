@@ -0,0 +1,38 @@
+import asyncio
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from app.services.events import broadcaster, format_sse
+
+router = APIRouter(
+    prefix="/api/events",
+    tags=["events"]
+)
+
+# Seconds between keep-alive comments, so proxies don't close idle streams
+HEARTBEAT_INTERVAL = 15
+
+
+@router.get("")
+async def stream_events(request: Request):
+    """Server-Sent Events stream of data changes, job progress and new log lines"""
+    queue = broadcaster.subscribe()
+
+    async def event_stream():
+        try:
+            yield format_sse("connected", {})
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(message["event"], message["data"])
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException
+from typing import List
+
+from app.schemas.all import JobResponse
+from app.services.jobs import get_job, list_jobs
+
+router = APIRouter(
+    prefix="/api/jobs",
+    tags=["jobs"]
+)
+
+
+@router.get("", response_model=List[JobResponse])
+def get_jobs():
+    """Get recent background jobs, newest first"""
+    return [job.to_dict() for job in list_jobs()]
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job_progress(job_id: str):
+    """Get the progress of a background job"""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
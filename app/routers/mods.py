@@ -1,134 +1,250 @@
+import os
+import shutil
+import tempfile
+import zipfile
 import yaml
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Body, Query
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Body, Query, File, Form, UploadFile
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Union
 from app.core.database import get_db
-from app.models.all import TrackedMod, LogEntry, MCVersion, ModVersion, CompatibilityResult
-from app.schemas.all import TrackedModResponse, TrackedModSchema
-from app.services.background import check_single_mod_task
-from app.services.modrinth import get_mod_details
-
-class LiteralString(str):
-    pass
-
-def literal_string_representer(dumper, data):
-    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
-
-yaml.add_representer(LiteralString, literal_string_representer)
+from app.models.all import TrackedMod, LogEntry
+from app.schemas.all import TrackedModResponse, TrackedModSchema, ExportBatchSchema, TrackedModBatchSchema, TrackedModBatchResponse, TrackedModDeltaResponse, DependencyReportResponse
+from app.services.background import (
+    adopt_mod, check_single_mod_task, check_mods_task, import_mods_task, import_files_task, reresolve_mod_task
+)
+from app.services.events import publish, publish_log, mod_event_payload
+from app.services.export import ExportError, export_targets
+from app.services.jobs import create_job, finish_job
+from app.services.mod_files import CHUNK_SIZE, import_directory
+from app.services.sync import since_param, sync_token, deleted_keys, sync_response
 
 router = APIRouter(
     prefix="/api/mods",
     tags=["mods"]
 )
 
+VALID_SIDES = ["client", "server", "both"]
+VALID_CHANNELS = ["release", "beta", "alpha"]
+
 def add_log(db: Session, level: str, message: str):
     log = LogEntry(level=level, message=message)
     db.add(log)
     db.commit()
+    publish_log(log)
+
+MOD_FIELDS = ("slug", "project_id", "side", "channel", "supported_client_side", "supported_server_side", "created_at")
 
-@router.get("", response_model=List[TrackedModResponse])
-def get_mods(db: Session = Depends(get_db)):
-    """Get all tracked mods"""
-    mods = db.query(TrackedMod).all()
-    return mods
+
+def fetch_mods(db: Session, since: Optional[datetime] = None) -> List[dict]:
+    """Load tracked mods (changed since a point, if given) as plain rows, without those tracked only for profiles"""
+    query = db.query(*[getattr(TrackedMod, f) for f in MOD_FIELDS]).filter(TrackedMod.profile_only == False)
+    if since:
+        query = query.filter(TrackedMod.updated_at >= since)
+    return [dict(zip(MOD_FIELDS, row)) for row in query.all()]
+
+
+@router.get("", response_model=Union[List[TrackedModResponse], TrackedModDeltaResponse])
+def get_mods(since: Optional[datetime] = Depends(since_param), db: Session = Depends(get_db)):
+    """
+    Get all tracked mods.
+    With `since`, only mods changed after it plus the slugs of removed ones are returned.
+    """
+    token = sync_token()
+    if since is None:
+        return sync_response(token, fetch_mods(db))
+    return sync_response(
+        token,
+        fetch_mods(db, since),
+        deleted=deleted_keys(db, TrackedMod.__tablename__, since),
+        key="slug"
+    )
 
 @router.post("", response_model=TrackedModResponse)
-async def add_mod(data: TrackedModSchema, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
-    """Add a new mod to track"""
-    # Check if already exists
+def add_mod(data: TrackedModSchema, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """
+    Add a new mod to track.
+    Supported sides are filled in by the background check, which publishes a mod_updated event when done.
+    """
+    # Check if already exists, mods tracked only for profiles are adopted
     existing = db.query(TrackedMod).filter(TrackedMod.slug == data.slug).first()
-    if existing:
+    if existing and not existing.profile_only:
         raise HTTPException(status_code=400, detail=f"Mod {data.slug} is already tracked")
-    
-    # Fetch mod details to get supported sides
-    details = await get_mod_details(data.slug)
-    supported_client = details.get("client_side") if details else None
-    supported_server = details.get("server_side") if details else None
-
-    tracked_mod = TrackedMod(
-        slug=data.slug, 
-        side=data.side,
-        channel=data.channel,
-        supported_client_side=supported_client,
-        supported_server_side=supported_server
-    )
-    db.add(tracked_mod)
+
+    if existing:
+        tracked_mod = existing
+        adopt_mod(tracked_mod, data.side, data.channel)
+    else:
+        tracked_mod = TrackedMod(
+            slug=data.slug, 
+            side=data.side,
+            channel=data.channel
+        )
+        db.add(tracked_mod)
     db.commit()
     db.refresh(tracked_mod)
 
+    publish("mod_added", mod_event_payload(tracked_mod))
     add_log(db, "INFO", f"Mod {data.slug} added for tracking (channel: {data.channel})")
     
-    # Trigger background check
+    # Trigger background enrichment and check
     background_tasks.add_task(check_single_mod_task, tracked_mod.slug)
     
     return tracked_mod
 
+@router.post("/batch", response_model=TrackedModBatchResponse)
+def batch_update_mods(data: TrackedModBatchSchema, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """
+    Add, update and delete many mods in one transaction.
+    Nothing is applied if any change is invalid. Added mods and mods whose channel
+    changed are checked in one merged background job.
+    """
+    slugs = [m.slug for m in data.add] + [u.slug for u in data.update] + list(data.delete)
+    found = {m.slug: m for m in db.query(TrackedMod).filter(TrackedMod.slug.in_(slugs)).all()}
+    # Mods tracked only for profiles can be added (they are adopted), but not updated or deleted
+    existing = {slug: m for slug, m in found.items() if not m.profile_only}
+
+    errors = []
+    for mod in data.add:
+        if mod.slug in existing:
+            errors.append(f"Mod {mod.slug} is already tracked")
+        if mod.side not in VALID_SIDES:
+            errors.append(f"Invalid side value for {mod.slug}")
+        if mod.channel not in VALID_CHANNELS:
+            errors.append(f"Invalid channel value for {mod.slug}")
+    for update in data.update:
+        if update.slug not in existing:
+            errors.append(f"Mod {update.slug} not found")
+        if update.side is not None and update.side not in VALID_SIDES:
+            errors.append(f"Invalid side value for {update.slug}")
+        if update.channel is not None and update.channel not in VALID_CHANNELS:
+            errors.append(f"Invalid channel value for {update.slug}")
+    for slug in data.delete:
+        if slug not in existing:
+            errors.append(f"Mod {slug} not found")
+    if len(set(slugs)) != len(slugs):
+        errors.append("Each mod may only appear once per batch")
+    if errors:
+        raise HTTPException(status_code=400, detail="; ".join(errors))
+
+    added = []
+    for mod in data.add:
+        if mod.slug in found:
+            adopt_mod(found[mod.slug], mod.side, mod.channel)
+            added.append(found[mod.slug])
+        else:
+            added.append(TrackedMod(slug=mod.slug, side=mod.side, channel=mod.channel))
+    db.add_all(added)
+
+    updated = []
+    recheck = [m.slug for m in added]
+    for update in data.update:
+        tracked_mod = existing[update.slug]
+        if update.side is not None:
+            tracked_mod.side = update.side
+        if update.channel is not None and update.channel != tracked_mod.channel:
+            tracked_mod.channel = update.channel
+            recheck.append(tracked_mod.slug)
+        updated.append(tracked_mod)
+
+    for slug in data.delete:
+        db.delete(existing[slug])
+
+    log = LogEntry(
+        level="INFO",
+        message=f"Batch update: {len(added)} mods added, {len(updated)} updated, {len(data.delete)} removed"
+    )
+    db.add(log)
+    db.commit()
+    publish_log(log)
+
+    response = TrackedModBatchResponse(
+        added=[mod_event_payload(m) for m in added],
+        updated=[mod_event_payload(m) for m in updated],
+        deleted=list(data.delete)
+    )
+    for mod in response.added:
+        publish("mod_added", mod.model_dump(mode="json"))
+    for mod in response.updated:
+        publish("mod_updated", mod.model_dump(mode="json"))
+    for slug in response.deleted:
+        publish("mod_removed", {"slug": slug})
+
+    if recheck:
+        job = create_job("check_mods", total=len(recheck))
+        response.job_id = job.id
+        background_tasks.add_task(check_mods_task, recheck, job.id, [m.slug for m in added])
+
+    return response
+
 @router.delete("/{mod_slug}")
 def delete_mod(mod_slug: str, db: Session = Depends(get_db)):
     """Remove a mod from tracking"""
-    tracked_mod = db.query(TrackedMod).filter(TrackedMod.slug == mod_slug).first()
+    tracked_mod = db.query(TrackedMod).filter(TrackedMod.slug == mod_slug, TrackedMod.profile_only == False).first()
     if not tracked_mod:
         raise HTTPException(status_code=404, detail="Mod not found")
     
     # Cascade delete will handle mod_versions and compatibility_results
     db.delete(tracked_mod)
     db.commit()
+    publish("mod_removed", {"slug": mod_slug})
 
     add_log(db, "INFO", f"Mod {mod_slug} removed from tracking (including all versions and results)")
     return {"success": True}
 
+def dependency_summary(report: dict) -> dict:
+    return {"missing": report["missing"], "conflicts": report["conflicts"]}
+
+@router.get("/dependencies", response_model=DependencyReportResponse)
+def get_dependencies(mc_version: str = Query(...), loader: str = Query(...), db: Session = Depends(get_db)):
+    """Required dependencies missing from the tracked mods and dependency conflicts for a target"""
+    _, report, _ = export_targets(db, [(mc_version, loader)])[(mc_version, loader)]
+    if report is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+    return report
+
 @router.get("/export")
 def export_mods(mc_version: str = Query(...), loader: str = Query(...), db: Session = Depends(get_db)):
-    """Export mods in docker-compose format ensuring full server-side compatibility"""
-    # Get the specific MC version+loader
-    mc_ver_obj = db.query(MCVersion).filter_by(version=mc_version, loader=loader).first()
-    if not mc_ver_obj:
-        raise HTTPException(status_code=404, detail=f"MC version {mc_version} ({loader}) not found")
-    
-    # Get all tracked mods that are server-side or both
-    all_mods = db.query(TrackedMod).all()
-    mods_to_export = [m for m in all_mods if m.side in ["server", "both"]]
-    
-    if not mods_to_export:
-        raise HTTPException(status_code=400, detail="No server-side or 'both' mods found to export")
+    """Export mods in docker-compose format ensuring full server-side compatibility, with their missing dependencies"""
+    result, report, installed = export_targets(db, [(mc_version, loader)])[(mc_version, loader)]
+    if isinstance(result, ExportError):
+        raise HTTPException(status_code=result.status_code, detail=result.detail)
 
-    projects = []
-    
-    for tracked_mod in mods_to_export:
-        # Find compatible mod version for this MC version
-        mod_version = db.query(ModVersion).filter_by(
-            mod_slug=tracked_mod.slug,
-            mc_version_id=mc_ver_obj.id,
-            loader=loader
-        ).join(CompatibilityResult).filter(
-            CompatibilityResult.status == "compatible"
-        ).first()
-        
-        if not mod_version:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Server-side mod {tracked_mod.slug} is not compatible with {mc_version} ({loader}). Export only allowed when all server/both mods are compatible."
-            )
-        
-        projects.append(f"{tracked_mod.slug}:{mod_version.version_id}")
-
-    compose_data = {
-        "services": {
-            "mc": {
-                "environment": {
-                    "TYPE": loader.upper(),
-                    "VERSION": mc_version,
-                    "MODRINTH_PROJECTS": LiteralString("\n".join(projects) + "\n")
-                }
-            }
-        }
-    }
-    
-    return {"yaml": yaml.dump(compose_data, sort_keys=False, default_flow_style=False)}
+    return {"yaml": result, "dependencies": dependency_summary(report), "installed": installed}
+
+@router.post("/export/batch")
+def export_mods_batch(data: ExportBatchSchema, db: Session = Depends(get_db)):
+    """Export several (version, loader) targets in one request, reporting failures per target"""
+    targets = [(t.mc_version, t.loader) for t in data.targets]
+    results = export_targets(db, targets)
+
+    exports = []
+    for mc_version, loader in dict.fromkeys(targets):
+        result, report, installed = results[(mc_version, loader)]
+        if isinstance(result, ExportError):
+            exports.append({
+                "mc_version": mc_version,
+                "loader": loader,
+                "error": result.detail,
+                "blocking": result.blocking
+            })
+        else:
+            exports.append({
+                "mc_version": mc_version,
+                "loader": loader,
+                "yaml": result,
+                "dependencies": dependency_summary(report),
+                "installed": installed
+            })
+
+    return {"exports": exports}
 
 @router.post("/import")
-async def import_mods(background_tasks: BackgroundTasks, db: Session = Depends(get_db), data: dict = Body(...)):
-    """Import mods from docker-compose YAML"""
+def import_mods(background_tasks: BackgroundTasks, db: Session = Depends(get_db), data: dict = Body(...)):
+    """
+    Import mods from docker-compose YAML.
+    Returns right away with a job id; metadata fetching, inserts and checks run as one background job.
+    """
     yaml_content = data.get("yaml")
     if not yaml_content:
         raise HTTPException(status_code=400, detail="No YAML content provided")
@@ -145,74 +261,100 @@ async def import_mods(background_tasks: BackgroundTasks, db: Session = Depends(g
             raise HTTPException(status_code=400, detail="No MODRINTH_PROJECTS found in YAML")
             
         lines = [line.strip() for line in projects_str.split("\n") if line.strip()]
-        added_count = 0
-
-        for line in lines:
-            slug = line.split(":")[0].strip()
-            if not slug:
-                continue
-                
-            # Check if mod already tracked
-            existing = db.query(TrackedMod).filter(TrackedMod.slug == slug).first()
-            if not existing:
-                # Fetch mod details for support info and default to 'server' side
-                details = await get_mod_details(slug)
-                supported_client = details.get("client_side") if details else None
-                supported_server = details.get("server_side") if details else None
-
-                tracked_mod = TrackedMod(
-                    slug=slug, 
-                    side="server",  # Default to server for imported mods
-                    channel="release",  # Default to release channel
-                    supported_client_side=supported_client,
-                    supported_server_side=supported_server
-                )
-                db.add(tracked_mod)
-                db.commit()
-                db.refresh(tracked_mod)
-                background_tasks.add_task(check_single_mod_task, tracked_mod.slug)
-                added_count += 1
-                
-        add_log(db, "INFO", f"Imported {added_count} mods from YAML")
-        return {"success": True, "added": added_count}
+        slugs = list(dict.fromkeys(slug for slug in (line.split(":")[0].strip() for line in lines) if slug))
+
+        # Check which mods are already tracked with one query, the import adopts mods tracked only for profiles
+        existing = {slug for slug, in db.query(TrackedMod.slug).filter(
+            TrackedMod.slug.in_(slugs), TrackedMod.profile_only == False
+        ).all()}
+        new_slugs = [slug for slug in slugs if slug not in existing]
+
+        job = create_job("import", total=len(new_slugs))
+        if new_slugs:
+            background_tasks.add_task(import_mods_task, job.id, new_slugs)
+        else:
+            finish_job(job, result={"added": 0, "skipped": len(slugs)})
+
+        return {"success": True, "job_id": job.id, "queued": len(new_slugs), "skipped": len(existing)}
         
+    except HTTPException:
+        raise
     except yaml.YAMLError as e:
         raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
+@router.post("/import/files")
+def import_mod_files(background_tasks: BackgroundTasks, file: Optional[UploadFile] = File(None),
+                     path: Optional[str] = Form(None), side: str = Form("server"), channel: str = Form("release")):
+    """
+    Import mods from jar files: an uploaded zip of a mods folder, or the `path` of a
+    directory inside MODS_IMPORT_ROOT. Returns right away with a job id; hashing,
+    identification, inserts and checks run as one background job.
+    """
+    if side not in VALID_SIDES:
+        raise HTTPException(status_code=400, detail="Invalid side value")
+    if channel not in VALID_CHANNELS:
+        raise HTTPException(status_code=400, detail="Invalid channel value")
+
+    if file is not None:
+        # Spool the upload to disk in chunks, the job outlives the request
+        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as archive:
+            shutil.copyfileobj(file.file, archive, CHUNK_SIZE)
+        if not zipfile.is_zipfile(archive.name):
+            os.remove(archive.name)
+            raise HTTPException(status_code=400, detail="Uploaded file is not a zip archive")
+        source, remove_source = archive.name, True
+    elif path:
+        try:
+            source, remove_source = import_directory(path), False
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        raise HTTPException(status_code=400, detail="No file or directory provided")
+
+    job = create_job("import")
+    background_tasks.add_task(import_files_task, job.id, source, side, channel, remove_source)
+    return {"success": True, "job_id": job.id}
+
 
 @router.patch("/{mod_slug}/side", response_model=TrackedModResponse)
 def update_mod_side(mod_slug: str, side: str = Body(embed=True), db: Session = Depends(get_db)):
     """Update the side for a tracked mod"""
-    tracked_mod = db.query(TrackedMod).filter(TrackedMod.slug == mod_slug).first()
+    tracked_mod = db.query(TrackedMod).filter(TrackedMod.slug == mod_slug, TrackedMod.profile_only == False).first()
     if not tracked_mod:
         raise HTTPException(status_code=404, detail="Mod not found")
     
-    if side not in ["client", "server", "both"]:
+    if side not in VALID_SIDES:
         raise HTTPException(status_code=400, detail="Invalid side value")
     
     tracked_mod.side = side
     db.commit()
     db.refresh(tracked_mod)
+    publish("mod_updated", mod_event_payload(tracked_mod))
     
     add_log(db, "INFO", f"Mod {tracked_mod.slug} side updated to {side}")
     return tracked_mod
 
 
 @router.patch("/{mod_slug}/channel", response_model=TrackedModResponse)
-def update_mod_channel(mod_slug: str, channel: str = Body(embed=True), db: Session = Depends(get_db)):
-    """Update the channel for a tracked mod"""
-    tracked_mod = db.query(TrackedMod).filter(TrackedMod.slug == mod_slug).first()
+def update_mod_channel(mod_slug: str, background_tasks: BackgroundTasks, channel: str = Body(embed=True),
+                       db: Session = Depends(get_db)):
+    """Update the channel for a tracked mod and re-resolve its results from the stored version catalog"""
+    tracked_mod = db.query(TrackedMod).filter(TrackedMod.slug == mod_slug, TrackedMod.profile_only == False).first()
     if not tracked_mod:
         raise HTTPException(status_code=404, detail="Mod not found")
     
-    if channel not in ["release", "beta", "alpha"]:
+    if channel not in VALID_CHANNELS:
         raise HTTPException(status_code=400, detail="Invalid channel value")
     
+    changed = tracked_mod.channel != channel
     tracked_mod.channel = channel
     db.commit()
     db.refresh(tracked_mod)
+    publish("mod_updated", mod_event_payload(tracked_mod))
     
     add_log(db, "INFO", f"Mod {tracked_mod.slug} channel updated to {channel}")
+    if changed:
+        background_tasks.add_task(reresolve_mod_task, tracked_mod.slug)
     return tracked_mod
@@ -0,0 +1,210 @@
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Body, Query
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.routers.mods import dependency_summary
+from app.models.all import MCVersion, Profile, ProfileMod, TrackedMod, LogEntry
+from app.schemas.all import ProfileSchema, ProfileResponse, ProfileModSchema, ProfileResultResponse
+from app.services.background import check_single_mod_task, check_mods_task
+from app.services.events import publish, publish_log
+from app.services.export import ExportError
+from app.services.profiles import drop_unused_mods, profile_results, export_profile
+
+router = APIRouter(
+    prefix="/api/profiles",
+    tags=["profiles"]
+)
+
+VALID_SIDES = ["client", "server", "both"]
+VALID_CHANNELS = ["release", "beta", "alpha"]
+
+def add_log(db: Session, level: str, message: str):
+    log = LogEntry(level=level, message=message)
+    db.add(log)
+    db.commit()
+    publish_log(log)
+
+
+def profile_payload(profile: Profile) -> dict:
+    current = profile.current_version
+    return {
+        "id": profile.id,
+        "name": profile.name,
+        "mc_version": current.version if current else None,
+        "loader": current.loader if current else None,
+        "mods": [{"slug": m.mod_slug, "side": m.side, "channel": m.channel} for m in profile.mods]
+    }
+
+
+def get_profile(db: Session, profile_id: int) -> Profile:
+    profile = db.get(Profile, profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+def find_version(db: Session, mc_version: str, loader: str) -> MCVersion:
+    target = db.query(MCVersion).filter_by(version=mc_version, loader=loader).first()
+    if not target:
+        raise HTTPException(status_code=404, detail="Version not found")
+    return target
+
+
+@router.get("", response_model=List[ProfileResponse])
+def get_profiles(db: Session = Depends(get_db)):
+    """Get all profiles with their current version and mods"""
+    return [profile_payload(p) for p in db.query(Profile).order_by(Profile.name).all()]
+
+@router.post("", response_model=ProfileResponse)
+def add_profile(data: ProfileSchema, db: Session = Depends(get_db)):
+    """Create a profile, optionally following an existing version+loader as its current version"""
+    if db.query(Profile).filter(Profile.name == data.name).first():
+        raise HTTPException(status_code=400, detail=f"Profile {data.name} already exists")
+
+    if bool(data.mc_version) != bool(data.loader):
+        raise HTTPException(status_code=400, detail="mc_version and loader must be given together")
+
+    profile = Profile(name=data.name)
+    if data.mc_version and data.loader:
+        profile.current_version = find_version(db, data.mc_version, data.loader)
+    db.add(profile)
+    db.commit()
+    db.refresh(profile)
+
+    publish("profile_updated", {"id": profile.id})
+    add_log(db, "INFO", f"Profile {profile.name} created")
+    return profile_payload(profile)
+
+@router.delete("/{profile_id}")
+def delete_profile(profile_id: int, db: Session = Depends(get_db)):
+    """Delete a profile. Mods tracked only for it stop being tracked, the others stay."""
+    profile = get_profile(db, profile_id)
+    name = profile.name
+    slugs = [entry.mod_slug for entry in profile.mods]
+    db.delete(profile)
+    dropped = drop_unused_mods(db, slugs)
+    db.commit()
+
+    publish("profile_removed", {"id": profile_id})
+    add_log(db, "INFO", f"Profile {name} deleted" + (f", stopped tracking {', '.join(dropped)}" if dropped else ""))
+    return {"success": True}
+
+@router.put("/{profile_id}/current", response_model=ProfileResponse)
+def set_profile_current(profile_id: int, background_tasks: BackgroundTasks, mc_version: str = Body(...),
+                        loader: str = Body(...), db: Session = Depends(get_db)):
+    """Set the current version of a profile; its mods are checked against the new targets"""
+    profile = get_profile(db, profile_id)
+    profile.current_version = find_version(db, mc_version, loader)
+    db.commit()
+    db.refresh(profile)
+
+    publish("profile_updated", {"id": profile.id})
+    add_log(db, "INFO", f"Profile {profile.name} current version set to {mc_version} ({loader})")
+    slugs = [entry.mod_slug for entry in profile.mods]
+    if slugs:
+        background_tasks.add_task(check_mods_task, slugs)
+    return profile_payload(profile)
+
+@router.post("/{profile_id}/mods", response_model=ProfileResponse)
+def add_profile_mod(profile_id: int, data: ProfileModSchema, background_tasks: BackgroundTasks,
+                    db: Session = Depends(get_db)):
+    """
+    Add a mod by slug or Modrinth project id. Mods already tracked (globally or by another profile)
+    reuse the stored catalog, new ones are tracked for profiles only and fetched once for all of them.
+    """
+    profile = get_profile(db, profile_id)
+    if data.side not in VALID_SIDES:
+        raise HTTPException(status_code=400, detail="Invalid side value")
+    if data.channel not in VALID_CHANNELS:
+        raise HTTPException(status_code=400, detail="Invalid channel value")
+
+    # A project is tracked once, under whichever slug added it first
+    tracked_mod = db.query(TrackedMod).filter(
+        or_(TrackedMod.slug == data.slug, TrackedMod.project_id == data.slug)
+    ).first()
+    slug = tracked_mod.slug if tracked_mod else data.slug
+    if any(entry.mod_slug == slug for entry in profile.mods):
+        raise HTTPException(status_code=400, detail=f"Mod {slug} is already in profile {profile.name}")
+
+    new_mod = tracked_mod is None
+    if new_mod:
+        # Not shown in global lists, results or exports unless it is added there too
+        tracked_mod = TrackedMod(slug=slug, side=data.side, channel=data.channel, profile_only=True)
+        db.add(tracked_mod)
+    profile.mods.append(ProfileMod(mod_slug=slug, side=data.side, channel=data.channel))
+    db.commit()
+    db.refresh(profile)
+
+    if new_mod:
+        add_log(db, "INFO", f"Mod {slug} tracked for profiles")
+        background_tasks.add_task(check_single_mod_task, slug)
+    publish("profile_updated", {"id": profile.id})
+    add_log(db, "INFO", f"Mod {slug} added to profile {profile.name}")
+    return profile_payload(profile)
+
+@router.patch("/{profile_id}/mods/{mod_slug}", response_model=ProfileResponse)
+def update_profile_mod(profile_id: int, mod_slug: str, side: Optional[str] = Body(None),
+                       channel: Optional[str] = Body(None), db: Session = Depends(get_db)):
+    """Change the side or channel a profile uses a mod with, resolved from the stored catalog"""
+    profile = get_profile(db, profile_id)
+    entry = next((e for e in profile.mods if e.mod_slug == mod_slug), None)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Mod not found")
+    if side is not None and side not in VALID_SIDES:
+        raise HTTPException(status_code=400, detail="Invalid side value")
+    if channel is not None and channel not in VALID_CHANNELS:
+        raise HTTPException(status_code=400, detail="Invalid channel value")
+
+    entry.side = side or entry.side
+    entry.channel = channel or entry.channel
+    db.commit()
+    db.refresh(profile)
+
+    publish("profile_updated", {"id": profile.id})
+    add_log(db, "INFO", f"Mod {mod_slug} in profile {profile.name} updated (side: {entry.side}, channel: {entry.channel})")
+    return profile_payload(profile)
+
+@router.delete("/{profile_id}/mods/{mod_slug}", response_model=ProfileResponse)
+def remove_profile_mod(profile_id: int, mod_slug: str, db: Session = Depends(get_db)):
+    """Remove a mod from a profile, it stays tracked unless no profile uses a profile-only mod any more"""
+    profile = get_profile(db, profile_id)
+    entry = next((e for e in profile.mods if e.mod_slug == mod_slug), None)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Mod not found")
+    profile.mods.remove(entry)
+    dropped = drop_unused_mods(db, [mod_slug])
+    db.commit()
+    db.refresh(profile)
+
+    publish("profile_updated", {"id": profile.id})
+    add_log(db, "INFO", f"Mod {mod_slug} removed from profile {profile.name}" + (", stopped tracking it" if dropped else ""))
+    return profile_payload(profile)
+
+@router.get("/{profile_id}/results", response_model=List[ProfileResultResponse])
+def get_profile_results(profile_id: int, db: Session = Depends(get_db)):
+    """Compatibility of the profile's mods with its current version and newer releases, with its channels"""
+    return profile_results(db, get_profile(db, profile_id))
+
+@router.get("/{profile_id}/export")
+def export_profile_mods(profile_id: int, mc_version: Optional[str] = Query(None), loader: Optional[str] = Query(None),
+                        db: Session = Depends(get_db)):
+    """
+    Export the profile's server mods in docker-compose format with their missing dependencies,
+    for its current version unless given
+    """
+    profile = get_profile(db, profile_id)
+    if bool(mc_version) != bool(loader):
+        raise HTTPException(status_code=400, detail="mc_version and loader must be given together")
+    if mc_version and loader:
+        target = find_version(db, mc_version, loader)
+    elif profile.current_version:
+        target = profile.current_version
+    else:
+        raise HTTPException(status_code=400, detail="Profile has no current version")
+
+    result, report = export_profile(db, profile, target)
+    if isinstance(result, ExportError):
+        raise HTTPException(status_code=result.status_code, detail=result.detail)
+    return {"yaml": result, "dependencies": dependency_summary(report)}
@@ -1,12 +1,25 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from sqlalchemy import func
+import base64
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, aliased
+from typing import List, Optional, Union
+from sqlalchemy import func, and_, or_
 
 from app.core.database import get_db
+from app.core.serialization import FastJSONResponse
 from app.models.all import CompatibilityResult, LogEntry, MCVersion, TrackedMod, ModVersion
-from app.schemas.all import ResultResponse, LogResponse, SummaryResponse, StatusResponse
-from datetime import timedelta, timezone
+from app.schemas.all import (
+    ResultResponse, LogResponse, SummaryResponse, StatusResponse, VersionSummaryResponse, MatrixResponse,
+    ResultDeltaResponse, LogDeltaResponse, OutcomeResponse, ReadinessHistoryResponse, TimeToCompatibleResponse
+)
+from app.services.history import readiness_history, time_to_compatible
+from app.services.outcomes import STATES as OUTCOME_STATES, OutcomeBitsets, iter_bits, load_outcomes
+from app.services.read_model import get_read_model, get_outcomes
+from app.services.sync import since_param, sync_token, deleted_keys, sync_response
+from datetime import datetime, timedelta, timezone
 
 router = APIRouter(
     tags=["results"]
@@ -25,34 +38,78 @@ def get_status(db: Session = Depends(get_db)):
     return StatusResponse(last_check=last_check, next_check=next_check)
 
 
-@router.get("/api/results", response_model=List[ResultResponse])
-def get_results(
-    mc_version: Optional[str] = Query(None),
-    loader: Optional[str] = Query(None),
-    side: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
-):
-    """Get compatibility check results with filtering and sorting"""
-    query = db.query(
-        CompatibilityResult,
-        ModVersion,
-        MCVersion,
-        TrackedMod
-    ).join(
-        ModVersion, CompatibilityResult.mod_version_id == ModVersion.id
-    ).join(
-        MCVersion, CompatibilityResult.mc_version_id == MCVersion.id
-    ).join(
-        TrackedMod, ModVersion.mod_slug == TrackedMod.slug
-    )
-    
+# Baseline recorded by a file import for the same mod and target, shown next to the resolved version
+InstalledVersion = aliased(ModVersion)
+
+# Columns available for projection via the `fields` parameter
+RESULT_FIELDS = {
+    "id": CompatibilityResult.id,
+    "mod_version_id": CompatibilityResult.mod_version_id,
+    "mc_version_id": CompatibilityResult.mc_version_id,
+    "status": CompatibilityResult.status,
+    "error": CompatibilityResult.error,
+    "checked_at": CompatibilityResult.checked_at,
+    "mod_slug": ModVersion.mod_slug,
+    "mod_version_number": ModVersion.version_number,
+    "mc_version": MCVersion.version,
+    "loader": MCVersion.loader,
+    "source_loader": func.coalesce(ModVersion.source_loader, MCVersion.loader),
+    "installed_version_number": InstalledVersion.version_number,
+}
+
+# NULL timestamps sort last in DESC order; coalescing keeps keyset comparisons consistent with that
+_EPOCH = datetime(1970, 1, 1)
+
+
+def join_installed(query):
+    """Outer join the installed baseline of each result's mod and target"""
+    return query.outerjoin(InstalledVersion, and_(
+        InstalledVersion.mod_slug == ModVersion.mod_slug,
+        InstalledVersion.mc_version_id == CompatibilityResult.mc_version_id,
+        InstalledVersion.installed.is_(True)
+    ))
+
+
+def encode_cursor(slug: str, release_time: datetime, checked_at: datetime, result_id: int) -> str:
+    """Encode the sort key of the last returned row as an opaque cursor"""
+    payload = [slug, release_time.isoformat(), checked_at.isoformat(), result_id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Stored timestamps are naive UTC, aware ones from hand-made cursors are converted like since_param does"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def decode_cursor(cursor: str):
+    """Decode a cursor produced by encode_cursor, raising 400 on malformed input"""
+    try:
+        slug, release_time, checked_at, result_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(slug, str):
+            raise TypeError("slug must be a string")
+        return (slug, _naive_utc(datetime.fromisoformat(release_time)),
+                _naive_utc(datetime.fromisoformat(checked_at)), int(result_id))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def filter_results(query, mc_version: Optional[str], loader: Optional[str], side: Optional[str],
+                   status: Optional[str], mod_slug: Optional[str]):
+    """Apply the shared result filters to a query joined over ModVersion and MCVersion"""
     if mc_version:
         query = query.filter(MCVersion.version == mc_version)
     
     if loader:
         query = query.filter(MCVersion.loader == loader)
+
+    if status:
+        query = query.filter(CompatibilityResult.status == status)
+
+    if mod_slug:
+        query = query.filter(ModVersion.mod_slug == mod_slug)
     
     if side:
+        query = query.join(TrackedMod, ModVersion.mod_slug == TrackedMod.slug)
         if side == "both":
             query = query.filter(TrackedMod.side == "both")
         elif side == "server":
@@ -60,78 +117,222 @@ def get_results(
         elif side == "client":
             query = query.filter(TrackedMod.side.in_(["client", "both"]))
 
+    return query
+
+
+def _results_from_model(model, selected: List[str], mc_version, loader, side, status, mod_slug,
+                        since: Optional[datetime], limit: Optional[int], cursor: Optional[str]):
+    """Page of results served from the in-memory read model"""
+    after = decode_cursor(cursor) if cursor else None
+    records = model.results(mc_version, loader, side, status, mod_slug, since, after)
+
+    next_cursor = None
+    if limit and len(records) > limit:
+        records = records[:limit]
+        last = records[-1]
+        next_cursor = encode_cursor(last.mod_slug, last.release_key, last.checked_key, last.id)
+
+    return [{f: getattr(record, f) for f in selected} for record in records], next_cursor
+
+
+def _results_from_sql(db: Session, selected: List[str], mc_version, loader, side, status, mod_slug,
+                      since: Optional[datetime], limit: Optional[int], cursor: Optional[str]):
+    """Page of results queried from the database, used while the read model warms up"""
+    release_key = func.coalesce(MCVersion.release_time, _EPOCH)
+    checked_key = func.coalesce(CompatibilityResult.checked_at, _EPOCH)
+
+    query = db.query(
+        *[RESULT_FIELDS[f].label(f) for f in selected],
+        ModVersion.mod_slug.label("_slug"),
+        release_key.label("_release"),
+        checked_key.label("_checked"),
+        CompatibilityResult.id.label("_id")
+    ).select_from(
+        CompatibilityResult
+    ).join(
+        ModVersion, CompatibilityResult.mod_version_id == ModVersion.id
+    ).join(
+        MCVersion, CompatibilityResult.mc_version_id == MCVersion.id
+    )
+    if "installed_version_number" in selected:
+        query = join_installed(query)
+    
+    query = filter_results(query, mc_version, loader, side, status, mod_slug)
+
+    if since:
+        query = query.filter(CompatibilityResult.updated_at >= since)
+
+    if cursor:
+        # Resume strictly after the last row of the previous page in sort order
+        c_slug, c_release, c_checked, c_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            ModVersion.mod_slug > c_slug,
+            and_(ModVersion.mod_slug == c_slug, or_(
+                release_key < c_release,
+                and_(release_key == c_release, or_(
+                    checked_key < c_checked,
+                    and_(checked_key == c_checked, CompatibilityResult.id > c_id)
+                ))
+            ))
+        ))
+
     # Sort by mod slug ASC, then by MC version release time DESC, then by checked_at DESC
-    results = query.order_by(
+    query = query.order_by(
         ModVersion.mod_slug.asc(),
-        MCVersion.release_time.desc(),
-        CompatibilityResult.checked_at.desc()
-    ).all()
-    
-    # Build response with joined data
-    response = []
-    for compat_result, mod_version, mc_version, tracked_mod in results:
-        result_dict = ResultResponse(
-            id=compat_result.id,
-            mod_version_id=compat_result.mod_version_id,
-            mc_version_id=compat_result.mc_version_id,
-            status=compat_result.status,
-            error=compat_result.error,
-            checked_at=compat_result.checked_at.replace(tzinfo=timezone.utc) if compat_result.checked_at else None,
-            # Add joined data
-            mod_slug=mod_version.mod_slug,
-            mod_version_number=mod_version.version_number,
-            mc_version=mc_version.version,
-            loader=mc_version.loader
+        release_key.desc(),
+        checked_key.desc(),
+        CompatibilityResult.id.asc()
+    )
+
+    next_cursor = None
+    if limit:
+        rows = query.limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last._slug, last._release, last._checked, last._id)
+    else:
+        rows = query.all()
+
+    # Rows are plain tuples, the sort key columns trail the selected ones
+    width = len(selected)
+    return [dict(zip(selected, row[:width])) for row in rows], next_cursor
+
+
+@router.get("/api/results", response_model=Union[List[ResultResponse], ResultDeltaResponse])
+def get_results(
+    mc_version: Optional[str] = Query(None),
+    loader: Optional[str] = Query(None),
+    side: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    mod_slug: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    since: Optional[datetime] = Depends(since_param),
+    db: Session = Depends(get_db)
+):
+    """
+    Get compatibility check results with filtering and sorting.
+    When `limit` is set, results are paginated by keyset and the cursor for the
+    next page is returned in the X-Next-Cursor header.
+    With `since`, only results whose outcome changed after it are returned, plus
+    the ids of deleted results (on the first page).
+    """
+    token = sync_token()
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in selected if f not in RESULT_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    else:
+        selected = list(RESULT_FIELDS)
+
+    model = get_read_model(db)
+    if model is not None:
+        items, next_cursor = _results_from_model(model, selected, mc_version, loader, side, status, mod_slug,
+                                                 since, limit, cursor)
+    else:
+        items, next_cursor = _results_from_sql(db, selected, mc_version, loader, side, status, mod_slug,
+                                               since, limit, cursor)
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    deleted = None
+    if since:
+        # Tombstones can't be filtered by the joined columns, clients drop ids they don't hold
+        deleted = [] if cursor else deleted_keys(db, CompatibilityResult.__tablename__, since, int)
+    return sync_response(token, items, deleted=deleted, key="id", headers=headers)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows fetched per round trip while streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+
+@router.get("/api/results/export")
+def export_results(
+    format: str = Query("ndjson"),
+    mc_version: Optional[str] = Query(None),
+    loader: Optional[str] = Query(None),
+    side: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    mod_slug: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Stream all matching compatibility results as NDJSON or CSV"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+
+    columns = list(RESULT_FIELDS)
+    model = get_read_model(db)
+    if model is not None:
+        records = model.results(mc_version, loader, side, status, mod_slug)
+        query = ([getattr(record, f) for f in columns] for record in records)
+    else:
+        query = db.query(
+            *[RESULT_FIELDS[f].label(f) for f in columns]
+        ).select_from(
+            CompatibilityResult
+        ).join(
+            ModVersion, CompatibilityResult.mod_version_id == ModVersion.id
+        ).join(
+            MCVersion, CompatibilityResult.mc_version_id == MCVersion.id
         )
-        response.append(result_dict)
+        query = join_installed(query)
+        query = filter_results(query, mc_version, loader, side, status, mod_slug)
+        query = query.order_by(
+            ModVersion.mod_slug.asc(),
+            func.coalesce(MCVersion.release_time, _EPOCH).desc(),
+            func.coalesce(CompatibilityResult.checked_at, _EPOCH).desc(),
+            CompatibilityResult.id.asc()
+        ).yield_per(EXPORT_BATCH_SIZE)
+
+    def to_values(row):
+        values = list(row)
+        checked_at = values[columns.index("checked_at")]
+        if checked_at:
+            values[columns.index("checked_at")] = checked_at.replace(tzinfo=timezone.utc).isoformat()
+        return values
+
+    def stream_ndjson():
+        batch = []
+        for row in query:
+            batch.append(json.dumps(dict(zip(columns, to_values(row)))))
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                yield "\n".join(batch) + "\n"
+                batch = []
+        if batch:
+            yield "\n".join(batch) + "\n"
 
-    return response
+    def stream_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for i, row in enumerate(query, start=1):
+            writer.writerow(to_values(row))
+            if i % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    stream = stream_ndjson() if format == "ndjson" else stream_csv()
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f"attachment; filename=results.{format}"}
+    )
 
 @router.get("/api/results/summary", response_model=SummaryResponse)
 def get_summary(mc_version: str, loader: str, db: Session = Depends(get_db)):
     """Get compatibility summary for a specific Minecraft version and loader"""
-    # Get the MC version object
-    mc_ver_obj = db.query(MCVersion).filter_by(version=mc_version, loader=loader).first()
-    if not mc_ver_obj:
-        return SummaryResponse(
-            compatible=0, total=0, 
-            server_compatible=0, server_total=0,
-            client_compatible=0, client_total=0
-        )
-    
-    # Get all compatibility results for this MC version (through ModVersion)
-    results = db.query(
-        CompatibilityResult,
-        ModVersion,
-        TrackedMod
-    ).join(
-        ModVersion, CompatibilityResult.mod_version_id == ModVersion.id
-    ).join(
-        TrackedMod, ModVersion.mod_slug == TrackedMod.slug
-    ).filter(
-        CompatibilityResult.mc_version_id == mc_ver_obj.id
-    ).all()
-    
-    # Group by mod_slug to get latest result per mod
-    mod_results = {}
-    for compat_result, mod_version, tracked_mod in results:
-        if tracked_mod.slug not in mod_results:
-            mod_results[tracked_mod.slug] = (compat_result, tracked_mod)
-        else:
-            # Keep the most recent check
-            existing_compat, _ = mod_results[tracked_mod.slug]
-            if compat_result.checked_at > existing_compat.checked_at:
-                mod_results[tracked_mod.slug] = (compat_result, tracked_mod)
-    
-    compatible = sum(1 for compat, mod in mod_results.values() if compat.status == "compatible")
-    total = len(mod_results)
-    
-    server_compatible = sum(1 for compat, mod in mod_results.values() if compat.status == "compatible" and mod.side in ["server", "both"])
-    server_total = sum(1 for compat, mod in mod_results.values() if mod.side in ["server", "both"])
-    
-    client_compatible = sum(1 for compat, mod in mod_results.values() if compat.status == "compatible" and mod.side in ["client", "both"])
-    client_total = sum(1 for compat, mod in mod_results.values() if mod.side in ["client", "both"])
-    
+    target = db.query(MCVersion.id).filter_by(version=mc_version, loader=loader).first()
+    counts = get_outcomes(db).counts(target.id) if target else (0, 0, 0, 0, 0, 0)
+    compatible, total, server_compatible, server_total, client_compatible, client_total = counts
+
     return SummaryResponse(
         compatible=compatible, 
         total=total,
@@ -141,13 +342,190 @@ def get_summary(mc_version: str, loader: str, db: Session = Depends(get_db)):
         client_total=client_total
     )
 
-@router.get("/api/logs", response_model=List[LogResponse])
-def get_logs(db: Session = Depends(get_db)):
-    """Get background job logs"""
-    logs = db.query(LogEntry).order_by(LogEntry.created_at.desc()).limit(100).all()
-    
-    for log in logs:
-        if log.created_at:
-            log.created_at = log.created_at.replace(tzinfo=timezone.utc)
-            
-    return logs
+@router.get("/api/results/summaries", response_model=List[VersionSummaryResponse])
+def get_summaries(db: Session = Depends(get_db)):
+    """
+    Get compatibility summaries for every tracked Minecraft version and loader.
+    Totals count the mods checked against each target, computed by popcounts over outcome bitsets.
+    """
+    return build_summaries(db, get_outcomes(db))
+
+
+def fetch_summaries(db: Session) -> List[VersionSummaryResponse]:
+    """Summaries from the outcomes visible to this session, for reads that must match one snapshot"""
+    return build_summaries(db, load_outcomes(db))
+
+
+def build_summaries(db: Session, outcomes: OutcomeBitsets) -> List[VersionSummaryResponse]:
+    targets = db.query(MCVersion.id, MCVersion.version, MCVersion.loader).order_by(
+        MCVersion.version, MCVersion.loader
+    ).all()
+
+    summaries = []
+    for target_id, version, loader in targets:
+        compatible, total, server_compatible, server_total, client_compatible, client_total = outcomes.counts(target_id)
+        summaries.append(VersionSummaryResponse(
+            mc_version=version,
+            loader=loader,
+            compatible=compatible,
+            total=total,
+            server_compatible=server_compatible,
+            server_total=server_total,
+            client_compatible=client_compatible,
+            client_total=client_total
+        ))
+    return summaries
+
+
+def matrix_targets(db: Session, mc_version: Optional[str], loader: Optional[str]):
+    """Targets for the matrix and outcome views, newest release first"""
+    target_query = db.query(MCVersion.id, MCVersion.version, MCVersion.loader)
+    if mc_version:
+        target_query = target_query.filter(MCVersion.version == mc_version)
+    if loader:
+        target_query = target_query.filter(MCVersion.loader == loader)
+    return target_query.order_by(
+        func.coalesce(MCVersion.release_time, _EPOCH).desc(), MCVersion.version, MCVersion.loader
+    ).all()
+
+
+@router.get("/api/results/outcomes", response_model=List[OutcomeResponse])
+def get_outcome_states(
+    mc_version: Optional[str] = Query(None),
+    loader: Optional[str] = Query(None),
+    side: Optional[str] = Query(None),
+    state: Optional[str] = Query(None, description="compatible, incompatible, error or unchecked"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the outcome of every mod on every matching target.
+    Unlike /api/results this tells incompatible mods apart from failed and never-run checks.
+    """
+    if state and state not in OUTCOME_STATES:
+        raise HTTPException(status_code=400, detail=f"Unknown state: {state}")
+
+    outcomes = get_outcomes(db)
+    mods = outcomes.side_mask(side)
+    items = []
+    for target in matrix_targets(db, mc_version, loader):
+        for cell_state in ([state] if state else OUTCOME_STATES):
+            for slug in outcomes.slugs_in(outcomes.state_mask(target.id, cell_state) & mods):
+                items.append({"slug": slug, "mc_version": target.version, "loader": target.loader, "state": cell_state})
+
+    return FastJSONResponse(items)
+
+
+def get_target(db: Session, mc_version: str, loader: str) -> MCVersion:
+    target = db.query(MCVersion).filter_by(version=mc_version, loader=loader).first()
+    if not target:
+        raise HTTPException(status_code=404, detail="Version not found")
+    return target
+
+
+@router.get("/api/results/history/readiness", response_model=ReadinessHistoryResponse)
+def get_readiness_history(mc_version: str, loader: str, side: Optional[str] = Query(None),
+                          db: Session = Depends(get_db)):
+    """Get how many mods were compatible, incompatible or failing on a target after every recorded change"""
+    target = get_target(db, mc_version, loader)
+    return FastJSONResponse({
+        "mc_version": target.version,
+        "loader": target.loader,
+        "release_time": target.release_time,
+        "points": readiness_history(db, target, side)
+    })
+
+
+@router.get("/api/results/history/time-to-compatible", response_model=List[TimeToCompatibleResponse])
+def get_time_to_compatible(mc_version: str, loader: str, db: Session = Depends(get_db)):
+    """Get when each mod was first checked against a target and when it first became compatible"""
+    return FastJSONResponse(time_to_compatible(db, get_target(db, mc_version, loader)))
+
+
+# Status dictionary for the matrix, a code per outcome state and 0 for unchecked cells
+MATRIX_STATUSES = ["none", "compatible", "incompatible", "error"]
+
+
+@router.get("/api/results/matrix", response_model=MatrixResponse)
+def get_matrix(
+    mc_version: Optional[str] = Query(None),
+    loader: Optional[str] = Query(None),
+    side: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Get the mods x (version, loader) compatibility grid as dictionary-encoded columns"""
+    targets = matrix_targets(db, mc_version, loader)
+    outcomes = get_outcomes(db)
+    slugs = outcomes.slugs_in(outcomes.side_mask(side))
+
+    row_index = {slug: i for i, slug in enumerate(slugs)}
+    col_index = {target.id: j for j, target in enumerate(targets)}
+    width = len(targets)
+
+    version_ids: List[str] = []
+    version_lookup = {}
+    status_codes = [0] * (len(slugs) * width)
+    version_codes = [-1] * (len(slugs) * width)
+
+    # Cell states come from the outcome bitsets, one pass per target and state
+    row_bits = {outcomes.position[slug]: i for i, slug in enumerate(slugs)}
+    for j, target in enumerate(targets):
+        for code, state in enumerate(MATRIX_STATUSES[1:], start=1):
+            for position in iter_bits(outcomes.state_mask(target.id, state)):
+                i = row_bits.get(position)
+                if i is not None:
+                    status_codes[i * width + j] = code
+
+    if slugs and targets:
+        # Oldest first, so the latest check for each cell wins
+        cells = db.query(
+            ModVersion.mod_slug, CompatibilityResult.mc_version_id, ModVersion.version_id
+        ).join(
+            ModVersion, CompatibilityResult.mod_version_id == ModVersion.id
+        ).filter(
+            CompatibilityResult.mc_version_id.in_(list(col_index))
+        ).order_by(
+            func.coalesce(CompatibilityResult.checked_at, _EPOCH), CompatibilityResult.id
+        ).all()
+
+        for slug, mc_version_id, version_id in cells:
+            i = row_index.get(slug)
+            if i is None:
+                continue
+            cell = i * width + col_index[mc_version_id]
+            # A result left over from before the mod became incompatible names no usable version
+            if status_codes[cell] == MATRIX_STATUSES.index("incompatible"):
+                continue
+            if version_id not in version_lookup:
+                version_lookup[version_id] = len(version_ids)
+                version_ids.append(version_id)
+            version_codes[cell] = version_lookup[version_id]
+
+    return MatrixResponse(
+        slugs=slugs,
+        targets=[{"id": t.id, "version": t.version, "loader": t.loader} for t in targets],
+        statuses=list(MATRIX_STATUSES),
+        status_codes=status_codes,
+        version_ids=version_ids,
+        version_codes=version_codes
+    )
+
+LOG_FIELDS = ("id", "level", "message", "created_at")
+
+
+def fetch_logs(db: Session, since: Optional[datetime] = None) -> List[dict]:
+    """Load the latest 100 log entries (written since a point, if given) as plain rows"""
+    query = db.query(*[getattr(LogEntry, f) for f in LOG_FIELDS])
+    if since:
+        query = query.filter(LogEntry.created_at >= since)
+    rows = query.order_by(LogEntry.created_at.desc()).limit(100).all()
+    return [dict(zip(LOG_FIELDS, row)) for row in rows]
+
+
+@router.get("/api/logs", response_model=Union[List[LogResponse], LogDeltaResponse])
+def get_logs(since: Optional[datetime] = Depends(since_param), db: Session = Depends(get_db)):
+    """
+    Get background job logs.
+    With `since`, only entries written after it are returned; logs are never deleted.
+    """
+    token = sync_token()
+    return sync_response(token, fetch_logs(db, since), deleted=[] if since else None, key="id")
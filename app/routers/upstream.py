@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+
+from app.core.config import settings
+from app.schemas.all import UpstreamStatsResponse
+from app.services.modrinth import coalescing_stats, hedging_stats
+
+router = APIRouter(
+    prefix="/api/upstream",
+    tags=["upstream"]
+)
+
+
+@router.get("/stats", response_model=UpstreamStatsResponse)
+def get_upstream_stats():
+    """
+    Get Modrinth client counters since startup: calls per endpoint and how many joined a request
+    already in flight, and requests, hedges and winning hedges with the latency p95 hedging uses.
+    """
+    return {
+        "coalescing": coalescing_stats(),
+        "hedging_enabled": settings.HEDGE_REQUESTS,
+        "hedging": hedging_stats()
+    }
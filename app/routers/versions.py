@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import timezone
+from datetime import datetime
+from typing import List, Optional, Union
 
 from app.core.database import get_db
 from app.models.all import MCVersion, LogEntry
-from app.schemas.all import VersionResponse, VersionSchema
-from app.services.background import enrich_and_check_version_task
+from app.schemas.all import VersionResponse, VersionSchema, VersionBatchSchema, VersionDeltaResponse
+from app.services.background import enrich_and_check_version_task, enrich_and_check_versions_task
+from app.services.events import publish, publish_log
+from app.services.outcomes import clear_target
+from app.services.sync import since_param, sync_token, deleted_keys, sync_response
 
 router = APIRouter(
     prefix="/api/versions",
@@ -17,15 +20,35 @@ def add_log(db: Session, level: str, message: str):
     log = LogEntry(level=level, message=message)
     db.add(log)
     db.commit()
+    publish_log(log)
 
-@router.get("", response_model=List[VersionResponse])
-def get_versions(db: Session = Depends(get_db)):
-    """Get all tracked Minecraft versions"""
-    versions = db.query(MCVersion).order_by(MCVersion.version, MCVersion.loader).all()
-    for v in versions:
-        if v.release_time:
-            v.release_time = v.release_time.replace(tzinfo=timezone.utc)
-    return versions
+VERSION_FIELDS = ("id", "version", "loader", "type", "release_time", "is_current")
+
+
+def fetch_versions(db: Session, since: Optional[datetime] = None) -> List[dict]:
+    """Load tracked Minecraft versions (changed since a point, if given) as plain rows"""
+    query = db.query(*[getattr(MCVersion, f) for f in VERSION_FIELDS])
+    if since:
+        query = query.filter(MCVersion.updated_at >= since)
+    rows = query.order_by(MCVersion.version, MCVersion.loader).all()
+    return [dict(zip(VERSION_FIELDS, row)) for row in rows]
+
+
+@router.get("", response_model=Union[List[VersionResponse], VersionDeltaResponse])
+def get_versions(since: Optional[datetime] = Depends(since_param), db: Session = Depends(get_db)):
+    """
+    Get all tracked Minecraft versions.
+    With `since`, only versions changed after it plus the ids of deleted ones are returned.
+    """
+    token = sync_token()
+    if since is None:
+        return sync_response(token, fetch_versions(db))
+    return sync_response(
+        token,
+        fetch_versions(db, since),
+        deleted=deleted_keys(db, MCVersion.__tablename__, since, int),
+        key="id"
+    )
 
 @router.get("/current")
 def get_current_version(db: Session = Depends(get_db)):
@@ -53,7 +76,7 @@ def add_version(data: VersionSchema, background_tasks: BackgroundTasks, db: Sess
     
     # If setting as current, unset other current versions
     if data.is_current:
-        db.query(MCVersion).update({MCVersion.is_current: False})
+        db.query(MCVersion).filter(MCVersion.is_current == True).update({MCVersion.is_current: False})
 
     version = MCVersion(
         version=data.version,
@@ -65,6 +88,7 @@ def add_version(data: VersionSchema, background_tasks: BackgroundTasks, db: Sess
     db.add(version)
     db.commit()
     db.refresh(version)
+    publish("version_added", {"id": version.id, "version": version.version, "loader": version.loader})
 
     add_log(db, "INFO", f"Version {data.version} ({data.loader}) added" + (" (set as current)" if data.is_current else ""))
     
@@ -73,6 +97,49 @@ def add_version(data: VersionSchema, background_tasks: BackgroundTasks, db: Sess
     
     return version
 
+@router.post("/batch", response_model=List[VersionResponse])
+def add_version_batch(data: VersionBatchSchema, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Add a Minecraft version for several loaders in one transaction with a single merged check"""
+    loaders = list(dict.fromkeys(data.loaders))
+    if not loaders:
+        raise HTTPException(status_code=400, detail="At least one loader is required")
+
+    existing = db.query(MCVersion.loader).filter(
+        MCVersion.version == data.version,
+        MCVersion.loader.in_(loaders)
+    ).all()
+    if existing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Version {data.version} ({', '.join(loader for loader, in existing)}) already exists"
+        )
+
+    # If setting as current, unset other current versions
+    if data.is_current:
+        db.query(MCVersion).filter(MCVersion.is_current == True).update({MCVersion.is_current: False})
+
+    new_versions = [
+        MCVersion(
+            version=data.version,
+            loader=loader,
+            type=data.type,
+            release_time=data.release_time,
+            is_current=data.is_current
+        )
+        for loader in loaders
+    ]
+    db.add_all(new_versions)
+    db.commit()
+
+    for version in new_versions:
+        publish("version_added", {"id": version.id, "version": version.version, "loader": version.loader})
+    add_log(db, "INFO", f"Version {data.version} ({', '.join(loaders)}) added" + (" (set as current)" if data.is_current else ""))
+
+    # One enrichment and check for all loaders
+    background_tasks.add_task(enrich_and_check_versions_task, data.version, loaders)
+
+    return new_versions
+
 @router.put("/{version_id}/set-current")
 def set_current_version(version_id: int, db: Session = Depends(get_db)):
     """Set a version as the current one"""
@@ -80,9 +147,10 @@ def set_current_version(version_id: int, db: Session = Depends(get_db)):
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
 
-    db.query(MCVersion).update({MCVersion.is_current: False})
+    db.query(MCVersion).filter(MCVersion.is_current == True).update({MCVersion.is_current: False})
     version.is_current = True
     db.commit()
+    publish("current_version_changed", {"id": version.id, "version": version.version, "loader": version.loader})
 
     add_log(db, "INFO", f"Current version set to {version.version} ({version.loader})")
     return {"version": version.version, "loader": version.loader}
@@ -98,6 +166,8 @@ def delete_version(version_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Cannot delete current version")
 
     db.delete(version)
+    clear_target(db, version_id)
     db.commit()
+    publish("version_removed", {"id": version_id})
     add_log(db, "INFO", f"Version {version.version} ({version.loader}) deleted")
     return {"success": True}
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 # Minecraft Version Schemas
@@ -11,6 +11,14 @@ class VersionSchema(BaseModel):
     is_current: bool = False
 
 
+class VersionBatchSchema(BaseModel):
+    version: str
+    loaders: List[str]
+    type: Optional[str] = "release"
+    release_time: Optional[datetime] = None
+    is_current: bool = False
+
+
 class VersionResponse(BaseModel):
     id: int
     version: str
@@ -27,8 +35,21 @@ class TrackedModSchema(BaseModel):
     channel: str = "release"  # release, beta, alpha
 
 
+class TrackedModUpdateSchema(BaseModel):
+    slug: str
+    side: Optional[str] = None
+    channel: Optional[str] = None
+
+
+class TrackedModBatchSchema(BaseModel):
+    add: List[TrackedModSchema] = []
+    update: List[TrackedModUpdateSchema] = []
+    delete: List[str] = []
+
+
 class TrackedModResponse(BaseModel):
     slug: str
+    project_id: Optional[str] = None
     side: str
     channel: str
     supported_client_side: Optional[str] = None
@@ -36,6 +57,82 @@ class TrackedModResponse(BaseModel):
     created_at: datetime
 
 
+class ExportTargetSchema(BaseModel):
+    mc_version: str
+    loader: str
+
+
+class ExportBatchSchema(BaseModel):
+    targets: List[ExportTargetSchema]
+
+
+class MissingDependencyResponse(BaseModel):
+    project_id: str
+    slug: str
+    version_id: Optional[str] = None
+    required_by: List[str]
+
+
+class DependencyConflictResponse(BaseModel):
+    project_id: str
+    slug: str
+    kind: str  # incompatible, unsupported, version_mismatch
+    mods: List[str]
+
+
+class DependencyReportResponse(BaseModel):
+    mc_version: str
+    loader: str
+    missing: List[MissingDependencyResponse]
+    conflicts: List[DependencyConflictResponse]
+
+
+class TrackedModBatchResponse(BaseModel):
+    added: List[TrackedModResponse]
+    updated: List[TrackedModResponse]
+    deleted: List[str]
+    job_id: Optional[str] = None
+
+
+# Profile Schemas
+class ProfileSchema(BaseModel):
+    name: str
+    mc_version: Optional[str] = None
+    loader: Optional[str] = None
+
+
+class ProfileModSchema(BaseModel):
+    slug: str
+    side: str = "both"  # client, server, both
+    channel: str = "release"  # release, beta, alpha
+
+
+class ProfileModResponse(BaseModel):
+    slug: str
+    side: str
+    channel: str
+
+
+class ProfileResponse(BaseModel):
+    id: int
+    name: str
+    mc_version: Optional[str] = None
+    loader: Optional[str] = None
+    mods: List[ProfileModResponse]
+
+
+class ProfileResultResponse(BaseModel):
+    mod_slug: str
+    side: str
+    channel: str
+    mc_version: str
+    loader: str
+    status: str  # compatible, incompatible, pending
+    version_id: Optional[str] = None
+    version_number: Optional[str] = None
+    source_loader: Optional[str] = None
+
+
 # Mod Version Schemas
 class ModVersionResponse(BaseModel):
     id: int
@@ -45,6 +142,7 @@ class ModVersionResponse(BaseModel):
     mc_version_id: int
     loader: str
     channel: str
+    installed: bool = False
     created_at: datetime
 
 
@@ -62,6 +160,8 @@ class ResultResponse(BaseModel):
     mod_version_number: Optional[str] = None
     mc_version: Optional[str] = None
     loader: Optional[str] = None
+    source_loader: Optional[str] = None  # loader the mod version was built for, differs on compatible loaders
+    installed_version_number: Optional[str] = None  # baseline from a file import, when it differs from the resolved one
 
 
 # Log Schemas
@@ -82,6 +182,132 @@ class SummaryResponse(BaseModel):
     client_total: int
 
 
+class VersionSummaryResponse(SummaryResponse):
+    mc_version: str
+    loader: str
+
+
+class OutcomeResponse(BaseModel):
+    slug: str
+    mc_version: str
+    loader: str
+    state: str  # compatible, incompatible, error, unchecked
+
+
+# History Schemas
+class ReadinessPointResponse(BaseModel):
+    at: datetime
+    compatible: int
+    incompatible: int
+    error: int
+
+
+class ReadinessHistoryResponse(BaseModel):
+    mc_version: str
+    loader: str
+    release_time: Optional[datetime] = None
+    points: List[ReadinessPointResponse]
+
+
+class TimeToCompatibleResponse(BaseModel):
+    slug: str
+    first_checked_at: datetime
+    compatible_at: Optional[datetime] = None
+    seconds_to_compatible: Optional[float] = None  # after the target's release
+
+
+# Matrix Schemas
+class MatrixTargetResponse(BaseModel):
+    id: int
+    version: str
+    loader: str
+
+
+class MatrixResponse(BaseModel):
+    """
+    Dense mods x targets grid in dictionary-encoded columns.
+    Cell (i, j) is at index i * len(targets) + j of status_codes and version_codes.
+    """
+    slugs: List[str]
+    targets: List[MatrixTargetResponse]
+    statuses: List[str]  # status_codes index into this, 0 means not checked
+    status_codes: List[int]
+    version_ids: List[str]  # version_codes index into this, -1 means no version
+    version_codes: List[int]
+
+
 class StatusResponse(BaseModel):
     last_check: Optional[datetime] = None
     next_check: Optional[datetime] = None
+
+
+class CurrentVersionResponse(BaseModel):
+    version: Optional[str] = None
+    loader: Optional[str] = None
+
+
+# Job Schemas
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str
+    total: int
+    done: int
+    result: dict = {}
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+# Delta Schemas (?since=), deleted holds the keys of removed rows
+class VersionDeltaResponse(BaseModel):
+    changed: List[VersionResponse]
+    deleted: List[int]
+    sync_token: str
+
+
+class TrackedModDeltaResponse(BaseModel):
+    changed: List[TrackedModResponse]
+    deleted: List[str]
+    sync_token: str
+
+
+class ResultDeltaResponse(BaseModel):
+    changed: List[ResultResponse]
+    deleted: List[int]
+    sync_token: str
+
+
+class LogDeltaResponse(BaseModel):
+    changed: List[LogResponse]
+    deleted: List[int]
+    sync_token: str
+
+
+# Dashboard Schemas
+class DashboardResponse(BaseModel):
+    versions: Optional[List[VersionResponse]] = None
+    mods: Optional[List[TrackedModResponse]] = None
+    current_version: Optional[CurrentVersionResponse] = None
+    status: Optional[StatusResponse] = None
+    logs: Optional[List[LogResponse]] = None
+    summaries: Optional[List[VersionSummaryResponse]] = None
+
+
+# Upstream Schemas
+class CoalescingStatsResponse(BaseModel):
+    calls: int
+    deduplicated: int
+
+
+class HedgingStatsResponse(BaseModel):
+    requests: int
+    hedged: int
+    hedge_wins: int  # hedges that answered before the original request
+    p95_ms: Optional[float] = None
+
+
+class UpstreamStatsResponse(BaseModel):
+    coalescing: Dict[str, CoalescingStatsResponse]  # by endpoint
+    hedging_enabled: bool
+    hedging: Dict[str, HedgingStatsResponse]  # by endpoint
@@ -1,13 +1,23 @@
 import asyncio
 import logging
-from datetime import datetime
+import os
+from datetime import datetime, timedelta
 from typing import List, Optional
 
+from sqlalchemy import or_, tuple_
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.core.database import SessionLocal
-from app.models.all import TrackedMod, MCVersion, ModVersion, CompatibilityResult, LogEntry
-from app.services.modrinth import get_mod_compatible_versions, find_mod_version_for_mc
-from app.services.mojang import get_all_versions, get_latest_stable_version, get_version_details
+from app.models.all import TrackedMod, MCVersion, ModVersion, CompatibilityResult, LogEntry, Profile
+from app.services.modrinth import get_mod_versions, get_mod_details, get_mods_details, get_versions_by_hashes
+from app.services.catalog import CHANNEL_TYPES, accepted_loaders, store_catalog, resolve_targets
+from app.services.dependencies import remember_projects, stale_projects
+from app.services.mojang import get_all_versions, get_latest_stable_version, get_version_details, poll_version_manifest
+from app.services.events import publish, publish_log, mod_event_payload
+from app.services.jobs import Job, create_job, finish_job, get_job, update_job
+from app.services.mod_files import hash_jars
+from app.services.outcomes import load_outcomes, record_outcomes
+from app.services.sync import prune_deletions
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +27,7 @@ def add_log(db: Session, level: str, message: str):
     log = LogEntry(level=level, message=message)
     db.add(log)
     db.commit()
+    publish_log(log)
 
 
 async def sync_versions(db: Session):
@@ -91,6 +102,7 @@ async def sync_versions(db: Session):
         
         if to_add:
             db.commit()
+            publish("versions_changed", {"added": [f"{v['id']} ({v['loader']})" for v in to_add]})
 
     except Exception as e:
         logger.error(f"Version sync failed: {e}")
@@ -102,31 +114,39 @@ async def get_target_mc_versions(db: Session) -> List[MCVersion]:
     Get list of MCVersion objects to check against (Current + Newer).
     Returns list of MCVersion instances with all loaders.
     """
+    target_versions = current_targets(db)
+    if not target_versions:
+        # Fallback: get latest stable for all loaders
+        latest_stable = await get_latest_stable_version()
+        if latest_stable:
+            # Find all MC versions matching latest stable version
+            target_versions = db.query(MCVersion).filter(
+                MCVersion.version == latest_stable["id"]
+            ).all()
+    return target_versions
+
+
+def current_targets(db: Session) -> List[MCVersion]:
+    """The current versions (global and per profile) and every newer version, from the DB only"""
     current_versions = db.query(MCVersion).filter(MCVersion.is_current == True).all()
+    # Profiles follow their own current versions, one sweep covers all of them
+    profile_versions = db.query(MCVersion).join(Profile, Profile.current_version_id == MCVersion.id).all()
     
     target_versions = []
     
-    if current_versions:
+    if current_versions or profile_versions:
         # Add all current versions (different loaders)
-        target_versions.extend(current_versions)
+        target_versions.extend(current_versions + profile_versions)
         
-        # Get reference time from first current version
-        current_ref = current_versions[0]
+        # Get reference time from the oldest current version
+        release_times = [v.release_time for v in current_versions + profile_versions if v.release_time]
         
         # Add newer versions (all loaders)
-        if current_ref.release_time:
+        if release_times:
             newer = db.query(MCVersion).filter(
-                MCVersion.release_time > current_ref.release_time
+                MCVersion.release_time > min(release_times)
             ).all()
             target_versions.extend(newer)
-    else:
-        # Fallback: get latest stable for all loaders
-        latest_stable = await get_latest_stable_version()
-        if latest_stable:
-            # Find all MC versions matching latest stable version
-            target_versions = db.query(MCVersion).filter(
-                MCVersion.version == latest_stable["id"]
-            ).all()
     
     # Remove duplicates by ID
     seen_ids = set()
@@ -141,113 +161,237 @@ async def get_target_mc_versions(db: Session) -> List[MCVersion]:
 
 async def check_mod_against_targets(db: Session, tracked_mod: TrackedMod, target_mc_versions: List[MCVersion]):
     """
-    Check a single tracked mod against target MC versions with upsert logic.
-    Creates ModVersion and CompatibilityResult records.
+    Check a single tracked mod against target MC versions.
+    Refreshes the mod's stored version catalog with one Modrinth request, then resolves every target from it.
     """
-    # Group targets by loader
-    targets_by_loader = {}
+    versions, error = await get_mod_versions(tracked_mod.slug, tracked_mod.project_id)
+
+    if error:
+        for loader in sorted({mc_ver.loader for mc_ver in target_mc_versions}):
+            add_log(db, "ERROR", f"Failed to check {tracked_mod.slug} ({loader}): {error}")
+        if tracked_mod.catalog_updated_at is None:
+            # Nothing to resolve from, the checks failed
+            record_outcomes(db, tracked_mod.slug, errored=[v.id for v in target_mc_versions])
+            db.commit()
+            publish("results_updated", {"slug": tracked_mod.slug, "mc_version_ids": [v.id for v in target_mc_versions]})
+            return
+        # Otherwise resolve from the catalog of the last successful fetch
+    else:
+        store_catalog(db, tracked_mod, versions)
+
+    evaluate_mod_against_targets(db, tracked_mod, target_mc_versions)
+
+
+async def resolve_mod_against_targets(db: Session, tracked_mod: TrackedMod, target_mc_versions: List[MCVersion]):
+    """Resolve from the stored catalog when the mod has one, fetching it first otherwise"""
+    if tracked_mod.catalog_updated_at is not None:
+        evaluate_mod_against_targets(db, tracked_mod, target_mc_versions)
+    else:
+        await check_mod_against_targets(db, tracked_mod, target_mc_versions)
+
+
+def evaluate_mod_against_targets(db: Session, tracked_mod: TrackedMod, target_mc_versions: List[MCVersion]):
+    """
+    Resolve a mod against target MC versions from its stored catalog, without network calls.
+    Upserts ModVersion and CompatibilityResult records and removes results of other
+    versions of the mod on these targets (left over from another channel or an older catalog).
+    Profile-only mods keep just their catalog.
+    """
+    if tracked_mod.profile_only:
+        # Profiles resolve from the stored catalog with their own channels, global results would only show up globally
+        db.commit()
+        return
+
+    resolved = resolve_targets(db, tracked_mod, target_mc_versions)
+    compatible_ids, incompatible_ids = [], []
+    current_mod_versions = set()
+
     for mc_ver in target_mc_versions:
-        if mc_ver.loader not in targets_by_loader:
-            targets_by_loader[mc_ver.loader] = []
-        targets_by_loader[mc_ver.loader].append(mc_ver)
-    
-    # Check each loader
-    for loader, mc_versions in targets_by_loader.items():
-        # Fetch compatible versions from Modrinth ONCE per loader
-        compatible_versions, error = await get_mod_compatible_versions(tracked_mod.slug, loader)
-        
-        if error:
-            # Create error results for all targets in this loader
-            for mc_ver in mc_versions:
-                # We can't create ModVersion without version info, so just log error
-                add_log(db, "ERROR", f"Failed to check {tracked_mod.slug} ({loader}): {error}")
+        ver_data = resolved[mc_ver.id]
+        if not ver_data:
+            # Not supported in the mod's channel - no ModVersion to store, the outcome bitsets record it
+            incompatible_ids.append(mc_ver.id)
             continue
+
+        # Upsert ModVersion
+        mod_version = db.query(ModVersion).filter_by(
+            mod_slug=tracked_mod.slug,
+            version_id=ver_data["id"],
+            mc_version_id=mc_ver.id
+        ).first()
         
-        # Check against each MC version for this loader
-        for mc_ver in mc_versions:
-            is_compatible = mc_ver.version in compatible_versions
-            
-            if is_compatible:
-                # Find specific mod version
-                ver_data = await find_mod_version_for_mc(
-                    tracked_mod.slug, 
-                    loader, 
-                    mc_ver.version,
-                    tracked_mod.channel
-                )
-                
-                if ver_data:
-                    # Upsert ModVersion
-                    mod_version = db.query(ModVersion).filter_by(
-                        mod_slug=tracked_mod.slug,
-                        version_id=ver_data["id"],
-                        mc_version_id=mc_ver.id
-                    ).first()
-                    
-                    if mod_version:
-                        # Update existing
-                        mod_version.version_number = ver_data["version_number"]
-                        mod_version.channel = ver_data.get("channel", "release")
-                        mod_version.loader = loader
-                    else:
-                        # Create new
-                        mod_version = ModVersion(
-                            mod_slug=tracked_mod.slug,
-                            version_id=ver_data["id"],
-                            version_number=ver_data["version_number"],
-                            mc_version_id=mc_ver.id,
-                            loader=loader,
-                            channel=ver_data.get("channel", "release")
-                        )
-                        db.add(mod_version)
-                    
-                    db.flush()  # Ensure mod_version.id is available
-                    
-                    # Upsert CompatibilityResult
-                    compat_result = db.query(CompatibilityResult).filter_by(
-                        mod_version_id=mod_version.id,
-                        mc_version_id=mc_ver.id
-                    ).first()
-                    
-                    if compat_result:
-                        # Update existing
-                        compat_result.status = "compatible"
-                        compat_result.error = None
-                        compat_result.checked_at = datetime.utcnow()
-                    else:
-                        # Create new
-                        compat_result = CompatibilityResult(
-                            mod_version_id=mod_version.id,
-                            mc_version_id=mc_ver.id,
-                            status="compatible",
-                            checked_at=datetime.utcnow()
-                        )
-                        db.add(compat_result)
-            else:
-                # Incompatible - we don't create ModVersion, but could log it
-                # For now, just skip (no record means incompatible)
-                pass
+        # Set when the version comes from a compatible loader, e.g. a Fabric build on Quilt
+        source_loader = ver_data["loader"] if ver_data.get("loader", mc_ver.loader) != mc_ver.loader else None
+        if mod_version:
+            # Update existing
+            mod_version.version_number = ver_data["version_number"]
+            mod_version.channel = ver_data.get("channel", "release")
+            mod_version.loader = mc_ver.loader
+            mod_version.source_loader = source_loader
+        else:
+            # Create new
+            mod_version = ModVersion(
+                mod_slug=tracked_mod.slug,
+                version_id=ver_data["id"],
+                version_number=ver_data["version_number"],
+                mc_version_id=mc_ver.id,
+                loader=mc_ver.loader,
+                source_loader=source_loader,
+                channel=ver_data.get("channel", "release")
+            )
+            db.add(mod_version)
+        
+        db.flush()  # Ensure mod_version.id is available
+        current_mod_versions.add(mod_version.id)
+        
+        # Upsert CompatibilityResult
+        compat_result = db.query(CompatibilityResult).filter_by(
+            mod_version_id=mod_version.id,
+            mc_version_id=mc_ver.id
+        ).first()
+        
+        if compat_result:
+            # Update existing, only a changed outcome counts as a change for sync clients
+            if compat_result.status != "compatible" or compat_result.error is not None:
+                compat_result.updated_at = datetime.utcnow()
+            compat_result.status = "compatible"
+            compat_result.error = None
+            compat_result.checked_at = datetime.utcnow()
+        else:
+            # Create new
+            compat_result = CompatibilityResult(
+                mod_version_id=mod_version.id,
+                mc_version_id=mc_ver.id,
+                status="compatible",
+                checked_at=datetime.utcnow()
+            )
+            db.add(compat_result)
+        compatible_ids.append(mc_ver.id)
+
+    superseded = db.query(CompatibilityResult).join(
+        ModVersion, CompatibilityResult.mod_version_id == ModVersion.id
+    ).filter(
+        ModVersion.mod_slug == tracked_mod.slug,
+        CompatibilityResult.mc_version_id.in_([v.id for v in target_mc_versions]),
+        CompatibilityResult.mod_version_id.notin_(current_mod_versions)
+    ).all()
+    for compat_result in superseded:
+        db.delete(compat_result)
+
+    record_outcomes(db, tracked_mod.slug, compatible=compatible_ids, incompatible=incompatible_ids)
     
     db.commit()
+    publish("results_updated", {"slug": tracked_mod.slug, "mc_version_ids": [v.id for v in target_mc_versions]})
     add_log(db, "INFO", f"Checked {tracked_mod.slug} against {len(target_mc_versions)} MC versions")
 
 
-async def check_single_mod_task(mod_slug: str):
-    """Background task to check a single mod after it's added"""
+def store_mod_details(tracked_mod: TrackedMod, details: dict) -> bool:
+    """Set project id and supported sides fetched from Modrinth, returning whether any of them changed"""
+    values = {
+        "project_id": details.get("id") or tracked_mod.project_id,
+        "supported_client_side": details.get("client_side"),
+        "supported_server_side": details.get("server_side"),
+    }
+    changed = any(getattr(tracked_mod, field) != value for field, value in values.items())
+    for field, value in values.items():
+        setattr(tracked_mod, field, value)
+    tracked_mod.project_id_checked_at = datetime.utcnow()
+    return changed
+
+
+def adopt_mod(tracked_mod: TrackedMod, side: str, channel: str):
+    """Track a profile-only mod globally, with the side and channel it is now added with"""
+    tracked_mod.profile_only = False
+    tracked_mod.side = side
+    tracked_mod.channel = channel
+
+
+def apply_mod_details(db: Session, tracked_mod: TrackedMod, details: Optional[dict]):
+    """Store project id and supported sides fetched from Modrinth and notify clients"""
+    if not details:
+        return
+    store_mod_details(tracked_mod, details)
+    db.commit()
+    if not tracked_mod.profile_only:
+        publish("mod_updated", mod_event_payload(tracked_mod))
+
+
+async def refresh_project_ids(db: Session, tracked_mods: List[TrackedMod]):
+    """
+    Resolve the project ids of mods that have none and revalidate ids older than
+    PROJECT_ID_REVALIDATE_HOURS, with bulk /projects requests. Known ids are looked up
+    by id, so renamed projects are still found. Sides are refreshed from the same response,
+    and so are the names of stale dependency projects the exports remember.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=settings.PROJECT_ID_REVALIDATE_HOURS)
+    stale = [
+        mod for mod in tracked_mods
+        if mod.project_id is None or mod.project_id_checked_at is None or mod.project_id_checked_at < cutoff
+    ]
+    dependencies = stale_projects()
+    if not stale and not dependencies:
+        return
+
+    details = await get_mods_details([mod.project_id or mod.slug for mod in stale] + dependencies)
+    remember_projects({project_id: details.get(project_id) for project_id in dependencies})
+    updated = []
+    for tracked_mod in stale:
+        info = details.get(tracked_mod.project_id or tracked_mod.slug)
+        if not info:
+            continue
+        if info.get("slug") and info["slug"].lower() != tracked_mod.slug.lower():
+            add_log(db, "INFO", f"Mod {tracked_mod.slug} was renamed to {info['slug']} on Modrinth")
+        if store_mod_details(tracked_mod, info) and not tracked_mod.profile_only:
+            updated.append(tracked_mod)
+    db.commit()
+    for tracked_mod in updated:
+        publish("mod_updated", mod_event_payload(tracked_mod))
+
+
+async def reresolve_mod_task(mod_slug: str):
+    """
+    Background task to re-resolve a mod from its stored catalog against the current targets,
+    e.g. after a channel change. Makes no Modrinth or Mojang requests; a mod whose catalog
+    hasn't been fetched yet gets a regular check instead.
+    """
     db = SessionLocal()
     try:
-        await sync_versions(db)
-        
-        target_mc_versions = await get_target_mc_versions(db)
-        if not target_mc_versions:
-            add_log(db, "INFO", "No target versions set. Skipping check for new mod.")
+        tracked_mod = db.query(TrackedMod).filter(TrackedMod.slug == mod_slug).first()
+        if not tracked_mod:
+            return
+        if tracked_mod.catalog_updated_at is None:
+            await check_mods_task([mod_slug])
             return
 
+        target_mc_versions = current_targets(db)
+        if target_mc_versions:
+            evaluate_mod_against_targets(db, tracked_mod, target_mc_versions)
+    except Exception as e:
+        logger.error(f"Re-resolving {mod_slug} failed: {e}")
+        add_log(db, "ERROR", f"Single mod check failed: {str(e)}")
+    finally:
+        db.close()
+
+
+async def check_single_mod_task(mod_slug: str):
+    """Background task to enrich a newly added mod with its supported sides and check it"""
+    db = SessionLocal()
+    try:
+        # Metadata fetch and version sync are independent, run them together
+        details, _ = await asyncio.gather(get_mod_details(mod_slug), sync_versions(db))
+
         tracked_mod = db.query(TrackedMod).filter(TrackedMod.slug == mod_slug).first()
         if not tracked_mod:
             add_log(db, "ERROR", f"Tracked mod '{mod_slug}' not found for background check")
             return
 
+        apply_mod_details(db, tracked_mod, details)
+        
+        target_mc_versions = await get_target_mc_versions(db)
+        if not target_mc_versions:
+            add_log(db, "INFO", "No target versions set. Skipping check for new mod.")
+            return
+
         add_log(db, "INFO", f"Starting background check for {tracked_mod.slug}")
         await check_mod_against_targets(db, tracked_mod, target_mc_versions)
 
@@ -261,6 +405,7 @@ async def check_single_mod_task(mod_slug: str):
 async def check_all_mods():
     """Background job to check all tracked mods"""
     db = SessionLocal()
+    job = None
 
     try:
         # 1. Sync Versions
@@ -280,17 +425,252 @@ async def check_all_mods():
             add_log(db, "INFO", "No tracked mods to check")
             return
 
-        # 3. Check Mods
-        for tracked_mod in tracked_mods:
+        # 3. Check Mods, by project id
+        await refresh_project_ids(db, tracked_mods)
+        job = create_job("check_all", total=len(tracked_mods))
+        for i, tracked_mod in enumerate(tracked_mods, start=1):
             await check_mod_against_targets(db, tracked_mod, target_mc_versions)
+            update_job(job, done=i)
 
         add_log(db, "INFO", "Compatibility check completed")
+        finish_job(job)
+        prune_deletions(db)
 
     except Exception as e:
         logger.error(f"Background job error: {e}")
         add_log(db, "ERROR", f"Background job failed: {str(e)}")
+        if job:
+            finish_job(job, error=str(e))
+    finally:
+        db.close()
+
+
+async def check_mods_task(mod_slugs: List[str], job_id: Optional[str] = None, enrich_slugs: Optional[List[str]] = None):
+    """
+    Background task to check a batch of mods in one job, sharing one version sync.
+    Mods in `enrich_slugs` first get their supported sides with a bulk Modrinth request.
+    """
+    job = (get_job(job_id) if job_id else None) or create_job("check_mods")
+    db = SessionLocal()
+    try:
+        if enrich_slugs:
+            details = await get_mods_details(enrich_slugs)
+            for tracked_mod in db.query(TrackedMod).filter(TrackedMod.slug.in_(enrich_slugs)).all():
+                apply_mod_details(db, tracked_mod, details.get(tracked_mod.slug))
+
+        await _check_mods(db, mod_slugs, job)
+        finish_job(job)
+    except Exception as e:
+        logger.error(f"Batch mod check failed: {e}")
+        add_log(db, "ERROR", f"Batch mod check failed: {str(e)}")
+        finish_job(job, error=str(e))
+    finally:
+        db.close()
+
+
+async def _check_mods(db: Session, mod_slugs: List[str], job: Job):
+    """
+    Check the given mods against the current targets, reporting progress on the job.
+    Mods with a stored catalog are re-resolved without Modrinth requests.
+    """
+    await sync_versions(db)
+
+    target_mc_versions = await get_target_mc_versions(db)
+    if not target_mc_versions:
+        add_log(db, "INFO", "No target versions set. Skipping check for new mod.")
+        return
+
+    tracked_mods = db.query(TrackedMod).filter(TrackedMod.slug.in_(mod_slugs)).all()
+    await refresh_project_ids(db, tracked_mods)
+    update_job(job, done=0, total=len(tracked_mods))
+    add_log(db, "INFO", f"Starting batch check for {len(tracked_mods)} mods")
+    for i, tracked_mod in enumerate(tracked_mods, start=1):
+        await resolve_mod_against_targets(db, tracked_mod, target_mc_versions)
+        update_job(job, done=i)
+
+
+async def import_mods_task(job_id: str, mod_slugs: List[str], side: str = "server", channel: str = "release"):
+    """
+    Background task for bulk imports:
+    1. Fetch side information for all mods with bulk Modrinth requests.
+    2. Insert all new mods in one transaction.
+    3. Check them in one batched job.
+    """
+    job = get_job(job_id) or create_job("import")
+    db = SessionLocal()
+    try:
+        update_job(job, done=0, total=len(mod_slugs))
+        details = await get_mods_details(mod_slugs)
+
+        # Another request may have added some of them in the meantime, mods tracked only for profiles are adopted
+        existing = {m.slug: m for m in db.query(TrackedMod).filter(TrackedMod.slug.in_(mod_slugs)).all()}
+        adopted = [m for m in existing.values() if m.profile_only]
+        for tracked_mod in adopted:
+            adopt_mod(tracked_mod, side, channel)
+        new_mods = [TrackedMod(slug=slug, side=side, channel=channel) for slug in mod_slugs if slug not in existing]
+        for tracked_mod in new_mods:
+            if details.get(tracked_mod.slug):
+                store_mod_details(tracked_mod, details[tracked_mod.slug])
+        db.add_all(new_mods)
+        db.commit()
+
+        added = [mod.slug for mod in new_mods + adopted]
+        job.result.update({"added": len(added), "skipped": len(mod_slugs) - len(added)})
+        if added:
+            publish("mods_imported", {"added": len(added)})
+        add_log(db, "INFO", f"Imported {len(added)} mods from YAML")
+
+        if added:
+            await _check_mods(db, added, job)
+        finish_job(job)
+
+    except Exception as e:
+        logger.error(f"Import task failed: {e}")
+        add_log(db, "ERROR", f"Import failed: {str(e)}")
+        finish_job(job, error=str(e))
+    finally:
+        db.close()
+
+
+async def import_files_task(job_id: str, source: str, side: str = "server", channel: str = "release",
+                            remove_source: bool = False):
+    """
+    Background task for imports from jar files (a zip archive or a mods directory):
+    1. Hash every jar on a thread pool, streaming the files.
+    2. Identify them with one /version_files request by SHA-512, retrying the unknown ones by SHA-1
+       (older uploads are only indexed by SHA-1), and name their projects with bulk /projects requests.
+    3. Track the new mods and flag the installed versions as ModVersion baselines on the current targets,
+       which results show next to the resolved version.
+    4. Check the new mods in one batched job.
+    """
+    job = get_job(job_id) or create_job("import")
+    db = SessionLocal()
+    try:
+        digests = await hash_jars(source)
+        update_job(job, done=0, total=len(digests))
+        found = await get_versions_by_hashes([sha512 for _, sha512 in digests.values()])
+        installed = {name: found[sha512] for name, (_, sha512) in digests.items() if sha512 in found}
+        retry = {name: sha1 for name, (sha1, _) in digests.items() if name not in installed}
+        if retry:
+            found = await get_versions_by_hashes(list(retry.values()), "sha1")
+            installed.update({name: found[sha1] for name, sha1 in retry.items() if sha1 in found})
+        unidentified = [name for name in digests if name not in installed]
+
+        project_ids = list(dict.fromkeys(v["project_id"] for v in installed.values() if v.get("project_id")))
+        details = await get_mods_details(project_ids)
+        projects = {pid: info for pid, info in details.items() if info and info.get("slug")}
+
+        # Mods may be tracked under their slug from before project ids were stored
+        tracked = db.query(TrackedMod).filter(or_(
+            TrackedMod.project_id.in_(project_ids),
+            TrackedMod.slug.in_([info["slug"] for info in projects.values()])
+        )).all() if projects else []
+        project_by_slug = {info["slug"]: pid for pid, info in projects.items()}
+        by_project = {}
+        for tracked_mod in tracked:
+            pid = tracked_mod.project_id if tracked_mod.project_id in projects else project_by_slug.get(tracked_mod.slug)
+            by_project.setdefault(pid, tracked_mod)
+
+        channels = list(CHANNEL_TYPES)
+
+        new_mods, adopted = [], []
+        for pid, info in projects.items():
+            tracked_mod = by_project.get(pid)
+            if tracked_mod is not None and not tracked_mod.profile_only:
+                continue
+            # Pre-release jars need a channel that includes them, or the check would call them incompatible
+            types = [v.get("version_type") or "release" for v in installed.values() if v.get("project_id") == pid]
+            mod_channel = next(
+                (c for c in channels[channels.index(channel):] if all(t in CHANNEL_TYPES[c] for t in types)), "alpha"
+            )
+            if tracked_mod is not None:
+                # Tracked only for profiles so far
+                adopt_mod(tracked_mod, side, mod_channel)
+                adopted.append(tracked_mod)
+                continue
+            tracked_mod = TrackedMod(slug=info["slug"], side=side, channel=mod_channel)
+            store_mod_details(tracked_mod, info)
+            by_project[pid] = tracked_mod
+            new_mods.append(tracked_mod)
+        db.add_all(new_mods)
+        db.flush()
+
+        # Baselines: one installed version per mod and current target it supports, the newest jar when
+        # an upload holds several versions of a mod (or the same jar twice)
+        current = db.query(MCVersion).filter(MCVersion.is_current == True).all()
+        picks = {}
+        for version in sorted(installed.values(), key=lambda v: v.get("date_published") or ""):
+            tracked_mod = by_project.get(version.get("project_id"))
+            if not tracked_mod:
+                continue
+            for mc_ver in current:
+                loader = next((l for l in accepted_loaders(mc_ver.loader) if l in (version.get("loaders") or [])), None)
+                if loader is not None and mc_ver.version in (version.get("game_versions") or []):
+                    picks[(tracked_mod.slug, mc_ver.id)] = (version, mc_ver, loader)
+
+        # Replace the baselines of earlier imports, reusing stored rows of the same version
+        existing = {}
+        if picks:
+            rows = db.query(ModVersion).filter(
+                ModVersion.mod_slug.in_({slug for slug, _ in picks}),
+                ModVersion.mc_version_id.in_({mc_id for _, mc_id in picks})
+            ).all()
+            existing = {(row.mod_slug, row.mc_version_id, row.version_id): row for row in rows}
+        changed = set()
+        for (slug, mc_id, version_id), row in existing.items():
+            if (slug, mc_id) in picks and row.installed != (picks[(slug, mc_id)][0]["id"] == version_id):
+                row.installed = not row.installed
+                changed.add((slug, mc_id))
+        for (slug, mc_id), (version, mc_ver, loader) in picks.items():
+            if (slug, mc_id, version["id"]) not in existing:
+                changed.add((slug, mc_id))
+                existing[(slug, mc_id, version["id"])] = ModVersion(
+                    mod_slug=slug,
+                    version_id=version["id"],
+                    version_number=version.get("version_number") or version["id"],
+                    mc_version_id=mc_id,
+                    loader=mc_ver.loader,
+                    source_loader=loader if loader != mc_ver.loader else None,
+                    channel=version.get("version_type") or "release",
+                    installed=True
+                )
+                db.add(existing[(slug, mc_id, version["id"])])
+
+        # Results carry the installed version, delta sync has to see them again
+        if changed:
+            now = datetime.utcnow()
+            for result in db.query(CompatibilityResult).join(
+                ModVersion, CompatibilityResult.mod_version_id == ModVersion.id
+            ).filter(tuple_(ModVersion.mod_slug, CompatibilityResult.mc_version_id).in_(changed)):
+                result.updated_at = now
+        db.commit()
+
+        added = [mod.slug for mod in new_mods + adopted]
+        job.result.update({
+            "added": len(added),
+            "skipped": len(projects) - len(added),
+            "unidentified": unidentified
+        })
+        update_job(job, done=len(digests))
+        if added:
+            publish("mods_imported", {"added": len(added)})
+        add_log(db, "INFO", f"Imported {len(added)} mods from {len(digests)} jar files ({len(unidentified)} unidentified)")
+
+        if added:
+            await _check_mods(db, added, job)
+        finish_job(job)
+
+    except Exception as e:
+        logger.error(f"File import task failed: {e}")
+        db.rollback()
+        try:
+            add_log(db, "ERROR", f"Import failed: {str(e)}")
+        finally:
+            finish_job(job, error=str(e))
     finally:
         db.close()
+        if remove_source:
+            os.remove(source)
 
 
 async def background_loop():
@@ -305,49 +685,147 @@ async def background_loop():
         await asyncio.sleep(3600)
 
 
+_watched_release: Optional[str] = None
+
+
+async def watch_manifest_loop():
+    """Poll the Mojang manifest every MANIFEST_POLL_INTERVAL seconds, checking new releases as they appear"""
+    while True:
+        await asyncio.sleep(settings.MANIFEST_POLL_INTERVAL)
+        try:
+            await check_new_release()
+        except Exception as e:
+            logger.error(f"Manifest watch error: {e}")
+
+
+async def check_new_release():
+    """
+    Poll the manifest with a conditional GET, unchanged polls end at a 304.
+    When the latest release changes, import it and check every mod against the
+    release's targets that no mod has been checked against yet, ahead of the hourly sweep.
+    """
+    global _watched_release
+    manifest, _ = await poll_version_manifest()
+    latest = manifest.get("latest", {}).get("release")
+    # Other callers may have fetched the new manifest first, so compare releases rather than relying on `changed`
+    if not latest or latest == _watched_release:
+        return
+    if _watched_release is None:
+        # First poll after startup, the startup sweep covers releases made while we were down
+        _watched_release = latest
+        return
+
+    db = SessionLocal()
+    try:
+        await sync_versions(db)
+        targets = [v for v in await get_target_mc_versions(db) if v.version == latest]
+        checked = load_outcomes(db).by_target
+        target_ids = [v.id for v in targets if v.id not in checked]
+    finally:
+        db.close()
+    _watched_release = latest
+
+    if target_ids:
+        await check_targets_task(target_ids)
+
+
+async def check_targets_task(target_ids: List[int]):
+    """
+    Prioritized check of all mods against the given targets only.
+    Catalogs are fetched fresh, stored ones predate a new release.
+    """
+    db = SessionLocal()
+    job = None
+    try:
+        targets = db.query(MCVersion).filter(MCVersion.id.in_(target_ids)).order_by(MCVersion.loader).all()
+        tracked_mods = db.query(TrackedMod).all()
+        if not targets or not tracked_mods:
+            return
+
+        label = f"{', '.join(sorted({v.version for v in targets}))} ({', '.join(v.loader for v in targets)})"
+        add_log(db, "INFO", f"Starting compatibility checks for {len(tracked_mods)} mods against {label}")
+
+        job = create_job("check_version", total=len(tracked_mods))
+        for i, tracked_mod in enumerate(tracked_mods, start=1):
+            await check_mod_against_targets(db, tracked_mod, targets)
+            update_job(job, done=i)
+
+        add_log(db, "INFO", f"Completed checks for new version {label}")
+        finish_job(job)
+
+    except Exception as e:
+        logger.error(f"Target check failed: {e}")
+        add_log(db, "ERROR", f"Background job failed: {str(e)}")
+        if job:
+            finish_job(job, error=str(e))
+    finally:
+        db.close()
+
+
 async def enrich_and_check_version_task(version_id: str, loader: str):
     """
     Background task to:
     1. Fetch official details for the manually added version.
     2. Check all mods against this new version.
     """
+    await enrich_and_check_versions_task(version_id, [loader])
+
+
+async def enrich_and_check_versions_task(version_id: str, loaders: List[str]):
+    """
+    Background task for a version added with one or more loaders:
+    1. Fetch official details once and apply them to every loader's row.
+    2. Resolve all mods against the new targets in one pass, from their stored catalogs where available.
+    """
     db = SessionLocal()
+    # Created up front so clients see enrichment failures too, not only failed checks
+    job = create_job("check_version")
+    loaders_label = ", ".join(loaders)
     try:
-        logger.info(f"Enriching version {version_id} ({loader})...")
+        logger.info(f"Enriching version {version_id} ({loaders_label})...")
         details = await get_version_details(version_id)
         
-        target_version_obj = db.query(MCVersion).filter_by(
-            version=version_id,
-            loader=loader
-        ).first()
+        target_version_objs = db.query(MCVersion).filter(
+            MCVersion.version == version_id,
+            MCVersion.loader.in_(loaders)
+        ).all()
         
-        if not target_version_obj:
-            logger.error(f"Version {version_id} ({loader}) not found in DB during background enrichment")
+        if not target_version_objs:
+            logger.error(f"Version {version_id} ({loaders_label}) not found in DB during background enrichment")
+            finish_job(job, error=f"Version {version_id} ({loaders_label}) not found")
             return
 
         if details:
-            target_version_obj.release_time = details["release_dt"]
-            target_version_obj.type = details["type"]
-            target_version_obj.url = details.get("url")
+            for target_version_obj in target_version_objs:
+                target_version_obj.release_time = details["release_dt"]
+                target_version_obj.type = details["type"]
+                target_version_obj.url = details.get("url")
             db.commit()
-            add_log(db, "INFO", f"Updated version {version_id} ({loader}) with official release time")
+            publish("versions_changed", {"updated": [f"{version_id} ({v.loader})" for v in target_version_objs]})
+            add_log(db, "INFO", f"Updated version {version_id} ({loaders_label}) with official release time")
         else:
             add_log(db, "WARNING", f"Could not find official details for {version_id}. Using defaults.")
 
         # Check all tracked mods against this version
         tracked_mods = db.query(TrackedMod).all()
         if not tracked_mods:
+            finish_job(job)
             return
 
-        add_log(db, "INFO", f"Starting compatibility checks for {len(tracked_mods)} mods against {version_id} ({loader})")
+        add_log(db, "INFO", f"Starting compatibility checks for {len(tracked_mods)} mods against {version_id} ({loaders_label})")
         
-        for tracked_mod in tracked_mods:
-            await check_mod_against_targets(db, tracked_mod, [target_version_obj])
+        update_job(job, done=0, total=len(tracked_mods))
+        for i, tracked_mod in enumerate(tracked_mods, start=1):
+            await resolve_mod_against_targets(db, tracked_mod, target_version_objs)
+            update_job(job, done=i)
             
-        add_log(db, "INFO", f"Completed checks for new version {version_id} ({loader})")
+        add_log(db, "INFO", f"Completed checks for new version {version_id} ({loaders_label})")
+        finish_job(job)
 
     except Exception as e:
         logger.error(f"Enrichment task failed: {e}")
         add_log(db, "ERROR", f"Enrichment task failed for {version_id}: {str(e)}")
+        publish("version_check_failed", {"version": version_id, "loaders": loaders, "error": str(e)})
+        finish_job(job, error=str(e))
     finally:
         db.close()
@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import case
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.all import CatalogVersion, CatalogGameVersion, CatalogLoader, CatalogDependency, MCVersion, TrackedMod
+
+# Version types each channel accepts, each channel also accepts the more stable ones
+CHANNEL_TYPES = {
+    "release": ["release"],
+    "beta": ["release", "beta"],
+    "alpha": ["release", "beta", "alpha"],
+}
+
+
+def _parse_published(value: Optional[str]) -> Optional[datetime]:
+    """Modrinth timestamps are ISO 8601 in UTC, stored naive like every other column"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def _signature(version_number, version_type, date_published, project_id, game_versions, loaders, dependencies) -> tuple:
+    return (version_number, version_type, date_published, project_id,
+            frozenset(game_versions), frozenset(loaders), frozenset(dependencies))
+
+
+def _dependency_key(dependency: dict) -> tuple:
+    return dependency.get("project_id"), dependency.get("version_id"), dependency.get("dependency_type") or "required"
+
+
+def store_catalog(db: Session, tracked_mod: TrackedMod, versions: List[dict]) -> bool:
+    """
+    Replace the stored catalog of a mod with freshly fetched Modrinth versions.
+    Only added, removed or edited versions are written. Returns whether anything changed.
+    """
+    slug = tracked_mod.slug
+    stored = {
+        version_id: [number, version_type, published, project_id, set(), set(), set()]
+        for version_id, number, version_type, published, project_id in db.query(
+            CatalogVersion.id, CatalogVersion.version_number, CatalogVersion.version_type,
+            CatalogVersion.date_published, CatalogVersion.project_id
+        ).filter(CatalogVersion.mod_slug == slug).all()
+    }
+    for version_id, game_version in db.query(CatalogGameVersion.version_id, CatalogGameVersion.game_version).join(
+        CatalogVersion, CatalogGameVersion.version_id == CatalogVersion.id
+    ).filter(CatalogVersion.mod_slug == slug).all():
+        stored[version_id][4].add(game_version)
+    for version_id, loader in db.query(CatalogLoader.version_id, CatalogLoader.loader).join(
+        CatalogVersion, CatalogLoader.version_id == CatalogVersion.id
+    ).filter(CatalogVersion.mod_slug == slug).all():
+        stored[version_id][5].add(loader)
+    for version_id, project_id, dependency_version_id, dependency_type in db.query(
+        CatalogDependency.version_id, CatalogDependency.project_id,
+        CatalogDependency.dependency_version_id, CatalogDependency.dependency_type
+    ).join(
+        CatalogVersion, CatalogDependency.version_id == CatalogVersion.id
+    ).filter(CatalogVersion.mod_slug == slug).all():
+        stored[version_id][6].add((project_id, dependency_version_id, dependency_type))
+
+    fetched = {}
+    for v in versions:
+        if not v.get("id"):
+            continue
+        fetched[v["id"]] = _signature(
+            v.get("version_number") or v["id"],
+            v.get("version_type") or "release",
+            _parse_published(v.get("date_published")),
+            v.get("project_id"),
+            v.get("game_versions") or [],
+            v.get("loaders") or [],
+            [_dependency_key(d) for d in v.get("dependencies") or []]
+        )
+
+    current = {version_id: _signature(*values) for version_id, values in stored.items()}
+    stale = [version_id for version_id, sig in current.items() if fetched.get(version_id) != sig]
+    new = [version_id for version_id, sig in fetched.items() if current.get(version_id) != sig]
+
+    if stale:
+        for child in (CatalogGameVersion, CatalogLoader, CatalogDependency):
+            db.query(child).filter(child.version_id.in_(stale)).delete(synchronize_session=False)
+        db.query(CatalogVersion).filter(CatalogVersion.id.in_(stale)).delete(synchronize_session=False)
+
+    for version_id in new:
+        number, version_type, published, project_id, game_versions, loaders, dependencies = fetched[version_id]
+        db.add(CatalogVersion(
+            id=version_id,
+            mod_slug=slug,
+            project_id=project_id,
+            version_number=number,
+            version_type=version_type,
+            date_published=published,
+            game_versions=[CatalogGameVersion(game_version=gv) for gv in game_versions],
+            loaders=[CatalogLoader(loader=loader) for loader in loaders],
+            dependencies=[
+                CatalogDependency(project_id=dep_project, dependency_version_id=dep_version, dependency_type=dep_type)
+                for dep_project, dep_version, dep_type in dependencies
+            ]
+        ))
+    db.flush()  # Sessions don't autoflush, resolve_targets queries these rows
+
+    changed = bool(stale or new)
+    if changed or tracked_mod.catalog_updated_at is None:
+        tracked_mod.catalog_updated_at = datetime.utcnow()
+    return changed
+
+
+def accepted_loaders(loader: str) -> List[str]:
+    """Loaders whose mods run on a loader, its own first, then those from LOADER_COMPATIBILITY"""
+    return [loader] + [other for other in settings.LOADER_COMPATIBILITY.get(loader, []) if other != loader]
+
+
+def resolve_targets(db: Session, tracked_mod: TrackedMod, targets: List[MCVersion],
+                    channel: Optional[str] = None) -> Dict[int, Optional[dict]]:
+    """
+    Pick the version to use for each target from the stored catalog in one query:
+    the newest release if the channel (the mod's own unless given) has one, otherwise the newest allowed pre-release.
+    Versions built for the target's own loader win over those of compatible loaders,
+    `loader` tells which one was used. Targets the mod doesn't support in its channel map to None.
+    """
+    return resolve_mods(db, {tracked_mod.slug: channel or tracked_mod.channel}, targets)[tracked_mod.slug]
+
+
+def resolve_mods(db: Session, channels: Dict[str, str], targets: List[MCVersion]) -> Dict[str, Dict[int, Optional[dict]]]:
+    """resolve_targets for several mods at once, given {slug: channel}, still in one query"""
+    resolved: Dict[str, Dict[int, Optional[dict]]] = {slug: {target.id: None for target in targets} for slug in channels}
+    if not targets or not channels:
+        return resolved
+    loaders = {target.id: accepted_loaders(target.loader) for target in targets}
+    allowed = {slug: CHANNEL_TYPES.get(channel, ["release"]) for slug, channel in channels.items()}
+
+    rows = db.query(
+        CatalogVersion.mod_slug,
+        CatalogVersion.id,
+        CatalogVersion.version_number,
+        CatalogVersion.version_type,
+        CatalogGameVersion.game_version,
+        CatalogLoader.loader
+    ).join(
+        CatalogGameVersion, CatalogGameVersion.version_id == CatalogVersion.id
+    ).join(
+        CatalogLoader, CatalogLoader.version_id == CatalogVersion.id
+    ).filter(
+        CatalogVersion.mod_slug.in_(list(channels)),
+        CatalogVersion.version_type.in_({t for types in allowed.values() for t in types}),
+        CatalogGameVersion.game_version.in_({t.version for t in targets}),
+        CatalogLoader.loader.in_({loader for accepted in loaders.values() for loader in accepted})
+    ).order_by(
+        case((CatalogVersion.version_type == "release", 0), else_=1),
+        CatalogVersion.date_published.desc()
+    ).all()
+
+    best = {}
+    for slug, version_id, number, version_type, game_version, loader in rows:
+        # Each mod only takes the version types of its own channel
+        if version_type in allowed[slug]:
+            best.setdefault((slug, game_version, loader), {
+                "id": version_id, "version_number": number, "channel": version_type, "loader": loader
+            })
+
+    for slug in channels:
+        for target in targets:
+            resolved[slug][target.id] = next(
+                (best[(slug, target.version, loader)] for loader in loaders[target.id]
+                 if (slug, target.version, loader) in best), None
+            )
+    return resolved
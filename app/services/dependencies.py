@@ -0,0 +1,316 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from anyio import from_thread
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.all import CatalogVersion, CatalogGameVersion, CatalogLoader, CatalogDependency, MCVersion, TrackedMod
+from app.services.catalog import accepted_loaders
+from app.services.modrinth import get_versions, get_mods_details, get_mod_versions
+
+# Modrinth data fetched for dependencies outside the tracked catalogs. Versions are immutable
+# enough to keep for the process lifetime; project details are revalidated like tracked project
+# ids and version lists after DEPENDENCY_VERSIONS_REVALIDATE_MINUTES. Misses are retried.
+_version_memo: Dict[str, dict] = {}
+_project_memo: Dict[str, Tuple[datetime, dict]] = {}
+_project_versions_memo: Dict[str, Tuple[datetime, List[dict]]] = {}
+
+
+def clear_dependency_memo():
+    _version_memo.clear()
+    _project_memo.clear()
+    _project_versions_memo.clear()
+
+
+def stale_projects() -> List[str]:
+    """Memoized dependency projects older than PROJECT_ID_REVALIDATE_HOURS"""
+    cutoff = datetime.utcnow() - timedelta(hours=settings.PROJECT_ID_REVALIDATE_HOURS)
+    return sorted(project_id for project_id, (checked_at, _) in _project_memo.items() if checked_at < cutoff)
+
+
+def remember_projects(details: Dict[str, Optional[dict]]):
+    """Memoize fetched project details, forgetting projects Modrinth no longer knows"""
+    now = datetime.utcnow()
+    for project_id, info in details.items():
+        if info:
+            _project_memo[project_id] = (now, info)
+        else:
+            _project_memo.pop(project_id, None)
+
+
+def _run(request, *args):
+    """Run a Modrinth request on the event loop from the worker thread resolving an export"""
+    return from_thread.run(request, *args)
+
+
+def _catalog_versions(db: Session, version_ids: Iterable[str]) -> Dict[str, dict]:
+    """Stored catalog versions shaped like Modrinth version objects"""
+    ids = list(set(version_ids))
+    if not ids:
+        return {}
+
+    versions = {
+        version_id: {
+            "id": version_id, "project_id": project_id, "version_type": version_type,
+            "date_published": published.isoformat() if published else "",
+            "game_versions": [], "loaders": [], "dependencies": []
+        }
+        for version_id, project_id, version_type, published in db.query(
+            CatalogVersion.id, CatalogVersion.project_id, CatalogVersion.version_type, CatalogVersion.date_published
+        ).filter(CatalogVersion.id.in_(ids)).all()
+    }
+    for version_id, game_version in db.query(CatalogGameVersion.version_id, CatalogGameVersion.game_version).filter(
+        CatalogGameVersion.version_id.in_(ids)
+    ).all():
+        versions[version_id]["game_versions"].append(game_version)
+    for version_id, loader in db.query(CatalogLoader.version_id, CatalogLoader.loader).filter(
+        CatalogLoader.version_id.in_(ids)
+    ).all():
+        versions[version_id]["loaders"].append(loader)
+    for version_id, project_id, dependency_version_id, dependency_type in db.query(
+        CatalogDependency.version_id, CatalogDependency.project_id,
+        CatalogDependency.dependency_version_id, CatalogDependency.dependency_type
+    ).filter(CatalogDependency.version_id.in_(ids)).all():
+        versions[version_id]["dependencies"].append({
+            "project_id": project_id, "version_id": dependency_version_id, "dependency_type": dependency_type
+        })
+    return versions
+
+
+def _tracked_project_versions(db: Session, project_ids: Iterable[str]) -> Dict[str, List[dict]]:
+    """Stored catalogs of the given projects that are tracked (e.g. client-only) and fetched"""
+    rows = db.query(TrackedMod.project_id, CatalogVersion.id).join(
+        CatalogVersion, CatalogVersion.mod_slug == TrackedMod.slug
+    ).filter(
+        TrackedMod.project_id.in_(list(project_ids)),
+        TrackedMod.catalog_updated_at.isnot(None)
+    ).all()
+    versions = _catalog_versions(db, [version_id for _, version_id in rows])
+    catalogs: Dict[str, List[dict]] = {}
+    for project_id, version_id in rows:
+        catalogs.setdefault(project_id, []).append(versions[version_id])
+    return catalogs
+
+
+def _supports(version: dict, target: MCVersion) -> bool:
+    return target.version in (version.get("game_versions") or []) and any(
+        loader in (version.get("loaders") or []) for loader in accepted_loaders(target.loader)
+    )
+
+
+def _best_version(versions: List[dict], target: MCVersion) -> Optional[dict]:
+    """
+    The version of an unpinned dependency to use on a target, picked like resolve_targets:
+    the target's own loader first, releases before pre-releases, the newest first.
+    """
+    loaders = accepted_loaders(target.loader)
+    candidates = sorted(
+        (v for v in versions if _supports(v, target)), key=lambda v: v.get("date_published") or "", reverse=True
+    )
+    candidates.sort(key=lambda v: (
+        min(loaders.index(loader) for loader in v.get("loaders") or [] if loader in loaders),
+        v.get("version_type") != "release"
+    ))
+    return candidates[0] if candidates else None
+
+
+async def _fetch(version_ids: List[str], project_ids: List[str]) -> Tuple[Dict[str, dict], Dict[str, Optional[List[dict]]]]:
+    """One batched /versions request and the version lists of untracked projects, concurrently"""
+    async def project_versions(project_id: str) -> Optional[List[dict]]:
+        versions, error = await get_mod_versions(project_id, project_id)
+        return None if error else versions
+
+    requests = [project_versions(project_id) for project_id in project_ids]
+    if version_ids:
+        requests.append(get_versions(version_ids))
+    results = await asyncio.gather(*requests)
+    fetched = results.pop() if version_ids else {}
+    return fetched, dict(zip(project_ids, results))
+
+
+def _load(db: Session, version_ids: Set[str], project_ids: Set[str],
+          versions: Dict[str, Optional[dict]], project_versions: Dict[str, List[dict]]):
+    """
+    Load one more level of the graph: pinned versions and the versions of projects required
+    without a pin. Stored catalogs and the memos are read first, the rest costs one round of requests.
+    Every requested key is filled in, with None or [] where Modrinth doesn't know it.
+    """
+    found = _catalog_versions(db, version_ids)
+    found.update({vid: _version_memo[vid] for vid in version_ids - found.keys() if vid in _version_memo})
+    lists: Dict[str, Optional[List[dict]]] = dict(_tracked_project_versions(db, project_ids))
+    cutoff = datetime.utcnow() - timedelta(minutes=settings.DEPENDENCY_VERSIONS_REVALIDATE_MINUTES)
+    lists.update({
+        project_id: _project_versions_memo[project_id][1] for project_id in project_ids - lists.keys()
+        if project_id in _project_versions_memo and _project_versions_memo[project_id][0] >= cutoff
+    })
+
+    unknown_versions = sorted(version_ids - found.keys())
+    unknown_projects = sorted(project_ids - lists.keys())
+    if unknown_versions or unknown_projects:
+        fetched, fetched_lists = _run(_fetch, unknown_versions, unknown_projects)
+        _version_memo.update(fetched)
+        found.update(fetched)
+        now = datetime.utcnow()
+        _project_versions_memo.update({p: (now, v) for p, v in fetched_lists.items() if v is not None})
+        lists.update(fetched_lists)
+
+    versions.update({vid: found.get(vid) for vid in version_ids})
+    for project_id in project_ids:
+        project_versions[project_id] = lists.get(project_id) or []
+        versions.update({v["id"]: v for v in project_versions[project_id] if v.get("id")})
+
+
+def _walk(target: MCVersion, included: Dict[str, str], versions: Dict[str, Optional[dict]],
+          project_versions: Dict[str, List[dict]]) -> Tuple[Dict[str, dict], List[tuple], Set[str], Set[str]]:
+    """
+    Follow the required dependencies of the included {project id: version id} on a target with
+    the versions loaded so far. Returns the missing projects, the conflicts, and the version ids
+    and projects still to load; the result is final once nothing is left to load.
+    Projects are referred to by id, names are filled in by the caller.
+    """
+    missing: Dict[str, dict] = {}
+    conflicts: List[tuple] = []
+    incompatible = []
+    need_versions: Set[str] = set()
+    need_projects: Set[str] = set()
+
+    queue = list(included.items())
+    while queue:
+        owner, version_id = queue.pop(0)
+        for dep in (versions.get(version_id) or {}).get("dependencies") or []:
+            dep_type = dep.get("dependency_type") or "required"
+            if dep_type not in ("required", "incompatible"):
+                continue
+            pin = dep.get("version_id")
+            if pin and pin not in versions:
+                need_versions.add(pin)
+                continue
+            pinned = versions.get(pin) if pin else None
+            project_id = dep.get("project_id") or (pinned or {}).get("project_id")
+            if not project_id:
+                continue
+            if dep_type == "incompatible":
+                incompatible.append((project_id, owner))
+                continue
+
+            if pinned and not _supports(pinned, target):
+                conflicts.append((project_id, "unsupported", [owner]))
+                pinned = None
+            if project_id in included:
+                continue
+
+            entry = missing.get(project_id)
+            if entry is None:
+                chosen = pinned
+                if chosen is None:
+                    if project_id not in project_versions:
+                        need_projects.add(project_id)
+                        continue
+                    chosen = _best_version(project_versions[project_id], target)
+                entry = missing[project_id] = {
+                    "version_id": chosen["id"] if chosen else None, "pinned": pinned is not None, "required_by": []
+                }
+                if chosen:
+                    queue.append((project_id, chosen["id"]))
+            elif pinned and entry["version_id"] != pinned["id"]:
+                if entry["pinned"]:
+                    conflicts.append((project_id, "version_mismatch", entry["required_by"] + [owner]))
+                else:
+                    # A pin wins over the version picked for unpinned requirements
+                    entry.update(version_id=pinned["id"], pinned=True)
+                    queue.append((project_id, pinned["id"]))
+            if owner not in entry["required_by"]:
+                entry["required_by"].append(owner)
+
+    for project_id, owner in incompatible:
+        if project_id in included or project_id in missing:
+            conflicts.append((project_id, "incompatible", [owner]))
+    return missing, conflicts, need_versions, need_projects
+
+
+def dependency_reports(db: Session, mc_versions: List[MCVersion], server_slugs: List[str],
+                       chosen: Dict[Tuple[int, str], str]) -> Dict[Tuple[str, str], dict]:
+    """
+    Walk the dependency graph of the mods a server gets for each target, given the
+    version `chosen` per (target id, slug) for the `server_slugs`.
+    Reports required projects that aren't tracked as `missing`, with the version to add:
+    the pinned one, or the best one for the target when the requirement isn't pinned.
+    `conflicts` are incompatible projects in the graph, pinned versions that don't support
+    the target and differing pins. The graph is loaded one level per round of requests.
+    Must run in a worker thread, Modrinth requests are sent to the event loop.
+    """
+    versions: Dict[str, Optional[dict]] = dict(_catalog_versions(db, chosen.values()))
+    project_versions: Dict[str, List[dict]] = {}
+
+    # Names for every project in the graph: tracked mods first, then bulk-fetched project details
+    tracked_ids = {
+        slug: project_id
+        for slug, project_id in db.query(TrackedMod.slug, TrackedMod.project_id).filter(TrackedMod.project_id.isnot(None)).all()
+    }
+    names = {project_id: slug for slug, project_id in tracked_ids.items()}
+
+    included_by_target = {}
+    for target in mc_versions:
+        included = {}
+        for slug in server_slugs:
+            version_id = chosen.get((target.id, slug))
+            if version_id:
+                project_id = (versions.get(version_id) or {}).get("project_id") or tracked_ids.get(slug, slug)
+                included[project_id] = version_id
+                names.setdefault(project_id, slug)
+        included_by_target[target.id] = included
+
+    while True:
+        walks = {
+            target.id: _walk(target, included_by_target[target.id], versions, project_versions)
+            for target in mc_versions
+        }
+        need_versions = set().union(*(walk[2] for walk in walks.values()))
+        need_projects = set().union(*(walk[3] for walk in walks.values()))
+        if not need_versions and not need_projects:
+            break
+        _load(db, need_versions, need_projects, versions, project_versions)
+
+    referenced = {
+        project_id for missing, conflicts, _, _ in walks.values()
+        for project_id in list(missing) + [c[0] for c in conflicts]
+    }
+    cutoff = datetime.utcnow() - timedelta(hours=settings.PROJECT_ID_REVALIDATE_HOURS)
+    unnamed = sorted(
+        p for p in referenced if p not in names and (p not in _project_memo or _project_memo[p][0] < cutoff)
+    )
+    if unnamed:
+        remember_projects(_run(get_mods_details, unnamed))
+    names.update({p: _project_memo[p][1]["slug"] for p in referenced if p not in names and p in _project_memo})
+
+    def name(project_id: str) -> str:
+        return names.get(project_id, project_id)
+
+    reports = {}
+    for target in mc_versions:
+        missing, conflicts, _, _ = walks[target.id]
+        reports[(target.version, target.loader)] = {
+            "mc_version": target.version,
+            "loader": target.loader,
+            "missing": sorted([
+                {
+                    "project_id": project_id,
+                    "slug": name(project_id),
+                    "version_id": entry["version_id"],
+                    "required_by": [name(owner) for owner in entry["required_by"]]
+                }
+                for project_id, entry in missing.items()
+            ], key=lambda m: m["slug"]),
+            "conflicts": [
+                {"project_id": project_id, "slug": name(project_id), "kind": kind, "mods": [name(m) for m in mods]}
+                for project_id, kind, mods in conflicts
+            ]
+        }
+    return reports
+
+
+def export_projects(report: dict) -> List[str]:
+    """MODRINTH_PROJECTS entries for the missing dependencies of a report, by slug where no version supports the target"""
+    return [f"{m['slug']}:{m['version_id']}" if m["version_id"] else m["slug"] for m in report["missing"]]
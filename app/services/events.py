@@ -0,0 +1,96 @@
+import asyncio
+import json
+import logging
+import threading
+from datetime import timezone
+from typing import Any, Dict, List, Tuple
+
+from app.schemas.all import TrackedModResponse
+
+logger = logging.getLogger(__name__)
+
+# Pending events per subscriber before it is considered too slow and told to resync
+QUEUE_SIZE = 256
+
+
+class EventBroadcaster:
+    """
+    In-process fan-out of change events to Server-Sent Events subscribers.
+    Safe to publish from async code and from sync route handlers running in the threadpool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber on the running event loop"""
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers = [(loop, q) for loop, q in self._subscribers if q is not queue]
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any]):
+        """Send an event to every subscriber"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+
+        message = {"event": event, "data": data}
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, message)
+            except RuntimeError:
+                # Subscriber's loop is closed, it will never read again
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, message: Dict[str, Any]):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Drop the backlog and ask the client to reload its state instead
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"event": "resync", "data": {}})
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode an event in the text/event-stream wire format"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+broadcaster = EventBroadcaster()
+
+
+def publish(event: str, data: Dict[str, Any]):
+    """Publish a change event to all connected clients"""
+    try:
+        broadcaster.publish(event, data)
+    except Exception as e:
+        # Notifications are best-effort and must never break a write path
+        logger.error(f"Failed to publish {event} event: {e}")
+
+
+def mod_event_payload(tracked_mod) -> Dict[str, Any]:
+    """Serialize a tracked mod for change events"""
+    return TrackedModResponse.model_validate(tracked_mod, from_attributes=True).model_dump(mode="json")
+
+
+def publish_log(log):
+    """Publish a committed LogEntry as a `log` event"""
+    publish("log", {
+        "id": log.id,
+        "level": log.level,
+        "message": log.message,
+        "created_at": log.created_at.replace(tzinfo=timezone.utc) if log.created_at else None
+    })
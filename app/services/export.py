@@ -0,0 +1,182 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.generation import current_generation
+from app.models.all import TrackedMod, MCVersion, ModVersion, CompatibilityResult
+from app.services.dependencies import dependency_reports, export_projects
+
+
+class LiteralString(str):
+    pass
+
+def literal_string_representer(dumper, data):
+    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
+
+yaml.add_representer(LiteralString, literal_string_representer)
+
+
+class ExportError(Exception):
+    """A target that cannot be exported, with the HTTP status to report it as"""
+
+    def __init__(self, status_code: int, detail: str, blocking: Optional[List[str]] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.blocking = blocking or []
+
+
+Target = Tuple[str, str]  # (mc_version, loader)
+
+# Rendered YAML (or the error), dependency report and installed versions per target,
+# valid while the data generation is unchanged
+_cache_lock = threading.Lock()
+_cache: Dict[Target, Tuple[int, object, Optional[dict], List[dict]]] = {}
+
+
+def clear_export_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def render_compose(mc_version: str, loader: str, projects: List[str]) -> str:
+    """Render the docker-compose snippet for a list of `slug:version_id` projects"""
+    compose_data = {
+        "services": {
+            "mc": {
+                "environment": {
+                    "TYPE": loader.upper(),
+                    "VERSION": mc_version,
+                    "MODRINTH_PROJECTS": LiteralString("\n".join(projects) + "\n")
+                }
+            }
+        }
+    }
+    return yaml.dump(compose_data, sort_keys=False, default_flow_style=False)
+
+
+def server_mod_slugs(db: Session) -> List[str]:
+    """Slugs of the mods a server needs, in export order"""
+    server_mods = db.query(TrackedMod.slug).filter(
+        TrackedMod.side.in_(["server", "both"]),
+        TrackedMod.profile_only == False
+    ).order_by(TrackedMod.created_at, TrackedMod.slug).all()
+    return [slug for slug, in server_mods]
+
+
+def chosen_versions(db: Session, mc_versions: List[MCVersion], slugs: List[str]) -> Dict[Tuple[int, str], str]:
+    """Newest compatible Modrinth version id per (target id, mod) of the given mods, for every target at once"""
+    chosen = {}
+    if mc_versions and slugs:
+        latest = db.query(
+            ModVersion.mod_slug.label("slug"),
+            ModVersion.mc_version_id.label("mc_version_id"),
+            func.max(ModVersion.id).label("mod_version_id")
+        ).join(
+            CompatibilityResult, CompatibilityResult.mod_version_id == ModVersion.id
+        ).join(
+            MCVersion, ModVersion.mc_version_id == MCVersion.id
+        ).filter(
+            ModVersion.mc_version_id.in_([v.id for v in mc_versions]),
+            ModVersion.mod_slug.in_(slugs),
+            ModVersion.loader == MCVersion.loader,
+            CompatibilityResult.status == "compatible"
+        ).group_by(
+            ModVersion.mod_slug, ModVersion.mc_version_id
+        ).subquery()
+
+        rows = db.query(
+            latest.c.mc_version_id, latest.c.slug, ModVersion.version_id
+        ).join(
+            ModVersion, ModVersion.id == latest.c.mod_version_id
+        ).all()
+        chosen = {(mc_version_id, slug): version_id for mc_version_id, slug, version_id in rows}
+    return chosen
+
+
+def installed_versions(db: Session, mc_versions: List[MCVersion], slugs: List[str]) -> Dict[Tuple[int, str], str]:
+    """Version id recorded as installed by a file import per (target id, mod)"""
+    installed = {}
+    if mc_versions and slugs:
+        rows = db.query(ModVersion.mc_version_id, ModVersion.mod_slug, ModVersion.version_id).filter(
+            ModVersion.mc_version_id.in_([v.id for v in mc_versions]),
+            ModVersion.mod_slug.in_(slugs),
+            ModVersion.installed == True
+        ).all()
+        installed = {(mc_version_id, slug): version_id for mc_version_id, slug, version_id in rows}
+    return installed
+
+
+def _resolve_targets(db: Session, targets: List[Target]) -> Dict[Target, Tuple[object, Optional[dict], List[dict]]]:
+    """Resolve the export, dependency report and installed versions for several targets with a fixed number of queries"""
+    mc_versions = db.query(MCVersion).filter(
+        tuple_(MCVersion.version, MCVersion.loader).in_(targets)
+    ).all()
+    mc_by_target = {(v.version, v.loader): v for v in mc_versions}
+
+    server_slugs = server_mod_slugs(db)
+    chosen = chosen_versions(db, mc_versions, server_slugs)
+    reports = dependency_reports(db, mc_versions, server_slugs, chosen)
+    baselines = installed_versions(db, mc_versions, server_slugs)
+
+    resolved = {}
+    for mc_version, loader in targets:
+        mc_ver_obj = mc_by_target.get((mc_version, loader))
+        if not mc_ver_obj:
+            resolved[(mc_version, loader)] = (ExportError(404, f"MC version {mc_version} ({loader}) not found"), None, [])
+            continue
+
+        report = reports[(mc_version, loader)]
+        # Installed (from file imports) next to resolved version ids, resolved is None while blocking
+        installed = [
+            {"slug": slug, "installed": baselines[(mc_ver_obj.id, slug)], "resolved": chosen.get((mc_ver_obj.id, slug))}
+            for slug in server_slugs if (mc_ver_obj.id, slug) in baselines
+        ]
+        if not server_slugs:
+            resolved[(mc_version, loader)] = (ExportError(400, "No server-side or 'both' mods found to export"), report, installed)
+            continue
+
+        blocking = [slug for slug in server_slugs if (mc_ver_obj.id, slug) not in chosen]
+        if blocking:
+            resolved[(mc_version, loader)] = (ExportError(
+                400,
+                f"Server-side mods not compatible with {mc_version} ({loader}): {', '.join(blocking)}. "
+                f"Export only allowed when all server/both mods are compatible.",
+                blocking
+            ), report, installed)
+            continue
+
+        projects = [f"{slug}:{chosen[(mc_ver_obj.id, slug)]}" for slug in server_slugs]
+        projects.extend(export_projects(report))
+        resolved[(mc_version, loader)] = (render_compose(mc_version, loader, projects), report, installed)
+
+    return resolved
+
+
+def export_targets(db: Session, targets: List[Target]) -> Dict[Target, Tuple[object, Optional[dict], List[dict]]]:
+    """
+    Get the rendered YAML or ExportError for each target with its dependency report
+    (None for unknown targets) and installed versions. Missing dependencies are added after the tracked mods.
+    Targets cached for the current data generation are served without touching the database
+    or Modrinth. Must run in a worker thread, see dependency_reports.
+    """
+    generation = current_generation()
+    results = {}
+    with _cache_lock:
+        for target in targets:
+            cached = _cache.get(target)
+            if cached and cached[0] == generation:
+                results[target] = cached[1:]
+
+    missing = list(dict.fromkeys(t for t in targets if t not in results))
+    if missing:
+        resolved = _resolve_targets(db, missing)
+        with _cache_lock:
+            for target, value in resolved.items():
+                _cache[target] = (generation, *value)
+        results.update(resolved)
+
+    return results
@@ -0,0 +1,70 @@
+from typing import List, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.models.all import MCVersion, OutcomeTransition, TrackedMod
+from app.services.outcomes import SIDE_MATCHES, STATES
+
+_COMPATIBLE = STATES.index("compatible")
+
+
+def readiness_history(db: Session, target: MCVersion, side: Optional[str] = None) -> List[dict]:
+    """
+    Replay the transitions of one target in order, giving the number of mods in each
+    state after every change. Reads only the (target, time) index range of the target.
+    """
+    query = db.query(
+        OutcomeTransition.mod_slug, OutcomeTransition.state, OutcomeTransition.changed_at
+    ).filter(OutcomeTransition.mc_version_id == target.id)
+    if side in SIDE_MATCHES:
+        query = query.join(TrackedMod, TrackedMod.slug == OutcomeTransition.mod_slug).filter(
+            TrackedMod.side.in_(SIDE_MATCHES[side])
+        )
+
+    current = {}
+    counts = [0, 0, 0]  # compatible, incompatible, error
+    points = []
+    for slug, state, changed_at in query.order_by(OutcomeTransition.changed_at, OutcomeTransition.id).all():
+        previous = current.get(slug)
+        if previous is not None:
+            counts[previous] -= 1
+        counts[state] += 1
+        current[slug] = state
+
+        point = {"at": changed_at, "compatible": counts[0], "incompatible": counts[1], "error": counts[2]}
+        # Transitions recorded by one check share a timestamp, report the state after all of them
+        if points and points[-1]["at"] == changed_at:
+            points[-1] = point
+        else:
+            points.append(point)
+    return points
+
+
+def time_to_compatible(db: Session, target: MCVersion) -> List[dict]:
+    """
+    When each tracked mod was first checked against a target and first became compatible
+    with it, with the delay after the target's release in seconds (None if not known yet).
+    """
+    compatible_at = func.min(case((OutcomeTransition.state == _COMPATIBLE, OutcomeTransition.changed_at)))
+    rows = db.query(
+        OutcomeTransition.mod_slug,
+        func.min(OutcomeTransition.changed_at),
+        compatible_at
+    ).filter(
+        OutcomeTransition.mc_version_id == target.id
+    ).group_by(OutcomeTransition.mod_slug).order_by(OutcomeTransition.mod_slug).all()
+
+    return [
+        {
+            "slug": slug,
+            "first_checked_at": first_checked,
+            "compatible_at": compatible,
+            "seconds_to_compatible": (
+                (compatible - target.release_time).total_seconds()
+                if compatible and target.release_time else None
+            )
+        }
+        for slug, first_checked, compatible in rows
+    ]
+
@@ -0,0 +1,87 @@
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.services.events import publish
+
+# Finished jobs kept around for progress lookups
+MAX_FINISHED_JOBS = 100
+
+
+class Job:
+    """Progress of a long-running background job"""
+
+    def __init__(self, kind: str, total: int = 0):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"  # queued, running, completed, failed
+        self.total = total
+        self.done = 0
+        self.result: dict = {}
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "total": self.total,
+            "done": self.done,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.replace(tzinfo=timezone.utc),
+            "finished_at": self.finished_at.replace(tzinfo=timezone.utc) if self.finished_at else None,
+        }
+
+
+_lock = threading.Lock()
+_jobs: Dict[str, Job] = {}
+
+
+def _prune():
+    finished = [j for j in _jobs.values() if j.finished_at]
+    finished.sort(key=lambda j: j.finished_at)
+    for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job.id]
+
+
+def create_job(kind: str, total: int = 0) -> Job:
+    """Register a new queued job"""
+    job = Job(kind, total)
+    with _lock:
+        _jobs[job.id] = job
+        _prune()
+    publish("job_progress", job.to_dict())
+    return job
+
+
+def get_job(job_id: str) -> Optional[Job]:
+    return _jobs.get(job_id)
+
+
+def list_jobs() -> List[Job]:
+    with _lock:
+        return sorted(_jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+
+def update_job(job: Job, done: Optional[int] = None, total: Optional[int] = None, status: Optional[str] = None):
+    """Record progress of a job and notify listeners"""
+    if done is not None:
+        job.done = done
+    if total is not None:
+        job.total = total
+    job.status = status or "running"
+    publish("job_progress", job.to_dict())
+
+
+def finish_job(job: Job, result: Optional[dict] = None, error: Optional[str] = None):
+    """Mark a job as completed, or failed when an error is given"""
+    if result:
+        job.result.update(result)
+    job.error = error
+    job.status = "failed" if error else "completed"
+    job.finished_at = datetime.utcnow()
+    publish("job_progress", job.to_dict())
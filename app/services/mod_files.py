@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import BinaryIO, Dict, Tuple
+
+from app.core.config import settings
+
+# Bytes read per step, jars are hashed without ever being loaded whole
+CHUNK_SIZE = 1024 * 1024
+
+
+def _digest(stream: BinaryIO) -> Tuple[str, str]:
+    sha1, sha512 = hashlib.sha1(), hashlib.sha512()
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        sha1.update(chunk)
+        sha512.update(chunk)
+    return sha1.hexdigest(), sha512.hexdigest()
+
+
+def hash_file(path: str) -> Tuple[str, str]:
+    """SHA-1 and SHA-512 of a file"""
+    with open(path, "rb") as stream:
+        return _digest(stream)
+
+
+def hash_zip_member(archive_path: str, name: str) -> Tuple[str, str]:
+    """SHA-1 and SHA-512 of a file inside a zip, decompressed as it is read"""
+    # Each call opens its own handle, ZipFile reads aren't safe to share between threads
+    with zipfile.ZipFile(archive_path) as archive, archive.open(name) as stream:
+        return _digest(stream)
+
+
+def is_jar(name: str) -> bool:
+    return name.lower().endswith(".jar") and not name.endswith("/")
+
+
+async def hash_jars(source: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Hash every jar of a zip archive or a mods directory on HASH_WORKERS threads
+    (hashlib releases the GIL on large updates). Returns {jar name: (sha1, sha512)}.
+    """
+    if os.path.isdir(source):
+        names = sorted(name for name in os.listdir(source) if is_jar(name) and os.path.isfile(os.path.join(source, name)))
+        jobs = {name: partial(hash_file, os.path.join(source, name)) for name in names}
+    else:
+        with zipfile.ZipFile(source) as archive:
+            names = sorted(name for name in archive.namelist() if is_jar(name))
+        jobs = {name: partial(hash_zip_member, source, name) for name in names}
+
+    if not jobs:
+        return {}
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=settings.HASH_WORKERS) as pool:
+        digests = await asyncio.gather(*[loop.run_in_executor(pool, job) for job in jobs.values()])
+    return dict(zip(jobs, digests))
+
+
+def import_directory(path: str) -> str:
+    """
+    Resolve a directory to import by path, which must lie inside MODS_IMPORT_ROOT.
+    Raises ValueError otherwise.
+    """
+    if not settings.MODS_IMPORT_ROOT:
+        raise ValueError("Importing from a directory is disabled, set MODS_IMPORT_ROOT")
+    root = os.path.realpath(settings.MODS_IMPORT_ROOT)
+    directory = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, directory]) != root:
+        raise ValueError("Directory is outside MODS_IMPORT_ROOT")
+    if not os.path.isdir(directory):
+        raise ValueError(f"Directory {path} not found")
+    return directory
@@ -1,6 +1,12 @@
+import asyncio
 import httpx
+import json
 import logging
-from typing import List, Optional, Tuple
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -8,6 +14,115 @@ logger = logging.getLogger(__name__)
 MODRINTH_BASE = "https://api.modrinth.com/v2"
 USER_AGENT = "minecraft-mod-checker/1.0 (github.com)"
 
+# Ids per bulk /projects or /versions request, keeps the query string within URL limits
+PROJECTS_BATCH_SIZE = 100
+
+# Requests currently in flight by (endpoint, key); concurrent callers for the same key share one
+_in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+# Per endpoint: calls made and calls answered by joining a request already in flight
+_coalescing: Dict[str, Dict[str, int]] = {}
+
+
+async def single_flight(endpoint: str, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run fetch() unless an identical request is already in flight, in which case
+    wait for that one and share its parsed result.
+    """
+    stats = _coalescing.setdefault(endpoint, {"calls": 0, "deduplicated": 0})
+    stats["calls"] += 1
+    flight_key = (endpoint, key)
+    future = _in_flight.get(flight_key)
+    if future is not None:
+        stats["deduplicated"] += 1
+    else:
+        future = asyncio.ensure_future(fetch())
+        _in_flight[flight_key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(flight_key, None))
+    # A cancelled caller must not cancel the request for the others
+    return await asyncio.shield(future)
+
+
+def coalescing_stats() -> Dict[str, Dict[str, int]]:
+    """Calls and deduplicated calls per endpoint since startup"""
+    return {endpoint: dict(stats) for endpoint, stats in _coalescing.items()}
+
+
+# Latencies kept per endpoint for the hedging threshold, and how many are needed before hedging starts
+LATENCY_WINDOW = 200
+LATENCY_MIN_SAMPLES = 20
+
+_latencies: Dict[str, Deque[float]] = {}
+# Per endpoint: requests made, hedges sent and hedges that answered first
+_hedging: Dict[str, Dict[str, int]] = {}
+_requests_total = 0
+_hedges_total = 0
+
+
+def latency_p95(endpoint: str) -> Optional[float]:
+    """95th percentile of recent response times of an endpoint in seconds, None until enough were observed"""
+    samples = _latencies.get(endpoint)
+    if not samples or len(samples) < LATENCY_MIN_SAMPLES:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def _hedge_allowed() -> bool:
+    # Global cap: hedges stay within HEDGE_MAX_RATIO of all requests, whichever endpoint they are for
+    return _hedges_total + 1 <= settings.HEDGE_MAX_RATIO * _requests_total
+
+
+async def hedged_get(client: httpx.AsyncClient, endpoint: str, url: str, **kwargs) -> httpx.Response:
+    """
+    GET with optional hedging: when the request takes longer than the endpoint's observed p95,
+    an identical second request goes out and the first response wins.
+    Failures only win when both requests fail.
+    """
+    global _requests_total, _hedges_total
+    stats = _hedging.setdefault(endpoint, {"requests": 0, "hedged": 0, "hedge_wins": 0})
+    stats["requests"] += 1
+    _requests_total += 1
+
+    primary = asyncio.ensure_future(client.get(url, **kwargs))
+    # Each request's own start, a winning hedge is sampled from when it went out
+    started = {primary: time.monotonic()}
+    pending = {primary}
+    threshold = latency_p95(endpoint) if settings.HEDGE_REQUESTS else None
+    try:
+        if threshold is not None:
+            done, _ = await asyncio.wait(pending, timeout=threshold)
+            if not done and _hedge_allowed():
+                stats["hedged"] += 1
+                _hedges_total += 1
+                hedge = asyncio.ensure_future(client.get(url, **kwargs))
+                started[hedge] = time.monotonic()
+                pending.add(hedge)
+
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not primary:
+                        stats["hedge_wins"] += 1
+                    _latencies.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(time.monotonic() - started[task])
+                    return task.result()
+                if error is None or task is primary:
+                    error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def hedging_stats() -> Dict[str, Dict[str, Any]]:
+    """Requests, hedges and winning hedges per endpoint since startup, with the current p95 in milliseconds"""
+    stats = {}
+    for endpoint, counters in _hedging.items():
+        p95 = latency_p95(endpoint)
+        stats[endpoint] = {**counters, "p95_ms": round(p95 * 1000, 1) if p95 is not None else None}
+    return stats
+
 
 async def get_latest_minecraft_version() -> str:
     """Fetch the latest released Minecraft version from Modrinth"""
@@ -29,44 +144,34 @@ async def get_latest_minecraft_version() -> str:
         return "1.21.1"
 
 
-async def get_mod_compatible_versions(slug: str, loader: str) -> Tuple[List[str], Optional[str]]:
+async def get_mod_versions(slug: str, project_id: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
     """
-    Get all Minecraft versions this mod is compatible with.
-    Returns (compatible_versions, error_message)
+    Get every version of a mod with its game versions, loaders, type and publish date.
+    Requests go by project id when it is known, so renamed slugs keep working.
+    Concurrent calls for the same mod share one request.
+    Returns (versions, error_message)
     """
+    return await single_flight("project_versions", project_id or slug, lambda: _fetch_mod_versions(slug, project_id))
+
+
+async def _fetch_mod_versions(slug: str, project_id: Optional[str]) -> Tuple[List[dict], Optional[str]]:
     try:
         async with httpx.AsyncClient(timeout=10) as client:
-            headers = {"User-Agent": USER_AGENT}
+            response = await hedged_get(
+                client,
+                "project_versions",
+                f"{MODRINTH_BASE}/project/{project_id or slug}/version",
+                headers={"User-Agent": USER_AGENT},
+                timeout=10
+            )
+            if response.status_code == 404:
+                return [], f"Mod '{slug}' not found on Modrinth"
+            response.raise_for_status()
 
-            project_url = f"{MODRINTH_BASE}/project/{slug}"
-            try:
-                project_response = await client.get(project_url, headers=headers, timeout=5)
-                project_response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    return [], f"Mod '{slug}' not found on Modrinth"
-                raise
-
-            versions_url = f"{MODRINTH_BASE}/project/{slug}/version"
-            params = {
-                "loaders": loader,
-            }
-
-            versions_response = await client.get(versions_url, params=params, headers=headers, timeout=10)
-            versions_response.raise_for_status()
-
-            versions = versions_response.json()
+            versions = response.json()
             if not isinstance(versions, list):
                 versions = [versions]
-
-            compatible_mc_versions = []
-
-            for version in versions:
-                game_versions = version.get("game_versions", [])
-                compatible_mc_versions.extend(game_versions)
-
-            unique_versions = sorted(set(compatible_mc_versions), reverse=True)
-            return unique_versions, None
+            return versions, None
 
     except httpx.HTTPStatusError as e:
         error_msg = f"HTTP {e.response.status_code}: {e.response.text[:200]}"
@@ -74,84 +179,136 @@ async def get_mod_compatible_versions(slug: str, loader: str) -> Tuple[List[str]
         return [], error_msg
     except Exception as e:
         error_msg = str(e) or type(e).__name__
-        logger.error(f"Failed to check mod {slug}: {error_msg}", exc_info=True)
+        logger.error(f"Failed to fetch versions of {slug}: {error_msg}", exc_info=True)
         return [], error_msg
 
 
-async def find_mod_version_for_mc(slug: str, loader: str, mc_version: str, channel: str = "release") -> Optional[dict]:
-    """
-    Find the specific mod version ID and version number compatible with a given Minecraft version and loader.
-    Filters by channel: 'release' only allows releases, 'beta' allows release+beta, 'alpha' allows all.
-    Returns a dict with {'id': ..., 'version_number': ..., 'channel': ...} or None if not found.
-    """
+def project_info(project: dict) -> dict:
+    """Fields of a Modrinth project we store: its stable id, current slug and supported sides"""
+    return {
+        "id": project.get("id"),
+        "slug": project.get("slug"),
+        "client_side": project.get("client_side"),
+        "server_side": project.get("server_side")
+    }
+
+
+async def get_mod_details(slug: str) -> Optional[dict]:
+    """Fetch mod details from Modrinth to get its project id and side information"""
+    return await single_flight("project", slug, lambda: _fetch_mod_details(slug))
+
+
+async def _fetch_mod_details(slug: str) -> Optional[dict]:
     try:
         async with httpx.AsyncClient(timeout=10) as client:
             headers = {"User-Agent": USER_AGENT}
-            versions_url = f"{MODRINTH_BASE}/project/{slug}/version"
-            
-            # The API allows filtering by loaders and game_versions directly in parameters
-            params = {
-                "loaders": f'["{loader}"]',
-                "game_versions": f'["{mc_version}"]'
-            }
+            project_url = f"{MODRINTH_BASE}/project/{slug}"
             
-            response = await client.get(versions_url, params=params, headers=headers, timeout=10)
+            response = await hedged_get(client, "project", project_url, headers=headers, timeout=5)
             response.raise_for_status()
             
-            versions = response.json()
-            if not isinstance(versions, list):
-                versions = [versions]
-            
-            # Filter by channel hierarchy
-            allowed_channels = {
-                "release": ["release"],
-                "beta": ["release", "beta"],
-                "alpha": ["release", "beta", "alpha"]
-            }
-            
-            allowed = allowed_channels.get(channel, ["release"])
-            filtered_versions = [v for v in versions if v.get("version_type") in allowed]
-            
-            if not filtered_versions:
-                return None
-            
-            # Sort by date published (most recent first)
-            filtered_versions.sort(key=lambda x: x.get("date_published", ""), reverse=True)
-            
-            # Prefer releases over beta/alpha if available
-            releases = [v for v in filtered_versions if v.get("version_type") == "release"]
-            if releases:
-                best = releases[0]
-            else:
-                best = filtered_versions[0]
-            
-            return {
-                "id": best["id"],
-                "version_number": best.get("version_number"),
-                "channel": best.get("version_type", "release")
-            }
-                
+            return project_info(response.json())
     except Exception as e:
-        logger.error(f"Failed to find version for {slug} on MC {mc_version}: {e}")
+        logger.error(f"Failed to fetch details for mod {slug}: {e}")
         return None
 
 
+async def get_mods_details(slugs: List[str]) -> Dict[str, Optional[dict]]:
+    """
+    Fetch project ids and side information for many mods with bulk /projects requests.
+    Accepts slugs or project ids, returns {key: {'id': ..., 'slug': ..., 'client_side': ..., 'server_side': ...}}
+    with None for mods that weren't found.
+    """
+    details: Dict[str, Optional[dict]] = {slug: None for slug in slugs}
+    if not slugs:
+        return details
+
+    async def fetch_batch(batch: List[str]) -> List[dict]:
+        return await single_flight("projects", json.dumps(sorted(batch)), lambda: request_batch(batch))
+
+    async def request_batch(batch: List[str]) -> List[dict]:
+        # Joined by other callers, so it opens its own client instead of borrowing the first caller's
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await hedged_get(
+                    client,
+                    "projects",
+                    f"{MODRINTH_BASE}/projects",
+                    params={"ids": json.dumps(batch)},
+                    headers={"User-Agent": USER_AGENT}
+                )
+                response.raise_for_status()
+                return response.json()
+        except Exception as e:
+            logger.error(f"Failed to fetch details for {len(batch)} mods: {e}")
+            return []
 
-async def get_mod_details(slug: str) -> Optional[dict]:
-    """Fetch mod details from Modrinth to get side information"""
+    batches = [slugs[i:i + PROJECTS_BATCH_SIZE] for i in range(0, len(slugs), PROJECTS_BATCH_SIZE)]
+    responses = await asyncio.gather(*[fetch_batch(batch) for batch in batches])
+
+    # Modrinth accepts slugs or ids, match results back on either
+    by_key = {}
+    for projects in responses:
+        for project in projects:
+            info = project_info(project)
+            by_key[str(project.get("slug", "")).lower()] = info
+            by_key[project.get("id")] = info
+
+    for slug in slugs:
+        details[slug] = by_key.get(slug.lower()) or by_key.get(slug)
+    return details
+
+
+async def get_versions(version_ids: List[str]) -> Dict[str, dict]:
+    """
+    Fetch many versions by id with bulk /versions requests.
+    Returns {version_id: version} for the versions that were found.
+    """
+    if not version_ids:
+        return {}
+
+    async def fetch_batch(batch: List[str]) -> List[dict]:
+        return await single_flight("versions", json.dumps(sorted(batch)), lambda: request_batch(batch))
+
+    async def request_batch(batch: List[str]) -> List[dict]:
+        # Joined by other callers, so it opens its own client instead of borrowing the first caller's
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await hedged_get(
+                    client,
+                    "versions",
+                    f"{MODRINTH_BASE}/versions",
+                    params={"ids": json.dumps(batch)},
+                    headers={"User-Agent": USER_AGENT}
+                )
+                response.raise_for_status()
+                return response.json()
+        except Exception as e:
+            logger.error(f"Failed to fetch {len(batch)} versions: {e}")
+            return []
+
+    batches = [version_ids[i:i + PROJECTS_BATCH_SIZE] for i in range(0, len(version_ids), PROJECTS_BATCH_SIZE)]
+    responses = await asyncio.gather(*[fetch_batch(batch) for batch in batches])
+
+    return {version["id"]: version for versions in responses for version in versions if version.get("id")}
+
+
+async def get_versions_by_hashes(hashes: List[str], algorithm: str = "sha512") -> Dict[str, dict]:
+    """
+    Identify files by hash with one bulk /version_files request.
+    Returns {hash: version} for the files Modrinth knows.
+    """
+    if not hashes:
+        return {}
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            headers = {"User-Agent": USER_AGENT}
-            project_url = f"{MODRINTH_BASE}/project/{slug}"
-            
-            response = await client.get(project_url, headers=headers, timeout=5)
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.post(
+                f"{MODRINTH_BASE}/version_files",
+                json={"hashes": hashes, "algorithm": algorithm},
+                headers={"User-Agent": USER_AGENT}
+            )
             response.raise_for_status()
-            
-            data = response.json()
-            return {
-                "client_side": data.get("client_side"),
-                "server_side": data.get("server_side")
-            }
+            return response.json()
     except Exception as e:
-        logger.error(f"Failed to fetch details for mod {slug}: {e}")
-        return None
+        logger.error(f"Failed to identify {len(hashes)} files: {e}")
+        return {}
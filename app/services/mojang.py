@@ -1,15 +1,43 @@
 import httpx
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 MOJANG_MANIFEST_URL = "https://piston-meta.mojang.com/mc/game/version_manifest_v2.json"
 
-async def fetch_version_manifest() -> Dict[str, Any]:
-    """Fetch the full version manifest from Mojang"""
+# Last manifest received with its validators, unchanged manifests are answered with 304 and no body
+_manifest: Optional[Dict[str, Any]] = None
+_validators: Dict[str, str] = {}
+
+
+async def poll_version_manifest() -> Tuple[Dict[str, Any], bool]:
+    """
+    Fetch the version manifest with a conditional GET.
+    Returns (manifest, changed), changed is False when Mojang answered 304 Not Modified.
+    """
+    global _manifest, _validators
+    headers = {}
+    if _manifest is not None:
+        if "etag" in _validators:
+            headers["If-None-Match"] = _validators["etag"]
+        if "last-modified" in _validators:
+            headers["If-Modified-Since"] = _validators["last-modified"]
+
     async with httpx.AsyncClient() as client:
-        response = await client.get(MOJANG_MANIFEST_URL)
+        response = await client.get(MOJANG_MANIFEST_URL, headers=headers)
+        if response.status_code == 304 and _manifest is not None:
+            return _manifest, False
         response.raise_for_status()
-        return response.json()
+        manifest = response.json()
+
+    _manifest = manifest
+    _validators = {key: response.headers[key] for key in ("etag", "last-modified") if key in response.headers}
+    return manifest, True
+
+
+async def fetch_version_manifest() -> Dict[str, Any]:
+    """Fetch the full version manifest from Mojang"""
+    manifest, _ = await poll_version_manifest()
+    return manifest
 
 def parse_time(time_str: str) -> datetime:
     """Parse Mojang time string (ISO 8601) and return naive datetime"""
@@ -0,0 +1,192 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.all import CompatibilityResult, ModOutcome, ModVersion, OutcomeTransition, TrackedMod
+
+# Tri-state outcome of a mod on a target, plus targets it was never checked against
+STATES = ("compatible", "incompatible", "error", "unchecked")
+
+# Mod sides matched by each side filter
+SIDE_MATCHES = {
+    "both": ("both",),
+    "server": ("server", "both"),
+    "client": ("client", "both"),
+}
+
+
+def to_bits(ids: Iterable[int]) -> int:
+    """Bitset with bit n set for every id n"""
+    bits = 0
+    for i in ids:
+        bits |= 1 << i
+    return bits
+
+
+def iter_bits(bits: int) -> Iterable[int]:
+    """Positions of the set bits, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def encode_bits(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def decode_bits(data: Optional[bytes]) -> int:
+    return int.from_bytes(data or b"", "little")
+
+
+def record_outcomes(db: Session, mod_slug: str, compatible: Iterable[int] = (), incompatible: Iterable[int] = (),
+                    errored: Iterable[int] = ()):
+    """
+    Store the outcome of checking a mod against some targets, replacing earlier outcomes for them.
+    Targets whose state changed get a row in the transition history.
+    """
+    outcome = db.get(ModOutcome, mod_slug)
+    if outcome is None:
+        outcome = ModOutcome(mod_slug=mod_slug)
+        db.add(outcome)
+        db.flush()  # Sessions don't autoflush, later calls must find this row
+
+    new = {"compatible": to_bits(compatible), "incompatible": to_bits(incompatible), "errored": to_bits(errored)}
+    checked = new["compatible"] | new["incompatible"] | new["errored"]
+
+    now = datetime.utcnow()
+    old = [decode_bits(getattr(outcome, column)) for column in new]
+    for state, bits in enumerate(new.values()):
+        for target_id in iter_bits(bits & ~old[state]):
+            db.add(OutcomeTransition(mod_slug=mod_slug, mc_version_id=target_id, state=state, changed_at=now))
+
+    for column, bits in new.items():
+        setattr(outcome, column, encode_bits((decode_bits(getattr(outcome, column)) & ~checked) | bits))
+    outcome.checked = encode_bits(decode_bits(outcome.checked) | checked)
+
+
+def clear_target(db: Session, target_id: int):
+    """Forget every outcome for a deleted target, SQLite may hand its id to a new one"""
+    # Deleted through the ORM so each removed result leaves a tombstone for ?since= clients
+    for result in db.query(CompatibilityResult).filter(CompatibilityResult.mc_version_id == target_id).all():
+        db.delete(result)
+    for mod_version in db.query(ModVersion).filter(ModVersion.mc_version_id == target_id).all():
+        db.delete(mod_version)
+
+    keep = ~(1 << target_id)
+    for outcome in db.query(ModOutcome).all():
+        for column in ("compatible", "incompatible", "errored", "checked"):
+            setattr(outcome, column, encode_bits(decode_bits(getattr(outcome, column)) & keep))
+
+
+class OutcomeBitsets:
+    """
+    Effective outcomes of all tracked mods, transposed to one bitset per target and state
+    over mod positions (mods sorted by slug). Summaries and filters are popcounts and
+    bitwise ANDs over these.
+    """
+
+    def __init__(self, mods: List[Tuple[str, str]], per_mod: Dict[str, Tuple[int, int, int, int]]):
+        self.mods = mods
+        self.per_mod = per_mod  # Kept so snapshots can be rebuilt with a few mods replaced
+        self.slugs = [slug for slug, _ in mods]
+        self.position = {slug: i for i, slug in enumerate(self.slugs)}
+        self.all_mask = (1 << len(mods)) - 1
+        self.side_masks = {
+            side: to_bits(i for i, (_, mod_side) in enumerate(mods) if mod_side in matches)
+            for side, matches in SIDE_MATCHES.items()
+        }
+
+        # target id -> [compatible, incompatible, error, checked] over mod positions
+        self.by_target: Dict[int, List[int]] = {}
+        for slug, bits in per_mod.items():
+            position = self.position.get(slug)
+            if position is None:
+                continue
+            mod_bit = 1 << position
+            for state, target_bits in enumerate(bits):
+                for target_id in iter_bits(target_bits):
+                    self.by_target.setdefault(target_id, [0, 0, 0, 0])[state] |= mod_bit
+
+    def side_mask(self, side: Optional[str]) -> int:
+        """Mods matching a side filter, unknown values don't filter"""
+        return self.side_masks.get(side, self.all_mask) if side else self.all_mask
+
+    def state_mask(self, target_id: int, state: str) -> int:
+        """Mods in the given state on a target"""
+        compatible, incompatible, error, checked = self.by_target.get(target_id, (0, 0, 0, 0))
+        if state == "unchecked":
+            return self.all_mask & ~checked
+        return {"compatible": compatible, "incompatible": incompatible, "error": error}[state]
+
+    def state(self, slug: str, target_id: int) -> str:
+        bit = 1 << self.position[slug]
+        for state in STATES[:-1]:
+            if self.state_mask(target_id, state) & bit:
+                return state
+        return "unchecked"
+
+    def slugs_in(self, mask: int) -> List[str]:
+        return [self.slugs[i] for i in iter_bits(mask)]
+
+    def counts(self, target_id: int) -> Tuple[int, int, int, int, int, int]:
+        """compatible/total overall, for server and for client mods, total counting checked mods"""
+        compatible, _, _, checked = self.by_target.get(target_id, (0, 0, 0, 0))
+        server, client = self.side_masks["server"], self.side_masks["client"]
+        return (
+            compatible.bit_count(), checked.bit_count(),
+            (compatible & server).bit_count(), (checked & server).bit_count(),
+            (compatible & client).bit_count(), (checked & client).bit_count(),
+        )
+
+
+def load_outcomes(db: Session) -> OutcomeBitsets:
+    """
+    Combine stored outcomes with CompatibilityResult rows. Stored outcomes win for
+    targets they cover; results fill in targets checked before outcomes were recorded.
+    """
+    mods = db.query(TrackedMod.slug, TrackedMod.side).order_by(TrackedMod.slug).all()
+    return OutcomeBitsets(mods, mod_outcomes(db))
+
+
+def mod_outcomes(db: Session, slugs: Optional[Iterable[str]] = None) -> Dict[str, Tuple[int, int, int, int]]:
+    """Effective (compatible, incompatible, errored, checked) target bits per mod, of all mods or the given ones"""
+    stored_query = db.query(
+        ModOutcome.mod_slug, ModOutcome.compatible, ModOutcome.incompatible, ModOutcome.errored, ModOutcome.checked
+    )
+    results_query = db.query(
+        ModVersion.mod_slug, CompatibilityResult.mc_version_id, CompatibilityResult.status
+    ).join(ModVersion, CompatibilityResult.mod_version_id == ModVersion.id)
+    if slugs is not None:
+        slugs = list(slugs)
+        stored_query = stored_query.filter(ModOutcome.mod_slug.in_(slugs))
+        results_query = results_query.filter(ModVersion.mod_slug.in_(slugs))
+
+    stored = {
+        slug: (decode_bits(c), decode_bits(i), decode_bits(e), decode_bits(k))
+        for slug, c, i, e, k in stored_query.all()
+    }
+
+    from_results: Dict[str, List[int]] = {}  # slug -> [compatible, error, any]
+    for slug, target_id, status in results_query.all():
+        bits = from_results.setdefault(slug, [0, 0, 0])
+        bit = 1 << target_id
+        if status == "compatible":
+            bits[0] |= bit
+        elif status == "error":
+            bits[1] |= bit
+        bits[2] |= bit
+
+    per_mod = {}
+    for slug in set(stored) | set(from_results):
+        compatible, incompatible, errored, checked = stored.get(slug, (0, 0, 0, 0))
+        r_compatible, r_error, r_any = from_results.get(slug, (0, 0, 0))
+        fill = ~checked
+        per_mod[slug] = (
+            compatible | (r_compatible & fill),
+            incompatible | (r_any & ~r_compatible & ~r_error & fill),
+            errored | (r_error & fill),
+            checked | r_any,
+        )
+    return per_mod
@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.all import MCVersion, Profile, ProfileMod, TrackedMod
+from app.services.catalog import resolve_mods
+from app.services.dependencies import dependency_reports, export_projects
+from app.services.export import ExportError, render_compose
+
+
+def drop_unused_mods(db: Session, slugs: List[str]) -> List[str]:
+    """Stop tracking the profile-only mods among `slugs` that no profile uses any more, returning their slugs"""
+    db.flush()  # Sessions don't autoflush, removed entries must be gone before counting
+    used = {slug for slug, in db.query(ProfileMod.mod_slug).filter(ProfileMod.mod_slug.in_(slugs)).all()}
+    dropped = []
+    for tracked_mod in db.query(TrackedMod).filter(TrackedMod.slug.in_(slugs), TrackedMod.profile_only == True).all():
+        if tracked_mod.slug not in used:
+            db.delete(tracked_mod)
+            dropped.append(tracked_mod.slug)
+    return dropped
+
+
+def profile_targets(db: Session, profile: Profile) -> List[MCVersion]:
+    """The profile's current version and the newer releases for its loader, oldest first"""
+    current = profile.current_version
+    if not current:
+        return []
+    newer = []
+    if current.release_time:
+        newer = db.query(MCVersion).filter(
+            MCVersion.loader == current.loader,
+            MCVersion.release_time > current.release_time
+        ).order_by(MCVersion.release_time).all()
+    return [current] + newer
+
+
+def resolve_profile(db: Session, profile: Profile, targets: List[MCVersion]) -> Dict[str, Dict[int, Optional[dict]]]:
+    """
+    Resolve every mod of the profile with the profile's channel for it, from the catalogs
+    the check engine stores once per mod for all profiles. One query, no Modrinth requests.
+    """
+    return resolve_mods(db, {entry.mod_slug: entry.channel for entry in profile.mods}, targets)
+
+
+def profile_results(db: Session, profile: Profile) -> List[dict]:
+    """
+    Compatibility of each profile mod on each profile target. Mods whose catalog
+    hasn't been fetched yet are `pending` rather than incompatible.
+    """
+    targets = profile_targets(db, profile)
+    resolved = resolve_profile(db, profile, targets)
+    fetched = {
+        slug for slug, in db.query(TrackedMod.slug).filter(
+            TrackedMod.slug.in_(list(resolved)), TrackedMod.catalog_updated_at.isnot(None)
+        ).all()
+    } if resolved else set()
+
+    results = []
+    for entry in profile.mods:
+        for target in targets:
+            version = resolved.get(entry.mod_slug, {}).get(target.id)
+            status = "compatible" if version else "incompatible" if entry.mod_slug in fetched else "pending"
+            results.append({
+                "mod_slug": entry.mod_slug,
+                "side": entry.side,
+                "channel": entry.channel,
+                "mc_version": target.version,
+                "loader": target.loader,
+                "status": status,
+                "version_id": version["id"] if version else None,
+                "version_number": version["version_number"] if version else None,
+                "source_loader": version["loader"] if version else None
+            })
+    return results
+
+
+def export_profile(db: Session, profile: Profile, target: MCVersion) -> Tuple[object, Optional[dict]]:
+    """
+    Render the profile's server mods for a target with their missing dependencies, or the
+    ExportError that prevents it, and the dependency report (None with an error).
+    Must run in a worker thread, see dependency_reports.
+    """
+    slugs = [entry.mod_slug for entry in profile.mods if entry.side in ("server", "both")]
+    if not slugs:
+        return ExportError(400, "No server-side or 'both' mods found to export"), None
+
+    resolved = resolve_profile(db, profile, [target])
+    chosen = {(target.id, slug): resolved[slug][target.id]["id"] for slug in slugs if resolved[slug][target.id]}
+    blocking = [slug for slug in slugs if (target.id, slug) not in chosen]
+    if blocking:
+        return ExportError(
+            400,
+            f"Server-side mods not compatible with {target.version} ({target.loader}): {', '.join(blocking)}. "
+            f"Export only allowed when all server/both mods are compatible.",
+            blocking
+        ), None
+
+    report = dependency_reports(db, [target], slugs, chosen)[(target.version, target.loader)]
+    projects = [f"{slug}:{chosen[(target.id, slug)]}" for slug in slugs] + export_projects(report)
+    return render_compose(target.version, target.loader, projects), report
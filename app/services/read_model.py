@@ -0,0 +1,362 @@
+import logging
+import sys
+import threading
+from datetime import datetime
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, event, inspect, or_
+from sqlalchemy.orm import Session, aliased
+
+from app.models.all import CompatibilityResult, ModOutcome, ModVersion, MCVersion, TrackedMod
+from app.services.outcomes import SIDE_MATCHES, OutcomeBitsets, load_outcomes, mod_outcomes
+
+logger = logging.getLogger(__name__)
+
+# Tables the read model is derived from; commits touching them make it stale
+_SOURCES = (CompatibilityResult, ModOutcome, ModVersion, MCVersion, TrackedMod)
+
+# NULL timestamps sort like the SQL path, which coalesces them to the epoch
+_EPOCH = datetime(1970, 1, 1)
+
+class ResultRecord:
+    """One compatibility result joined with its mod version, target and tracked mod"""
+    __slots__ = (
+        "id", "mod_version_id", "mc_version_id", "status", "error", "checked_at", "updated_at",
+        "mod_slug", "mod_version_number", "mc_version", "loader", "source_loader", "release_time", "side",
+        "installed_version_number",
+    )
+
+    def __init__(self, id, mod_version_id, mc_version_id, status, error, checked_at, updated_at,
+                 mod_slug, mod_version_number, mc_version, loader, source_loader, release_time, side,
+                 installed_version_number=None):
+        self.id = id
+        self.mod_version_id = mod_version_id
+        self.mc_version_id = mc_version_id
+        self.status = status
+        self.error = error
+        self.checked_at = checked_at
+        self.updated_at = updated_at
+        self.mod_slug = mod_slug
+        self.mod_version_number = mod_version_number
+        self.mc_version = mc_version
+        self.loader = loader
+        self.source_loader = source_loader
+        self.release_time = release_time
+        self.side = side
+        self.installed_version_number = installed_version_number
+
+    @property
+    def release_key(self) -> datetime:
+        return self.release_time or _EPOCH
+
+    @property
+    def checked_key(self) -> datetime:
+        return self.checked_at or _EPOCH
+
+    def is_after(self, slug: str, release: datetime, checked: datetime, result_id: int) -> bool:
+        """Whether this record sorts strictly after a cursor position (slug asc, release desc, checked desc, id asc)"""
+        if self.mod_slug != slug:
+            return self.mod_slug > slug
+        if self.release_key != release:
+            return self.release_key < release
+        if self.checked_key != checked:
+            return self.checked_key < checked
+        return self.id > result_id
+
+
+class ReadModel:
+    """
+    Immutable snapshot of all compatibility results in /api/results order,
+    indexed by (version, loader), mod slug and mod side.
+    """
+
+    def __init__(self, bind, version: int, records: List[ResultRecord], targets: List[Tuple[int, str, str]],
+                 outcomes: OutcomeBitsets):
+        self.bind = bind
+        self.version = version
+        self.records = records
+        self.targets = targets  # (id, version, loader) of every MC version, by version and loader
+        self.outcomes = outcomes
+        self.by_target: Dict[Tuple[str, str], List[ResultRecord]] = {}
+        self.by_slug: Dict[str, List[ResultRecord]] = {}
+        self.by_side: Dict[str, List[ResultRecord]] = {}
+        for record in records:
+            self.by_target.setdefault((record.mc_version, record.loader), []).append(record)
+            self.by_slug.setdefault(record.mod_slug, []).append(record)
+            self.by_side.setdefault(record.side, []).append(record)
+
+    def results(self, mc_version: Optional[str] = None, loader: Optional[str] = None, side: Optional[str] = None,
+                status: Optional[str] = None, mod_slug: Optional[str] = None, since: Optional[datetime] = None,
+                after: Optional[tuple] = None) -> List[ResultRecord]:
+        """Filter results like filter_results does, in sort order, optionally after a cursor position"""
+        # Start from the narrowest index, the remaining filters are checked per record
+        if mc_version and loader:
+            records = self.by_target.get((mc_version, loader), [])
+        elif mod_slug:
+            records = self.by_slug.get(mod_slug, [])
+        elif side == "both":
+            records = self.by_side.get("both", [])
+        else:
+            records = self.records
+
+        # Unknown side values don't filter, same as in the SQL path
+        sides = SIDE_MATCHES.get(side) if side else None
+
+        return [
+            r for r in records
+            if (not mc_version or r.mc_version == mc_version)
+            and (not loader or r.loader == loader)
+            and (not status or r.status == status)
+            and (not mod_slug or r.mod_slug == mod_slug)
+            and (not sides or r.side in sides)
+            and (not since or (r.updated_at is not None and r.updated_at >= since))
+            and (not after or r.is_after(*after))
+        ]
+
+
+class ModelChanges:
+    """Scope of the rows a set of commits touched, or `full` when it can't be told"""
+
+    def __init__(self, full: bool = False):
+        self.full = full
+        self.slugs = set()
+        self.mod_version_ids = set()
+        self.target_ids = set()
+
+    def add(self, obj):
+        state = inspect(obj).dict
+        if isinstance(obj, CompatibilityResult):
+            key, keys = state.get("mod_version_id"), self.mod_version_ids
+        elif isinstance(obj, MCVersion):
+            key, keys = state.get("id"), self.target_ids
+        elif isinstance(obj, TrackedMod):
+            key, keys = state.get("slug"), self.slugs
+        else:
+            key, keys = state.get("mod_slug"), self.slugs
+        if key is None:
+            self.full = True
+        else:
+            keys.add(key)
+
+    def update(self, other: "ModelChanges"):
+        self.full = self.full or other.full
+        self.slugs |= other.slugs
+        self.mod_version_ids |= other.mod_version_ids
+        self.target_ids |= other.target_ids
+
+
+def _load_records(db: Session, slugs: Optional[Set[str]] = None, target_ids: Optional[Set[int]] = None):
+    """Results joined with their mod version, target and tracked mod, all of them or those of some mods and targets"""
+    intern = sys.intern
+    installed = aliased(ModVersion)
+    query = db.query(
+        CompatibilityResult.id,
+        CompatibilityResult.mod_version_id,
+        CompatibilityResult.mc_version_id,
+        CompatibilityResult.status,
+        CompatibilityResult.error,
+        CompatibilityResult.checked_at,
+        CompatibilityResult.updated_at,
+        ModVersion.mod_slug,
+        ModVersion.version_number,
+        MCVersion.version,
+        MCVersion.loader,
+        ModVersion.source_loader,
+        MCVersion.release_time,
+        TrackedMod.side,
+        installed.version_number
+    ).join(
+        ModVersion, CompatibilityResult.mod_version_id == ModVersion.id
+    ).join(
+        MCVersion, CompatibilityResult.mc_version_id == MCVersion.id
+    ).join(
+        TrackedMod, ModVersion.mod_slug == TrackedMod.slug
+    ).outerjoin(installed, and_(
+        installed.mod_slug == ModVersion.mod_slug,
+        installed.mc_version_id == CompatibilityResult.mc_version_id,
+        installed.installed.is_(True)
+    ))
+    if slugs is not None or target_ids is not None:
+        query = query.filter(or_(
+            ModVersion.mod_slug.in_(list(slugs or ())),
+            CompatibilityResult.mc_version_id.in_(list(target_ids or ()))
+        ))
+
+    # Slugs, versions, loaders and statuses repeat across thousands of rows, share one copy of each
+    return [
+        ResultRecord(
+            result_id, mod_version_id, mc_version_id, intern(status), error, checked_at, updated_at,
+            intern(slug), intern(version_number), intern(mc_version), intern(loader),
+            intern(source_loader or loader), release_time, intern(side), installed_version_number
+        )
+        for (result_id, mod_version_id, mc_version_id, status, error, checked_at, updated_at,
+             slug, version_number, mc_version, loader, source_loader, release_time, side,
+             installed_version_number) in query.all()
+    ]
+
+
+def _load_targets(db: Session) -> List[Tuple[int, str, str]]:
+    intern = sys.intern
+    targets = db.query(MCVersion.id, MCVersion.version, MCVersion.loader).order_by(
+        MCVersion.version, MCVersion.loader
+    ).all()
+    return [(target_id, intern(v), intern(loader)) for target_id, v, loader in targets]
+
+
+def _sort_records(records: List[ResultRecord]) -> List[ResultRecord]:
+    # Stable sorts from the last key to the first give slug asc, release desc, checked desc, id asc.
+    # Timsort keeps this close to linear when only a few runs changed.
+    records.sort(key=lambda r: r.id)
+    records.sort(key=lambda r: r.checked_key, reverse=True)
+    records.sort(key=lambda r: r.release_key, reverse=True)
+    records.sort(key=lambda r: r.mod_slug)
+    return records
+
+
+def build_read_model(bind, version: int) -> ReadModel:
+    """Load every result with one joined query and build the indexed snapshot"""
+    db = Session(bind=bind)
+    try:
+        records = _load_records(db)
+        targets = _load_targets(db)
+        outcomes = load_outcomes(db)
+    finally:
+        db.close()
+    return ReadModel(bind, version, _sort_records(records), targets, outcomes)
+
+
+def patch_read_model(model: ReadModel, version: int, changes: ModelChanges) -> ReadModel:
+    """
+    Build the next snapshot from the previous one, reloading only the results of the mods and
+    targets the commits touched. A sweep commits once per mod, each commit reloads that mod.
+    """
+    db = Session(bind=model.bind)
+    try:
+        slugs = set(changes.slugs)
+        if changes.mod_version_ids:
+            ids = changes.mod_version_ids
+            slugs.update(r.mod_slug for r in model.records if r.mod_version_id in ids)
+            slugs.update(slug for slug, in db.query(ModVersion.mod_slug).filter(ModVersion.id.in_(list(ids))))
+        target_ids = changes.target_ids
+
+        records = [r for r in model.records if r.mod_slug not in slugs and r.mc_version_id not in target_ids]
+        records.extend(_load_records(db, slugs, target_ids))
+        targets = _load_targets(db) if target_ids else model.targets
+        if target_ids:
+            # Target changes reach every mod's fill-in from results, they are rare enough to reload all
+            outcomes = load_outcomes(db)
+        else:
+            mods = db.query(TrackedMod.slug, TrackedMod.side).order_by(TrackedMod.slug).all()
+            per_mod = {slug: bits for slug, bits in model.outcomes.per_mod.items() if slug not in slugs}
+            per_mod.update(mod_outcomes(db, slugs))
+            outcomes = OutcomeBitsets(mods, per_mod)
+    finally:
+        db.close()
+    return ReadModel(model.bind, version, _sort_records(records), targets, outcomes)
+
+
+_lock = threading.Lock()
+_version = 0          # Advances on every commit that touches a source table
+_model: Optional[ReadModel] = None
+_bind = None          # Engine of the most recent relevant commit, rebuilt from
+_pending = ModelChanges(full=True)  # Changes committed since the model was last built or patched
+_building = False
+
+
+def get_read_model(db: Session) -> Optional[ReadModel]:
+    """
+    Get the read model if it is current for this session's database.
+    Returns None (serve from SQL) while it is missing or behind, and starts catching up.
+    """
+    model = _model
+    bind = db.get_bind()
+    if model is not None and model.version == _version and model.bind is bind:
+        return model
+    _schedule_update(bind)
+    return None
+
+
+def get_outcomes(db: Session) -> OutcomeBitsets:
+    """Outcome bitsets from the read model, or loaded directly while it warms up"""
+    model = get_read_model(db)
+    return model.outcomes if model is not None else load_outcomes(db)
+
+
+def invalidate_read_model(bind=None, changes: Optional[ModelChanges] = None):
+    """Mark the read model stale and bring it up to date in the background, by a full rebuild unless changes are given"""
+    global _version
+    with _lock:
+        _version += 1
+        _pending.update(changes or ModelChanges(full=True))
+    if bind is not None:
+        _schedule_update(bind)
+
+
+def _schedule_update(bind):
+    global _bind, _building
+    with _lock:
+        _bind = bind
+        if _building:
+            # The running update loops until it has caught up with _version and _bind
+            return
+        _building = True
+    threading.Thread(target=_update_loop, name="read-model-update", daemon=True).start()
+
+
+def _update_loop():
+    global _model, _pending, _building
+    while True:
+        with _lock:
+            version, bind, changes = _version, _bind, _pending
+            _pending = ModelChanges()
+        model = _model
+        try:
+            # Swapping the reference is atomic, readers see either the old or the new snapshot
+            if model is None or model.bind is not bind or changes.full:
+                _model = build_read_model(bind, version)
+            else:
+                _model = patch_read_model(model, version, changes)
+        except Exception as e:
+            logger.error(f"Read model update failed: {e}")
+            with _lock:
+                _pending.full = True
+                _building = False
+            return
+        with _lock:
+            if version == _version and bind is _bind:
+                _building = False
+                return
+
+
+# Write tracking mirrors app.core.generation, limited to the tables the model is built from
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session, flush_context):
+    changes = None
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, _SOURCES):
+            changes = changes or session.info.setdefault("read_model_changes", ModelChanges())
+            changes.add(obj)
+
+
+def _mark_bulk(context):
+    entity = context.query.column_descriptions[0].get("entity") if context.query.column_descriptions else None
+    if entity is None or entity in _SOURCES:
+        # Bulk statements don't say which rows they touched
+        context.session.info.setdefault("read_model_changes", ModelChanges()).full = True
+
+
+event.listen(Session, "after_bulk_update", _mark_bulk)
+event.listen(Session, "after_bulk_delete", _mark_bulk)
+
+
+@event.listens_for(Session, "after_commit")
+def _update_on_commit(session):
+    changes = session.info.pop("read_model_changes", None)
+    if changes is not None:
+        invalidate_read_model(session.get_bind(), changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("read_model_changes", None)
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.serialization import FastJSONResponse, format_datetime
+from app.models.all import Deletion
+
+# Tokens are issued slightly in the past, so writes still in flight while a response
+# was built are sent again on the next sync. Clients upsert, repeats are harmless.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def sync_token() -> str:
+    """Token for the next ?since= request, taken before the rows are read"""
+    return format_datetime(datetime.utcnow() - SYNC_OVERLAP)
+
+
+def since_param(
+    since: Optional[datetime] = Query(None, description="X-Sync-Token of an earlier response (or any ISO timestamp); only changes after it are returned")
+) -> Optional[datetime]:
+    """Parse ?since= to naive UTC, rejecting points older than the deletion log reaches back"""
+    if since is None:
+        return None
+    if since.tzinfo:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    if since < datetime.utcnow() - timedelta(days=settings.DELETION_LOG_RETENTION_DAYS):
+        raise HTTPException(status_code=410, detail="Sync token expired, fetch the full list")
+    return since
+
+
+def deleted_keys(db: Session, entity: str, since: datetime, key_type=str) -> List[Any]:
+    """Keys of rows of one table deleted since the given point"""
+    rows = db.query(Deletion.key).filter(
+        Deletion.entity == entity,
+        Deletion.deleted_at >= since
+    ).order_by(Deletion.id).all()
+    return list(dict.fromkeys(key_type(key) for key, in rows))
+
+
+def sync_response(token: str, items: List[dict], deleted: Optional[List[Any]] = None, key: Optional[str] = None,
+                  headers: Optional[dict] = None) -> FastJSONResponse:
+    """
+    Full lists are returned as-is, deltas (deleted is not None) as changed rows plus tombstones.
+    Either way the X-Sync-Token header carries the token for the next request.
+    """
+    headers = {**(headers or {}), "X-Sync-Token": token}
+    if deleted is None:
+        return FastJSONResponse(items, headers=headers)
+
+    if key and items and key in items[0]:
+        # A key that was deleted and then reused is a live row, not a tombstone
+        live = {item[key] for item in items}
+        deleted = [k for k in deleted if k not in live]
+    return FastJSONResponse({"changed": items, "deleted": deleted, "sync_token": token}, headers=headers)
+
+
+def prune_deletions(db: Session) -> int:
+    """Drop tombstones older than the retention window"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.DELETION_LOG_RETENTION_DAYS)
+    count = db.query(Deletion).filter(Deletion.deleted_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    return count
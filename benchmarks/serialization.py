@@ -0,0 +1,71 @@
+"""
+Micro-benchmark for the /api/results serialization path.
+
+Compares the per-row cost of the previous path (one ResultResponse per row, then
+validation and serialization of the list by FastAPI) with the fast path
+(SQL projection tuples encoded directly by FastJSONResponse).
+
+Usage: python -m benchmarks.serialization [rows ...]
+"""
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.serialization import FastJSONResponse
+from app.schemas.all import ResultResponse
+
+FIELDS = ("id", "mod_version_id", "mc_version_id", "status", "error", "checked_at",
+          "mod_slug", "mod_version_number", "mc_version", "loader")
+
+
+def make_rows(count: int):
+    """Rows shaped like the get_results projection"""
+    start = datetime(2024, 1, 1)
+    return [
+        (i, i, i % 20, "compatible" if i % 3 else "incompatible", None, start + timedelta(seconds=i),
+         f"mod-{i // 20}", f"1.{i % 7}.0", f"1.21.{i % 5}", "fabric")
+        for i in range(count)
+    ]
+
+
+def previous_path(rows) -> bytes:
+    items = []
+    for row in rows:
+        item = dict(zip(FIELDS, row))
+        item["checked_at"] = item["checked_at"].replace(tzinfo=timezone.utc)
+        items.append(ResultResponse(**item))
+    # What FastAPI does with response_model=List[ResultResponse]
+    adapter = TypeAdapter(List[ResultResponse])
+    validated = adapter.validate_python(jsonable_encoder(items))
+    return adapter.dump_json(validated)
+
+
+def fast_path(rows) -> bytes:
+    return FastJSONResponse([dict(zip(FIELDS, row)) for row in rows]).body
+
+
+def measure(func, rows, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'previous':>12} {'fast':>12} {'per row prev':>14} {'per row fast':>14} {'speedup':>8}")
+    for count in sizes:
+        rows = make_rows(count)
+        previous = measure(previous_path, rows)
+        fast = measure(fast_path, rows)
+        print(f"{count:>8} {previous:>11.3f}s {fast:>11.3f}s "
+              f"{previous / count * 1e6:>12.2f}us {fast / count * 1e6:>12.2f}us {previous / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,312 @@
+"""
+Database Migration Script - Schema V3
+Adds indexes and columns introduced after V2 to an existing database.
+Every step is idempotent, so the script can be re-run safely after upgrades.
+"""
+
+import sqlite3
+import os
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DATABASE_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "mod_checker.db")
+
+
+def add_sort_indexes(conn):
+    """Add indexes used by the /api/results sort order and keyset pagination"""
+    cursor = conn.cursor()
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_mc_versions_release_time ON mc_versions(release_time)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_compatibility_results_checked_at ON compatibility_results(checked_at)")
+
+    logger.info("Ensured result sort indexes exist")
+    conn.commit()
+
+
+def add_sync_columns(conn):
+    """Add updated_at columns and the deletion log used by ?since= delta requests"""
+    cursor = conn.cursor()
+
+    # Existing rows count as changed when they were created (or last checked)
+    backfill = {
+        "mc_versions": "created_at",
+        "tracked_mods": "created_at",
+        "compatibility_results": "checked_at",
+    }
+    for table, source in backfill.items():
+        columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+        if "updated_at" not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN updated_at DATETIME")
+            cursor.execute(f"UPDATE {table} SET updated_at = {source}")
+            logger.info(f"Added updated_at to {table}")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_updated_at ON {table}(updated_at)")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS deletions (
+            id INTEGER PRIMARY KEY,
+            entity VARCHAR NOT NULL,
+            key VARCHAR NOT NULL,
+            deleted_at DATETIME
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_deletions_deleted_at ON deletions(deleted_at)")
+
+    logger.info("Ensured sync columns and deletion log exist")
+    conn.commit()
+
+
+def add_outcome_table(conn):
+    """Add the per-mod outcome bitsets (compatible, incompatible, errored, checked)"""
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS mod_outcomes (
+            mod_slug VARCHAR PRIMARY KEY REFERENCES tracked_mods(slug) ON DELETE CASCADE,
+            compatible BLOB,
+            incompatible BLOB,
+            errored BLOB,
+            checked BLOB,
+            updated_at DATETIME
+        )
+    """)
+
+    logger.info("Ensured mod outcome table exists")
+    conn.commit()
+
+
+def add_version_catalog(conn):
+    """Add the normalized per-mod Modrinth version catalog"""
+    cursor = conn.cursor()
+
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(tracked_mods)")]
+    if "catalog_updated_at" not in columns:
+        cursor.execute("ALTER TABLE tracked_mods ADD COLUMN catalog_updated_at DATETIME")
+        logger.info("Added catalog_updated_at to tracked_mods")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_versions (
+            id VARCHAR PRIMARY KEY,
+            mod_slug VARCHAR NOT NULL REFERENCES tracked_mods(slug) ON DELETE CASCADE,
+            version_number VARCHAR NOT NULL,
+            version_type VARCHAR NOT NULL,
+            date_published DATETIME
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_catalog_versions_mod_slug ON catalog_versions(mod_slug)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_game_versions (
+            version_id VARCHAR NOT NULL REFERENCES catalog_versions(id) ON DELETE CASCADE,
+            game_version VARCHAR NOT NULL,
+            PRIMARY KEY (version_id, game_version)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_catalog_game_versions_game_version ON catalog_game_versions(game_version)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_loaders (
+            version_id VARCHAR NOT NULL REFERENCES catalog_versions(id) ON DELETE CASCADE,
+            loader VARCHAR NOT NULL,
+            PRIMARY KEY (version_id, loader)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_catalog_loaders_loader ON catalog_loaders(loader)")
+
+    logger.info("Ensured version catalog tables exist")
+    conn.commit()
+
+
+def add_outcome_history(conn):
+    """Add the append-only outcome transition history"""
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS outcome_transitions (
+            id INTEGER PRIMARY KEY,
+            mod_slug VARCHAR NOT NULL,
+            mc_version_id INTEGER NOT NULL,
+            state SMALLINT NOT NULL,
+            changed_at DATETIME NOT NULL
+        )
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_outcome_transitions_target_time ON outcome_transitions(mc_version_id, changed_at)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_outcome_transitions_target_mod "
+        "ON outcome_transitions(mc_version_id, mod_slug, state, changed_at)"
+    )
+
+    logger.info("Ensured outcome history table exists")
+    conn.commit()
+
+
+def add_project_ids(conn):
+    """Add the stored Modrinth project id of each tracked mod"""
+    cursor = conn.cursor()
+
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(tracked_mods)")]
+    if "project_id" not in columns:
+        cursor.execute("ALTER TABLE tracked_mods ADD COLUMN project_id VARCHAR")
+        logger.info("Added project_id to tracked_mods")
+    if "project_id_checked_at" not in columns:
+        cursor.execute("ALTER TABLE tracked_mods ADD COLUMN project_id_checked_at DATETIME")
+        logger.info("Added project_id_checked_at to tracked_mods")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_tracked_mods_project_id ON tracked_mods(project_id)")
+
+    logger.info("Ensured project id columns exist")
+    conn.commit()
+
+
+def add_source_loader(conn):
+    """Add the loader a mod version was built for, set when resolved through a compatible loader"""
+    cursor = conn.cursor()
+
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(mod_versions)")]
+    if "source_loader" not in columns:
+        cursor.execute("ALTER TABLE mod_versions ADD COLUMN source_loader VARCHAR")
+        logger.info("Added source_loader to mod_versions")
+
+    conn.commit()
+
+
+def add_catalog_dependencies(conn):
+    """Add project ids and declared dependencies to the stored version catalogs"""
+    cursor = conn.cursor()
+
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(catalog_versions)")]
+    if "project_id" not in columns:
+        cursor.execute("ALTER TABLE catalog_versions ADD COLUMN project_id VARCHAR")
+        logger.info("Added project_id to catalog_versions")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_dependencies (
+            id INTEGER PRIMARY KEY,
+            version_id VARCHAR NOT NULL REFERENCES catalog_versions(id) ON DELETE CASCADE,
+            project_id VARCHAR,
+            dependency_version_id VARCHAR,
+            dependency_type VARCHAR NOT NULL
+        )
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_catalog_dependencies_version_id ON catalog_dependencies(version_id)"
+    )
+
+    logger.info("Ensured catalog dependency table exists")
+    conn.commit()
+
+
+def add_profiles(conn):
+    """Add modpack profiles and the mods each of them uses"""
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS profiles (
+            id INTEGER PRIMARY KEY,
+            name VARCHAR NOT NULL UNIQUE,
+            current_version_id INTEGER REFERENCES mc_versions(id),
+            created_at DATETIME
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS profile_mods (
+            profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+            mod_slug VARCHAR NOT NULL REFERENCES tracked_mods(slug) ON DELETE CASCADE,
+            side VARCHAR NOT NULL,
+            channel VARCHAR NOT NULL DEFAULT 'release',
+            added_at DATETIME,
+            PRIMARY KEY (profile_id, mod_slug)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_profile_mods_mod_slug ON profile_mods(mod_slug)")
+
+    logger.info("Ensured profile tables exist")
+    conn.commit()
+
+
+def add_installed_versions(conn):
+    """Flag the mod versions recorded as installed by file imports"""
+    cursor = conn.cursor()
+
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(mod_versions)")]
+    if "installed" not in columns:
+        cursor.execute("ALTER TABLE mod_versions ADD COLUMN installed BOOLEAN NOT NULL DEFAULT 0")
+        logger.info("Added installed to mod_versions")
+
+    conn.commit()
+
+
+def add_profile_only_mods(conn):
+    """Flag the mods that are tracked only for profiles"""
+    cursor = conn.cursor()
+
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(tracked_mods)")]
+    if "profile_only" not in columns:
+        cursor.execute("ALTER TABLE tracked_mods ADD COLUMN profile_only BOOLEAN NOT NULL DEFAULT 0")
+        logger.info("Added profile_only to tracked_mods")
+
+    conn.commit()
+
+
+def run_migration():
+    """Run the complete migration"""
+    if not os.path.exists(DATABASE_PATH):
+        logger.error(f"Database not found at {DATABASE_PATH}")
+        return False
+
+    logger.info(f"Starting migration for database: {DATABASE_PATH}")
+    logger.info("=" * 60)
+
+    conn = sqlite3.connect(DATABASE_PATH)
+
+    try:
+        logger.info("Step 1: Adding result sort indexes...")
+        add_sort_indexes(conn)
+
+        logger.info("Step 2: Adding sync columns and deletion log...")
+        add_sync_columns(conn)
+
+        logger.info("Step 3: Adding mod outcome bitsets...")
+        add_outcome_table(conn)
+
+        logger.info("Step 4: Adding version catalog...")
+        add_version_catalog(conn)
+
+        logger.info("Step 5: Adding outcome history...")
+        add_outcome_history(conn)
+
+        logger.info("Step 6: Adding Modrinth project ids...")
+        add_project_ids(conn)
+
+        logger.info("Step 7: Adding result source loaders...")
+        add_source_loader(conn)
+
+        logger.info("Step 8: Adding catalog dependencies...")
+        add_catalog_dependencies(conn)
+
+        logger.info("Step 9: Adding modpack profiles...")
+        add_profiles(conn)
+
+        logger.info("Step 10: Adding installed mod versions...")
+        add_installed_versions(conn)
+
+        logger.info("Step 11: Adding profile-only mods...")
+        add_profile_only_mods(conn)
+
+        logger.info("=" * 60)
+        logger.info("Migration completed successfully!")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    success = run_migration()
+    exit(0 if success else 1)
@@ -13,6 +13,7 @@ translations.en = {
     last_check: "Last: {time}",
     next_check: "Next: {time}",
     never: "Never",
+    check_progress: "Checking {checked}/{total}",
     tabs: {
         results: "Compatibility Results",
         add_mod: "Add Mod",
@@ -94,6 +95,8 @@ translations.en = {
     },
     results_item: {
         mod_version: "Mod Version:",
+        installed_version: "Installed:",
+        via_loader: "via {loader}",
         unknown: "Unknown"
     },
     status: {
@@ -118,7 +121,9 @@ translations.en = {
         exported_no_clipboard: "Exported! (Clipboard not supported in this browser/context)",
         exported_manual: "Exported! (Manual copy required)",
         paste_yaml: "Please paste YAML content first",
-        import_success: "Successfully imported {count} new mods!"
+        import_started: "Import started: {count} new mods queued",
+        import_success: "Successfully imported {count} new mods!",
+        version_check_failed: "Checks for version {version} failed: {error}"
     },
     log_patterns: [
         { pattern: /Database empty\. Importing latest version: (.+) \((.+)\)/, replacement: "Database empty. Importing latest version: $1 ($2)" },
@@ -138,12 +143,23 @@ translations.en = {
         { pattern: /Completed checks for new version (.+) \((.+)\)/, replacement: "Completed checks for new version $1 ($2)" },
         { pattern: /Mod (.+) added for tracking \(channel: (.+)\)/, replacement: "Mod $1 added for tracking (channel: $2)" },
         { pattern: /Mod (.+) removed from tracking \(including all versions and results\)/, replacement: "Mod $1 removed from tracking (including all versions and results)" },
+        { pattern: /Imported (.+) mods from (.+) jar files \((.+) unidentified\)/, replacement: "Imported $1 mods from $2 jar files ($3 unidentified)" },
         { pattern: /Imported (.+) mods from YAML/, replacement: "Imported $1 mods from YAML" },
+        { pattern: /Mod (.+) was renamed to (.+) on Modrinth/, replacement: "Mod $1 was renamed to $2 on Modrinth" },
         { pattern: /Mod (.+) side updated to (.+)/, replacement: "Mod $1 side updated to $2" },
         { pattern: /Mod (.+) channel updated to (.+)/, replacement: "Mod $1 channel updated to $2" },
         { pattern: /Version (.+) \((.+)\) added/, replacement: "Version $1 ($2) added" },
         { pattern: /Version (.+) \((.+)\) added \(set as current\)/, replacement: "Version $1 ($2) added (set as current)" },
         { pattern: /Current version set to (.+) \((.+)\)/, replacement: "Current version set to $1 ($2)" },
-        { pattern: /Version (.+) \((.+)\) deleted/, replacement: "Version $1 ($2) deleted" }
+        { pattern: /Version (.+) \((.+)\) deleted/, replacement: "Version $1 ($2) deleted" },
+        { pattern: /Starting batch check for (.+) mods/, replacement: "Starting batch check for $1 mods" },
+        { pattern: /Batch mod check failed: (.+)/, replacement: "Batch mod check failed: $1" },
+        { pattern: /Import failed: (.+)/, replacement: "Import failed: $1" },
+        { pattern: /Batch update: (.+) mods added, (.+) updated, (.+) removed/, replacement: "Batch update: $1 mods added, $2 updated, $3 removed" },
+        { pattern: /Profile (.+) created/, replacement: "Profile $1 created" },
+        { pattern: /Profile (.+) deleted/, replacement: "Profile $1 deleted" },
+        { pattern: /Profile (.+) current version set to (.+) \((.+)\)/, replacement: "Profile $1 current version set to $2 ($3)" },
+        { pattern: /Mod (.+) added to profile (.+)/, replacement: "Mod $1 added to profile $2" },
+        { pattern: /Mod (.+) removed from profile (.+)/, replacement: "Mod $1 removed from profile $2" }
     ]
 };
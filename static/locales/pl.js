@@ -13,6 +13,7 @@ translations.pl = {
     last_check: "Ostatnio: {time}",
     next_check: "Następne: {time}",
     never: "Nigdy",
+    check_progress: "Sprawdzanie {checked}/{total}",
     tabs: {
         results: "Wyniki kompatybilności",
         add_mod: "Dodaj moda",
@@ -94,6 +95,8 @@ translations.pl = {
     },
     results_item: {
         mod_version: "Wersja moda:",
+        installed_version: "Zainstalowana:",
+        via_loader: "przez {loader}",
         unknown: "Nieznana"
     },
     status: {
@@ -118,7 +121,9 @@ translations.pl = {
         exported_no_clipboard: "Wyeksportowano! (Schowek nie jest obsługiwany w tej przeglądarce/kontekście)",
         exported_manual: "Wyeksportowano! (Wymagane ręczne kopiowanie)",
         paste_yaml: "Proszę najpierw wkleić treść YAML",
-        import_success: "Pomyślnie zaimportowano {count} nowych modów!"
+        import_started: "Rozpoczęto import: {count} nowych modów w kolejce",
+        import_success: "Pomyślnie zaimportowano {count} nowych modów!",
+        version_check_failed: "Sprawdzanie wersji {version} nie powiodło się: {error}"
     },
     log_patterns: [
         { pattern: /Database empty\. Importing latest version: (.+) \((.+)\)/, replacement: "Baza danych pusta. Importowanie najnowszej wersji: $1 ($2)" },
@@ -138,12 +143,23 @@ translations.pl = {
         { pattern: /Completed checks for new version (.+) \((.+)\)/, replacement: "Zakończono sprawdzanie dla nowej wersji $1 ($2)" },
         { pattern: /Mod (.+) added for tracking \(channel: (.+)\)/, replacement: "Mod $1 dodany do śledzenia (kanał: $2)" },
         { pattern: /Mod (.+) removed from tracking \(including all versions and results\)/, replacement: "Mod $1 usunięty ze śledzenia (wraz ze wszystkimi wersjami i wynikami)" },
+        { pattern: /Imported (.+) mods from (.+) jar files \((.+) unidentified\)/, replacement: "Zaimportowano $1 modów z $2 plików jar ($3 niezidentyfikowanych)" },
         { pattern: /Imported (.+) mods from YAML/, replacement: "Zaimportowano $1 modów z YAML" },
+        { pattern: /Mod (.+) was renamed to (.+) on Modrinth/, replacement: "Mod $1 zmienił nazwę na $2 w Modrinth" },
         { pattern: /Mod (.+) side updated to (.+)/, replacement: "Strona moda $1 zaktualizowana na $2" },
         { pattern: /Mod (.+) channel updated to (.+)/, replacement: "Kanał moda $1 zaktualizowany na $2" },
         { pattern: /Version (.+) \((.+)\) added/, replacement: "Wersja $1 ($2) dodana" },
         { pattern: /Version (.+) \((.+)\) added \(set as current\)/, replacement: "Wersja $1 ($2) dodana (ustawiona jako aktualna)" },
         { pattern: /Current version set to (.+) \((.+)\)/, replacement: "Aktualna wersja ustawiona na $1 ($2)" },
-        { pattern: /Version (.+) \((.+)\) deleted/, replacement: "Wersja $1 ($2) usunięta" }
+        { pattern: /Version (.+) \((.+)\) deleted/, replacement: "Wersja $1 ($2) usunięta" },
+        { pattern: /Starting batch check for (.+) mods/, replacement: "Rozpoczęto sprawdzanie partii $1 modów" },
+        { pattern: /Batch mod check failed: (.+)/, replacement: "Sprawdzanie partii modów nie powiodło się: $1" },
+        { pattern: /Import failed: (.+)/, replacement: "Import nie powiódł się: $1" },
+        { pattern: /Batch update: (.+) mods added, (.+) updated, (.+) removed/, replacement: "Zmiana zbiorcza: dodano $1 modów, zaktualizowano $2, usunięto $3" },
+        { pattern: /Profile (.+) created/, replacement: "Profil $1 utworzony" },
+        { pattern: /Profile (.+) deleted/, replacement: "Profil $1 usunięty" },
+        { pattern: /Profile (.+) current version set to (.+) \((.+)\)/, replacement: "Aktualna wersja profilu $1 ustawiona na $2 ($3)" },
+        { pattern: /Mod (.+) added to profile (.+)/, replacement: "Mod $1 dodany do profilu $2" },
+        { pattern: /Mod (.+) removed from profile (.+)/, replacement: "Mod $1 usunięty z profilu $2" }
     ]
 };
@@ -0,0 +1,10 @@
+import pytest
+
+from app.services.read_model import invalidate_read_model
+
+
+@pytest.fixture(autouse=True)
+def fresh_read_model():
+    """Tests recreate their tables outside of sessions, so the results snapshot must not outlive a test"""
+    invalidate_read_model()
+    yield
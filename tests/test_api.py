@@ -8,7 +8,7 @@ import datetime
 # Update imports to point to new structure
 from app.main import app
 from app.core.database import Base, get_db
-from app.services.modrinth import get_latest_minecraft_version, get_mod_compatible_versions
+from app.services.modrinth import get_latest_minecraft_version, get_mod_versions
 from app.models.all import LogEntry, TrackedMod, ModVersion, MCVersion, CompatibilityResult
 
 # Setup test database
@@ -54,32 +54,32 @@ async def test_get_latest_minecraft_version():
         assert version == "1.20.4"
 
 @pytest.mark.asyncio
-async def test_get_mod_compatible_versions():
+async def test_get_mod_versions():
     with patch("httpx.AsyncClient", autospec=True) as MockClient:
         mock_instance = AsyncMock()
         MockClient.return_value.__aenter__.return_value = mock_instance
 
-        # Mock project check
-        mock_project_response = MagicMock()
-        mock_project_response.status_code = 200
-        mock_project_response.raise_for_status.return_value = None
-        
         # Mock versions response
         mock_versions_response = MagicMock()
+        mock_versions_response.status_code = 200
         mock_versions_response.json.return_value = [
             {"game_versions": ["1.20.4", "1.20.1"]},
             {"game_versions": ["1.19.4"]}
         ]
         mock_versions_response.raise_for_status.return_value = None
-        
-        # Setup side effects for get calls
-        mock_instance.get.side_effect = [mock_project_response, mock_versions_response]
+        mock_instance.get.return_value = mock_versions_response
+
+        versions, error = await get_mod_versions("test-mod")
 
-        versions, error = await get_mod_compatible_versions("test-mod", "fabric")
-        
         assert error is None
-        assert "1.20.4" in versions
-        assert "1.19.4" in versions
+        game_versions = {v for version in versions for v in version["game_versions"]}
+        assert "1.20.4" in game_versions
+        assert "1.19.4" in game_versions
+
+        # Unknown mods report an error instead of raising
+        mock_versions_response.status_code = 404
+        versions, error = await get_mod_versions("missing-mod")
+        assert versions == [] and "not found" in error
 
 def test_api_create_version(test_db):
     response = client.post(
@@ -66,3 +66,38 @@ def test_add_version_triggers_background_task(test_db):
         assert response.status_code == 200
         mock_task.assert_called_once()
         mock_task.assert_called_with("1.21.1", "fabric")
+
+@pytest.mark.asyncio
+async def test_add_mod_enriches_sides_in_background(test_db):
+    from app.services.background import check_single_mod_task
+
+    with patch("app.routers.mods.check_single_mod_task"):
+        response = client.post("/api/mods", json={"slug": "sodium", "side": "client", "channel": "release"})
+    assert response.status_code == 200
+    # Registration doesn't wait for Modrinth
+    assert response.json()["supported_client_side"] is None
+
+    details = {"client_side": "required", "server_side": "unsupported"}
+    with patch("app.services.background.SessionLocal", TestingSessionLocal), \
+         patch("app.services.background.get_mod_details", AsyncMock(return_value=details)), \
+         patch("app.services.background.sync_versions", AsyncMock()), \
+         patch("app.services.background.get_target_mc_versions", AsyncMock(return_value=[])):
+        await check_single_mod_task("sodium")
+
+    mod = client.get("/api/mods").json()[0]
+    assert mod["supported_client_side"] == "required"
+    assert mod["supported_server_side"] == "unsupported"
+
+@pytest.mark.asyncio
+async def test_failed_version_enrichment_fails_its_job(test_db):
+    from app.services.background import enrich_and_check_versions_task
+    from app.services.jobs import list_jobs
+
+    with patch("app.services.background.SessionLocal", TestingSessionLocal), \
+         patch("app.services.background.get_version_details", AsyncMock(side_effect=RuntimeError("mojang down"))), \
+         patch("app.services.background.publish") as mock_publish:
+        await enrich_and_check_versions_task("1.21.1", ["fabric"])
+
+    job = list_jobs()[0]
+    assert job.kind == "check_version" and job.status == "failed" and job.error == "mojang down"
+    mock_publish.assert_any_call("version_check_failed", {"version": "1.21.1", "loaders": ["fabric"], "error": "mojang down"})
@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion, LogEntry
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_batch.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    db = TestingSessionLocal()
+    db.add_all([
+        TrackedMod(slug="lithium", side="server", channel="release"),
+        TrackedMod(slug="sodium", side="client", channel="release"),
+        TrackedMod(slug="old-mod", side="both", channel="release"),
+    ])
+    db.add(MCVersion(version="1.21.1", loader="fabric"))
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def test_mod_batch_applies_all_changes_and_schedules_one_check():
+    with patch("app.routers.mods.check_mods_task") as mock_task:
+        response = client.post("/api/mods/batch", json={
+            "add": [{"slug": "iris", "side": "client"}],
+            "update": [{"slug": "lithium", "channel": "beta"}, {"slug": "sodium", "side": "both"}],
+            "delete": ["old-mod"]
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert [m["slug"] for m in data["added"]] == ["iris"]
+        assert {m["slug"] for m in data["updated"]} == {"lithium", "sodium"}
+        assert data["deleted"] == ["old-mod"]
+
+        # Only the new mod and the channel change need a recheck, merged into one job
+        mock_task.assert_called_once_with(["iris", "lithium"], data["job_id"], ["iris"])
+
+    db = TestingSessionLocal()
+    mods = {m.slug: m for m in db.query(TrackedMod).all()}
+    assert set(mods) == {"iris", "lithium", "sodium"}
+    assert mods["lithium"].channel == "beta"
+    assert mods["sodium"].side == "both"
+    assert db.query(LogEntry).count() == 1
+    db.close()
+
+def test_mod_batch_is_all_or_nothing():
+    with patch("app.routers.mods.check_mods_task") as mock_task:
+        response = client.post("/api/mods/batch", json={
+            "add": [{"slug": "iris", "side": "client"}],
+            "update": [{"slug": "missing", "side": "server"}],
+            "delete": ["sodium"]
+        })
+        assert response.status_code == 400
+        assert "missing" in response.json()["detail"]
+        mock_task.assert_not_called()
+
+    db = TestingSessionLocal()
+    assert {m.slug for m in db.query(TrackedMod).all()} == {"lithium", "sodium", "old-mod"}
+    db.close()
+
+def test_version_batch_adds_all_loaders_with_one_check():
+    with patch("app.routers.versions.enrich_and_check_versions_task") as mock_task:
+        response = client.post("/api/versions/batch", json={
+            "version": "1.21.2", "loaders": ["fabric", "forge", "quilt"], "is_current": True
+        })
+        assert response.status_code == 200
+        assert [v["loader"] for v in response.json()] == ["fabric", "forge", "quilt"]
+        mock_task.assert_called_once_with("1.21.2", ["fabric", "forge", "quilt"])
+
+    current = client.get("/api/versions/current").json()
+    assert current["version"] == "1.21.2"
+
+    with patch("app.routers.versions.enrich_and_check_versions_task"):
+        response = client.post("/api/versions/batch", json={"version": "1.21.1", "loaders": ["forge", "fabric"]})
+    assert response.status_code == 400
+    assert len(client.get("/api/versions").json()) == 4
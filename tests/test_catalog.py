@@ -0,0 +1,186 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion, ModVersion, CompatibilityResult, CatalogVersion
+from app.services.background import check_mod_against_targets, evaluate_mod_against_targets
+from app.services.catalog import store_catalog, resolve_targets
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_catalog.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+CATALOG = [
+    {"id": "rel-old", "version_number": "1.0", "version_type": "release",
+     "game_versions": ["1.20", "1.21"], "loaders": ["fabric"], "date_published": "2024-01-01T00:00:00Z"},
+    {"id": "rel-new", "version_number": "1.1", "version_type": "release",
+     "game_versions": ["1.21"], "loaders": ["fabric", "quilt"], "date_published": "2024-03-01T00:00:00Z"},
+    {"id": "beta", "version_number": "2.0-beta", "version_type": "beta",
+     "game_versions": ["1.21", "1.22"], "loaders": ["fabric"], "date_published": "2024-05-01T00:00:00Z"},
+]
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    db = TestingSessionLocal()
+    db.add_all([
+        MCVersion(version="1.20", loader="fabric"),
+        MCVersion(version="1.21", loader="fabric"),
+        MCVersion(version="1.22", loader="fabric"),
+    ])
+    db.add(TrackedMod(slug="test-mod", side="both", channel="release"))
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def resolved_numbers(db, mod):
+    targets = db.query(MCVersion).order_by(MCVersion.version).all()
+    resolved = resolve_targets(db, mod, targets)
+    return {t.version: (resolved[t.id] or {}).get("version_number") for t in targets}
+
+def test_resolve_targets_by_channel():
+    db = TestingSessionLocal()
+    mod = db.query(TrackedMod).first()
+    assert store_catalog(db, mod, CATALOG) is True
+    db.commit()
+    assert mod.catalog_updated_at is not None
+
+    # Releases win over newer pre-releases, the newest release first
+    assert resolved_numbers(db, mod) == {"1.20": "1.0", "1.21": "1.1", "1.22": None}
+    mod.channel = "beta"
+    assert resolved_numbers(db, mod) == {"1.20": "1.0", "1.21": "1.1", "1.22": "2.0-beta"}
+
+    # Storing the same catalog again writes nothing
+    assert store_catalog(db, mod, CATALOG) is False
+    db.close()
+
+def test_store_catalog_replaces_edited_and_removed_versions():
+    db = TestingSessionLocal()
+    mod = db.query(TrackedMod).first()
+    store_catalog(db, mod, CATALOG)
+    db.commit()
+
+    edited = dict(CATALOG[0], game_versions=["1.20", "1.21", "1.22"])
+    assert store_catalog(db, mod, [edited]) is True
+    db.commit()
+
+    assert [v.id for v in db.query(CatalogVersion).all()] == ["rel-old"]
+    assert resolved_numbers(db, mod) == {"1.20": "1.0", "1.21": "1.0", "1.22": "1.0"}
+    db.close()
+
+@pytest.mark.asyncio
+async def test_channel_change_resolves_offline():
+    db = TestingSessionLocal()
+    mod = db.query(TrackedMod).first()
+    with patch("app.services.background.get_mod_versions", AsyncMock(return_value=(CATALOG, None))):
+        await check_mod_against_targets(db, mod, db.query(MCVersion).all())
+
+    target = db.query(MCVersion).filter_by(version="1.22").first()
+    assert db.query(CompatibilityResult).filter_by(mc_version_id=target.id).count() == 0
+
+    # A channel switch re-resolves from the stored catalog, Modrinth isn't asked again
+    mod.channel = "beta"
+    db.commit()
+    with patch("app.services.background.get_mod_versions", AsyncMock(side_effect=AssertionError)):
+        evaluate_mod_against_targets(db, mod, db.query(MCVersion).all())
+
+    result = db.query(CompatibilityResult).filter_by(mc_version_id=target.id).one()
+    assert db.get(ModVersion, result.mod_version_id).version_number == "2.0-beta"
+    assert result.status == "compatible"
+
+    # Back to release: the beta result is superseded and removed
+    mod.channel = "release"
+    db.commit()
+    evaluate_mod_against_targets(db, mod, db.query(MCVersion).all())
+    assert db.query(CompatibilityResult).filter_by(mc_version_id=target.id).count() == 0
+    assert db.query(CompatibilityResult).count() == 2
+    db.close()
+
+@pytest.mark.asyncio
+async def test_failed_fetch_falls_back_to_stored_catalog():
+    db = TestingSessionLocal()
+    mod = db.query(TrackedMod).first()
+    store_catalog(db, mod, CATALOG)
+    db.commit()
+
+    with patch("app.services.background.get_mod_versions", AsyncMock(return_value=([], "HTTP 500"))):
+        await check_mod_against_targets(db, mod, db.query(MCVersion).all())
+
+    assert db.query(CompatibilityResult).filter_by(status="compatible").count() == 2
+    db.close()
+
+@pytest.mark.asyncio
+async def test_compatible_loaders_reuse_the_catalog():
+    db = TestingSessionLocal()
+    db.add_all([MCVersion(version="1.20", loader="quilt"), MCVersion(version="1.21", loader="quilt")])
+    db.commit()
+    mod = db.query(TrackedMod).first()
+    quilt = db.query(MCVersion).filter_by(loader="quilt").all()
+
+    fetch = AsyncMock(return_value=(CATALOG, None))
+    with patch("app.services.background.get_mod_versions", fetch), \
+         patch.dict(settings.LOADER_COMPATIBILITY, {"quilt": ["fabric"]}, clear=True):
+        await check_mod_against_targets(db, mod, quilt)
+        resolved = resolve_targets(db, mod, quilt)
+    fetch.assert_called_once()
+
+    # A native Quilt build wins, Fabric builds fill in where there is none
+    by_version = {t.version: resolved[t.id] for t in quilt}
+    assert (by_version["1.21"]["version_number"], by_version["1.21"]["loader"]) == ("1.1", "quilt")
+    assert (by_version["1.20"]["version_number"], by_version["1.20"]["loader"]) == ("1.0", "fabric")
+    db.close()
+
+    results = {r["mc_version"]: r for r in client.get("/api/results", params={"loader": "quilt"}).json()}
+    assert results["1.20"]["source_loader"] == "fabric"
+    assert results["1.21"]["source_loader"] == "quilt"
+
+def test_channel_patch_schedules_recheck():
+    with patch("app.routers.mods.reresolve_mod_task", AsyncMock()) as task:
+        response = client.patch("/api/mods/test-mod/channel", json={"channel": "beta"})
+        assert response.status_code == 200
+        task.assert_called_once_with("test-mod")
+
+        # Setting the same channel again has nothing to re-resolve
+        client.patch("/api/mods/test-mod/channel", json={"channel": "beta"})
+        task.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_reresolve_task_makes_no_requests():
+    from app.services.background import reresolve_mod_task
+
+    db = TestingSessionLocal()
+    mod = db.query(TrackedMod).first()
+    store_catalog(db, mod, CATALOG)
+    mod.channel = "beta"
+    db.query(MCVersion).filter_by(version="1.21").update({MCVersion.is_current: True})
+    db.commit()
+    db.close()
+
+    offline = AsyncMock(side_effect=AssertionError("network used"))
+    with patch("app.services.background.SessionLocal", TestingSessionLocal), \
+         patch("app.services.background.sync_versions", offline), \
+         patch("app.services.background.get_latest_stable_version", offline), \
+         patch("app.services.background.get_mod_versions", offline), \
+         patch("app.services.background.get_mods_details", offline):
+        await reresolve_mod_task("test-mod")
+
+    db = TestingSessionLocal()
+    assert {r.mod_version.version_number for r in db.query(CompatibilityResult).all()} == {"1.1"}
+    db.close()
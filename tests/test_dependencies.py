@@ -0,0 +1,176 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+import yaml
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion
+from app.services import dependencies
+from app.services.background import check_mod_against_targets, refresh_project_ids
+from app.services.dependencies import clear_dependency_memo
+from app.services.export import clear_export_cache
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_dependencies.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+def version(version_id, project_id, dependencies=(), game_versions=("1.21",), version_type="release",
+            published="2024-01-01T00:00:00Z"):
+    return {"id": version_id, "project_id": project_id, "version_number": "1.0", "version_type": version_type,
+            "game_versions": list(game_versions), "loaders": ["fabric"], "date_published": published,
+            "dependencies": list(dependencies)}
+
+CATALOGS = {
+    "mod-a": [version("a-1", "A", [
+        {"project_id": "LIB", "version_id": "lib-1", "dependency_type": "required"},
+        {"project_id": "API", "version_id": None, "dependency_type": "required"},
+        {"project_id": "B", "version_id": None, "dependency_type": "incompatible"},
+        {"project_id": "EXTRA", "version_id": None, "dependency_type": "optional"},
+    ])],
+    "mod-b": [version("b-1", "B", [{"project_id": "A", "version_id": None, "dependency_type": "required"}])],
+}
+
+UPSTREAM_VERSIONS = {
+    "lib-1": version("lib-1", "LIB", [{"project_id": "API", "version_id": None, "dependency_type": "required"}]),
+}
+
+# Versions of projects required without a pin
+PROJECT_VERSIONS = {
+    "API": [
+        version("api-old", "API", game_versions=["1.20"], published="2024-06-01T00:00:00Z"),
+        version("api-beta", "API", version_type="beta", published="2024-05-01T00:00:00Z"),
+        version("api-1", "API", [{"project_id": "CORE", "version_id": None, "dependency_type": "required"}]),
+    ],
+    "CORE": [version("core-1", "CORE")],
+    "LIB": [version("lib-2", "LIB", published="2024-02-01T00:00:00Z")],
+}
+
+PROJECTS = {
+    "LIB": {"id": "LIB", "slug": "lib", "client_side": "required", "server_side": "required"},
+    "API": {"id": "API", "slug": "fabric-api", "client_side": "required", "server_side": "required"},
+    "CORE": {"id": "CORE", "slug": "core", "client_side": "required", "server_side": "required"},
+}
+
+async def check_all(db):
+    fetch = AsyncMock(side_effect=lambda slug, project_id=None: (CATALOGS[slug], None))
+    with patch("app.services.background.get_mod_versions", fetch):
+        for mod in db.query(TrackedMod).all():
+            await check_mod_against_targets(db, mod, db.query(MCVersion).all())
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    clear_dependency_memo()
+    clear_export_cache()
+    db = TestingSessionLocal()
+    db.add(MCVersion(version="1.21", loader="fabric"))
+    db.add(TrackedMod(slug="mod-a", side="server", channel="release"))
+    db.add(TrackedMod(slug="mod-b", side="both", channel="release"))
+    db.commit()
+
+    asyncio.run(check_all(db))
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+@pytest.fixture
+def upstream():
+    versions = AsyncMock(side_effect=lambda ids: {i: UPSTREAM_VERSIONS[i] for i in ids if i in UPSTREAM_VERSIONS})
+    details = AsyncMock(side_effect=lambda keys: {k: PROJECTS.get(k) for k in keys})
+    projects = AsyncMock(side_effect=lambda slug, project_id=None: (PROJECT_VERSIONS.get(project_id, []), None))
+    with patch("app.services.dependencies.get_versions", versions), \
+         patch("app.services.dependencies.get_mods_details", details), \
+         patch("app.services.dependencies.get_mod_versions", projects):
+        yield versions, details, projects
+
+def test_dependency_report(upstream):
+    versions, details, projects = upstream
+    response = client.get("/api/mods/dependencies", params={"mc_version": "1.21", "loader": "fabric"})
+    assert response.status_code == 200
+    report = response.json()
+
+    # Unpinned requirements resolve to the newest release for the target and are followed too
+    assert report["missing"] == [
+        {"project_id": "CORE", "slug": "core", "version_id": "core-1", "required_by": ["fabric-api"]},
+        {"project_id": "API", "slug": "fabric-api", "version_id": "api-1", "required_by": ["mod-a", "lib"]},
+        {"project_id": "LIB", "slug": "lib", "version_id": "lib-1", "required_by": ["mod-a"]},
+    ]
+    assert report["conflicts"] == [{"project_id": "B", "slug": "mod-b", "kind": "incompatible", "mods": ["mod-a"]}]
+
+    # One batched lookup per level of the graph, one for the unnamed projects
+    versions.assert_called_once_with(["lib-1"])
+    assert [call.args[1] for call in projects.call_args_list] == ["API", "CORE"]
+    details.assert_called_once_with(["API", "CORE", "LIB"])
+
+    # Fetched versions and projects are memoized across exports
+    clear_export_cache()
+    client.get("/api/mods/dependencies", params={"mc_version": "1.21", "loader": "fabric"})
+    versions.assert_called_once()
+    assert projects.call_count == 2
+    details.assert_called_once()
+
+def test_project_names_are_revalidated_with_project_ids(upstream):
+    _, details, _ = upstream
+    client.get("/api/mods/dependencies", params={"mc_version": "1.21", "loader": "fabric"})
+    checked_at, info = dependencies._project_memo["API"]
+    dependencies._project_memo["API"] = (checked_at - timedelta(days=2), info)
+
+    # The sweep's bulk project refresh renews stale dependency names too
+    renamed = dict(PROJECTS["API"], slug="fabric-api-renamed")
+    db = TestingSessionLocal()
+    with patch("app.services.background.get_mods_details", AsyncMock(return_value={"API": renamed})) as refresh:
+        asyncio.run(refresh_project_ids(db, []))
+    db.close()
+    refresh.assert_called_once_with(["API"])
+
+    clear_export_cache()
+    report = client.get("/api/mods/dependencies", params={"mc_version": "1.21", "loader": "fabric"}).json()
+    assert "fabric-api-renamed" in [m["slug"] for m in report["missing"]]
+    details.assert_called_once()
+
+def test_export_adds_missing_dependencies(upstream):
+    response = client.get("/api/mods/export", params={"mc_version": "1.21", "loader": "fabric"})
+    assert response.status_code == 200
+    data = response.json()
+
+    projects = yaml.safe_load(data["yaml"])["services"]["mc"]["environment"]["MODRINTH_PROJECTS"].split()
+    assert projects == ["mod-a:a-1", "mod-b:b-1", "core:core-1", "fabric-api:api-1", "lib:lib-1"]
+    assert [c["kind"] for c in data["dependencies"]["conflicts"]] == ["incompatible"]
+
+def test_pinned_version_without_target_support_conflicts(upstream):
+    with patch.dict(UPSTREAM_VERSIONS, {"lib-1": version("lib-1", "LIB", game_versions=["1.20"])}):
+        report = client.get("/api/mods/dependencies", params={"mc_version": "1.21", "loader": "fabric"}).json()
+
+    # The requirement stays next to the conflict, resolved like an unpinned one
+    lib = next(m for m in report["missing"] if m["project_id"] == "LIB")
+    assert lib["version_id"] == "lib-2"
+    assert {"project_id": "LIB", "slug": "lib", "kind": "unsupported", "mods": ["mod-a"]} in report["conflicts"]
+
+def test_unknown_target_is_not_found(upstream):
+    response = client.get("/api/mods/dependencies", params={"mc_version": "9.9", "loader": "fabric"})
+    assert response.status_code == 404
+
+def test_reports_are_cached_with_the_export(upstream):
+    client.get("/api/mods/export", params={"mc_version": "1.21", "loader": "fabric"})
+
+    # Same data generation: neither the database nor Modrinth is asked again
+    with patch("app.services.export._resolve_targets", side_effect=AssertionError("not cached")):
+        response = client.get("/api/mods/dependencies", params={"mc_version": "1.21", "loader": "fabric"})
+        assert [m["slug"] for m in response.json()["missing"]] == ["core", "fabric-api", "lib"]
+        assert client.get("/api/mods/export", params={"mc_version": "1.21", "loader": "fabric"}).status_code == 200
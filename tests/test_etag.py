@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_etag.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def test_not_modified_until_write():
+    response = client.get("/api/mods")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    # Unchanged data: revalidation is answered without a body
+    response = client.get("/api/mods", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # A committed write from any session invalidates the tag
+    db = TestingSessionLocal()
+    db.add(TrackedMod(slug="mod-a", side="server", channel="release"))
+    db.commit()
+    db.close()
+
+    response = client.get("/api/mods", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["slug"] == "mod-a"
+
+def test_bulk_update_and_rollback():
+    db = TestingSessionLocal()
+    db.add(MCVersion(version="1.21.1", loader="fabric", is_current=True))
+    db.commit()
+
+    etag = client.get("/api/versions").headers["ETag"]
+
+    # Rolled back changes keep the tag valid
+    db.add(MCVersion(version="1.21.2", loader="fabric"))
+    db.flush()
+    db.rollback()
+    assert client.get("/api/versions", headers={"If-None-Match": etag}).status_code == 304
+
+    db.query(MCVersion).update({MCVersion.is_current: False})
+    db.commit()
+    db.close()
+    assert client.get("/api/versions", headers={"If-None-Match": etag}).status_code == 200
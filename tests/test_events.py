@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.core.database import Base, get_db
+from app.services.events import EventBroadcaster, broadcaster, format_sse, QUEUE_SIZE
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_events.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+async def drain(queue):
+    # Deliveries are scheduled with call_soon_threadsafe, let the loop run them
+    await asyncio.sleep(0.05)
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+@pytest.mark.asyncio
+async def test_broadcaster_fan_out_and_resync():
+    events = EventBroadcaster()
+    first = events.subscribe()
+    second = events.subscribe()
+
+    events.publish("mod_added", {"slug": "sodium"})
+    assert await drain(first) == [{"event": "mod_added", "data": {"slug": "sodium"}}]
+    assert len(await drain(second)) == 1
+
+    # A subscriber that falls behind is told to resync instead of blocking publishers
+    for i in range(QUEUE_SIZE + 1):
+        events.publish("log", {"id": i})
+    assert (await drain(first))[-1]["event"] == "resync"
+
+    events.unsubscribe(first)
+    events.unsubscribe(second)
+    assert events.subscriber_count == 0
+
+@pytest.mark.asyncio
+async def test_router_writes_publish_events():
+    queue = broadcaster.subscribe()
+    try:
+        with patch("app.routers.mods.check_single_mod_task"):
+            response = client.post("/api/mods", json={"slug": "lithium", "side": "server", "channel": "release"})
+        assert response.status_code == 200
+
+        events = await drain(queue)
+        names = [e["event"] for e in events]
+        assert "mod_added" in names
+        assert "log" in names
+        added = next(e for e in events if e["event"] == "mod_added")
+        assert added["data"]["slug"] == "lithium"
+    finally:
+        broadcaster.unsubscribe(queue)
+
+def test_format_sse():
+    assert format_sse("log", {"id": 1}) == 'event: log\ndata: {"id": 1}\n\n'
@@ -5,7 +5,9 @@ from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.core.database import Base, get_db
 from app.models.all import TrackedMod, ModVersion, MCVersion, CompatibilityResult, LogEntry
+from app.services.export import chosen_versions
 import yaml
+from unittest.mock import patch
 from datetime import datetime
 
 # Setup test database
@@ -87,6 +89,11 @@ def test_export_filtering():
     assert "mod-client:v3" not in " ".join(projects)
     assert len(projects) == 2
 
+    # Only the exported mods' versions are looked up
+    chosen = chosen_versions(db, [mc_ver], ["mod-server"])
+    assert chosen == {(mc_ver.id, "mod-server"): "v1"}
+    db.close()
+
 def test_export_no_server_mods():
     db = TestingSessionLocal()
     
@@ -161,3 +168,73 @@ def test_export_with_incompatible_client_mods():
     assert "mod-both:v2" in projects
     assert "mod-client" not in " ".join(projects)
     assert len(projects) == 2
+
+def test_export_reports_all_blocking_mods():
+    db = TestingSessionLocal()
+
+    mc_ver = MCVersion(version="1.20.4", loader="fabric", type="release", release_time=datetime.utcnow())
+    db.add(mc_ver)
+    db.add_all([
+        TrackedMod(slug="mod-ok", side="server", channel="release"),
+        TrackedMod(slug="mod-missing-a", side="server", channel="release"),
+        TrackedMod(slug="mod-missing-b", side="both", channel="release"),
+    ])
+    db.commit()
+
+    mv = ModVersion(mod_slug="mod-ok", version_id="v1", version_number="1.0.0", mc_version_id=mc_ver.id, loader="fabric", channel="release")
+    db.add(mv)
+    db.flush()
+    db.add(CompatibilityResult(mod_version_id=mv.id, mc_version_id=mc_ver.id, status="compatible"))
+    db.commit()
+
+    response = client.get("/api/mods/export?mc_version=1.20.4&loader=fabric")
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    assert "mod-missing-a" in detail
+    assert "mod-missing-b" in detail
+    assert "mod-ok" not in detail
+
+def test_export_batch_and_cache():
+    db = TestingSessionLocal()
+
+    old = MCVersion(version="1.20.4", loader="fabric", type="release", release_time=datetime.utcnow())
+    new = MCVersion(version="1.21.1", loader="fabric", type="release", release_time=datetime.utcnow())
+    db.add_all([old, new, TrackedMod(slug="mod-server", side="server", channel="release")])
+    db.commit()
+
+    # Two versions for 1.20.4, the newest one is exported
+    for ver_id in ["v-old", "v-new"]:
+        mv = ModVersion(mod_slug="mod-server", version_id=ver_id, version_number="1.0.0", mc_version_id=old.id, loader="fabric", channel="release")
+        db.add(mv)
+        db.flush()
+        db.add(CompatibilityResult(mod_version_id=mv.id, mc_version_id=old.id, status="compatible"))
+    db.commit()
+
+    response = client.post("/api/mods/export/batch", json={"targets": [
+        {"mc_version": "1.20.4", "loader": "fabric"},
+        {"mc_version": "1.21.1", "loader": "fabric"},
+        {"mc_version": "1.99", "loader": "fabric"},
+    ]})
+    assert response.status_code == 200
+    exports = response.json()["exports"]
+    assert len(exports) == 3
+
+    env = yaml.safe_load(exports[0]["yaml"])["services"]["mc"]["environment"]
+    assert env["MODRINTH_PROJECTS"].strip() == "mod-server:v-new"
+    assert exports[1]["blocking"] == ["mod-server"]
+    assert "not found" in exports[2]["error"]
+
+    # Served from cache until the data changes
+    with patch("app.services.export._resolve_targets") as resolve:
+        assert client.get("/api/mods/export?mc_version=1.20.4&loader=fabric").status_code == 200
+        resolve.assert_not_called()
+
+    mv = ModVersion(mod_slug="mod-server", version_id="v-121", version_number="1.0.0", mc_version_id=new.id, loader="fabric", channel="release")
+    db.add(mv)
+    db.flush()
+    db.add(CompatibilityResult(mod_version_id=mv.id, mc_version_id=new.id, status="compatible"))
+    db.commit()
+
+    response = client.get("/api/mods/export?mc_version=1.21.1&loader=fabric")
+    assert response.status_code == 200
+    assert "mod-server:v-121" in response.json()["yaml"]
@@ -0,0 +1,237 @@
+import hashlib
+from datetime import datetime, timedelta
+import io
+import zipfile
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion, ModVersion, CompatibilityResult, LogEntry
+from app.services.mod_files import hash_jars
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_file_import.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+JARS = {
+    "sodium.jar": b"sodium" * 100000,
+    "lithium.jar": b"lithium",
+    "beta-mod.jar": b"beta",
+    "legacy.jar": b"legacy",
+    "unknown.jar": b"unknown",
+}
+SODIUM_NEW = b"sodium 0.6"
+
+def sha512(data):
+    return hashlib.sha512(data).hexdigest()
+
+# Older uploads that Modrinth only indexes by SHA-1
+SHA1_VERSIONS = {
+    hashlib.sha1(JARS["legacy.jar"]).hexdigest(): {"id": "leg-1", "project_id": "P-LEG", "version_number": "1.0",
+                                                   "version_type": "release", "game_versions": ["1.21"], "loaders": ["fabric"]},
+}
+
+VERSIONS = {
+    sha512(JARS["sodium.jar"]): {"id": "sod-1", "project_id": "P-SOD", "version_number": "0.5", "version_type": "release",
+                                 "date_published": "2024-01-01T00:00:00Z", "game_versions": ["1.21"], "loaders": ["fabric"]},
+    sha512(SODIUM_NEW): {"id": "sod-2", "project_id": "P-SOD", "version_number": "0.6", "version_type": "release",
+                         "date_published": "2024-02-01T00:00:00Z", "game_versions": ["1.21"], "loaders": ["fabric"]},
+    sha512(JARS["lithium.jar"]): {"id": "lit-1", "project_id": "P-LIT", "version_number": "0.12", "version_type": "release",
+                                  "game_versions": ["1.20"], "loaders": ["fabric"]},
+    sha512(JARS["beta-mod.jar"]): {"id": "beta-1", "project_id": "P-BETA", "version_number": "2.0-beta", "version_type": "beta",
+                                   "game_versions": ["1.21"], "loaders": ["fabric"]},
+}
+
+PROJECTS = {
+    "P-SOD": {"id": "P-SOD", "slug": "sodium", "client_side": "required", "server_side": "unsupported"},
+    "P-LIT": {"id": "P-LIT", "slug": "lithium", "client_side": "optional", "server_side": "optional"},
+    "P-BETA": {"id": "P-BETA", "slug": "beta-mod", "client_side": "required", "server_side": "required"},
+    "P-LEG": {"id": "P-LEG", "slug": "legacy", "client_side": "required", "server_side": "required"},
+}
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    db = TestingSessionLocal()
+    db.add(MCVersion(version="1.21", loader="fabric", is_current=True))
+    db.add(TrackedMod(slug="lithium", side="both", channel="release"))
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+@pytest.fixture
+def upstream():
+    def identify(hashes, algorithm="sha512"):
+        known = VERSIONS if algorithm == "sha512" else SHA1_VERSIONS
+        return {h: known[h] for h in hashes if h in known}
+
+    lookup = AsyncMock(side_effect=identify)
+    details = AsyncMock(side_effect=lambda ids: {i: PROJECTS.get(i) for i in ids})
+    check = AsyncMock()
+    with patch("app.services.background.SessionLocal", TestingSessionLocal), \
+         patch("app.services.background.get_versions_by_hashes", lookup), \
+         patch("app.services.background.get_mods_details", details), \
+         patch("app.services.background._check_mods", check):
+        yield lookup, details, check
+
+def zipped(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(f"mods/{name}", data)
+        archive.writestr("mods/config.txt", b"not a jar")
+    return buffer.getvalue()
+
+@pytest.mark.asyncio
+async def test_hash_jars_streams_zip_members_and_files(tmp_path):
+    archive = tmp_path / "pack.zip"
+    archive.write_bytes(zipped(JARS))
+    for name, data in JARS.items():
+        (tmp_path / name).write_bytes(data)
+
+    from_zip = await hash_jars(str(archive))
+    from_dir = await hash_jars(str(tmp_path))
+    expected = {name: (hashlib.sha1(data).hexdigest(), sha512(data)) for name, data in JARS.items()}
+    assert from_zip == {f"mods/{name}": digests for name, digests in expected.items()}
+    assert from_dir == expected
+
+def test_zip_import_tracks_mods_with_installed_baselines(upstream):
+    lookup, details, check = upstream
+    response = client.post("/api/mods/import/files", files={"file": ("mods.zip", zipped(JARS), "application/zip")})
+    assert response.status_code == 200
+
+    # One lookup for all hashes, a SHA-1 retry for the unknown ones, one for all projects
+    assert lookup.call_count == 2
+    assert len(lookup.call_args_list[0].args[0]) == 5
+    assert lookup.call_args_list[1].args == (
+        [hashlib.sha1(JARS[name]).hexdigest() for name in ("legacy.jar", "unknown.jar")], "sha1"
+    )
+    details.assert_called_once()
+
+    job = client.get(f"/api/jobs/{response.json()['job_id']}").json()
+    assert job["result"] == {"added": 3, "skipped": 1, "unidentified": ["mods/unknown.jar"]}
+    check.assert_called_once()
+    assert sorted(check.call_args.args[1]) == ["beta-mod", "legacy", "sodium"]
+
+    db = TestingSessionLocal()
+    mods = {m.slug: m for m in db.query(TrackedMod).all()}
+    assert mods["sodium"].project_id == "P-SOD" and mods["sodium"].side == "server"
+    # A beta jar widens the channel so the installed version counts as compatible
+    assert mods["beta-mod"].channel == "beta"
+
+    # Baselines only where the installed version supports the current target
+    baselines = {(v.mod_slug, v.version_id, v.installed) for v in db.query(ModVersion).all()}
+    assert baselines == {("sodium", "sod-1", True), ("beta-mod", "beta-1", True), ("legacy", "leg-1", True)}
+    db.close()
+
+def import_zip(files):
+    response = client.post("/api/mods/import/files", files={"file": ("mods.zip", zipped(files), "application/zip")})
+    assert response.status_code == 200
+    return client.get(f"/api/jobs/{response.json()['job_id']}").json()
+
+def installed_rows():
+    db = TestingSessionLocal()
+    rows = {(v.mod_slug, v.version_id, v.installed) for v in db.query(ModVersion).all()}
+    db.close()
+    return rows
+
+def test_duplicate_jars_record_one_baseline(upstream):
+    job = import_zip({"sodium.jar": JARS["sodium.jar"], "sodium-copy.jar": JARS["sodium.jar"]})
+    assert job["status"] == "completed"
+    assert installed_rows() == {("sodium", "sod-1", True)}
+
+def test_newest_of_several_versions_becomes_the_baseline(upstream):
+    assert import_zip({"sodium.jar": JARS["sodium.jar"]})["status"] == "completed"
+    job = import_zip({"sodium-0.6.jar": SODIUM_NEW, "sodium.jar": JARS["sodium.jar"]})
+    assert job["status"] == "completed"
+    assert installed_rows() == {("sodium", "sod-1", False), ("sodium", "sod-2", True)}
+
+def test_new_baseline_moves_results_for_delta_sync(upstream):
+    db = TestingSessionLocal()
+    target = db.query(MCVersion).first()
+    db.add(TrackedMod(slug="sodium", project_id="P-SOD", side="server", channel="release"))
+    resolved = ModVersion(mod_slug="sodium", version_id="sod-3", version_number="0.7", mc_version_id=target.id,
+                          loader="fabric", channel="release")
+    db.add(resolved)
+    db.flush()
+    db.add(CompatibilityResult(mod_version_id=resolved.id, mc_version_id=target.id, status="compatible",
+                               updated_at=datetime.utcnow() - timedelta(hours=1)))
+    db.commit()
+    db.close()
+
+    since = {"since": (datetime.utcnow() - timedelta(minutes=1)).isoformat()}
+    assert client.get("/api/results", params=since).json()["changed"] == []
+    assert import_zip({"sodium.jar": JARS["sodium.jar"]})["status"] == "completed"
+    delta = client.get("/api/results", params=since).json()["changed"]
+    assert [(r["mod_slug"], r["installed_version_number"]) for r in delta] == [("sodium", "0.5")]
+
+def test_failed_import_fails_its_job(upstream):
+    # A NOT NULL violation leaves the session needing a rollback before the error can be logged
+    with patch("app.services.background.store_mod_details", side_effect=lambda mod, info: setattr(mod, "side", None)):
+        job = import_zip({"sodium.jar": JARS["sodium.jar"]})
+    assert job["status"] == "failed"
+
+    db = TestingSessionLocal()
+    assert db.query(LogEntry).filter(LogEntry.level == "ERROR").count() == 1
+    assert db.query(TrackedMod).filter_by(slug="sodium").count() == 0
+    db.close()
+
+def test_results_and_export_show_installed_next_to_resolved():
+    db = TestingSessionLocal()
+    target = db.query(MCVersion).first()
+    db.add(ModVersion(mod_slug="lithium", version_id="lit-1", version_number="0.12", mc_version_id=target.id,
+                      loader="fabric", channel="release", installed=True))
+    resolved = ModVersion(mod_slug="lithium", version_id="lit-2", version_number="0.13", mc_version_id=target.id,
+                          loader="fabric", channel="release")
+    db.add(resolved)
+    db.flush()
+    db.add(CompatibilityResult(mod_version_id=resolved.id, mc_version_id=target.id, status="compatible"))
+    db.commit()
+    db.close()
+
+    results = client.get("/api/results?mod_slug=lithium").json()
+    assert [(r["mod_version_number"], r["installed_version_number"]) for r in results] == [("0.13", "0.12")]
+
+    with patch("app.services.dependencies.get_versions", AsyncMock(return_value={})):
+        response = client.get("/api/mods/export?mc_version=1.21&loader=fabric")
+    assert response.status_code == 200
+    assert "lithium:lit-2" in response.json()["yaml"]
+    assert response.json()["installed"] == [{"slug": "lithium", "installed": "lit-1", "resolved": "lit-2"}]
+
+def test_directory_import_is_confined_to_the_import_root(upstream, tmp_path):
+    mods_dir = tmp_path / "server" / "mods"
+    mods_dir.mkdir(parents=True)
+    (mods_dir / "sodium.jar").write_bytes(JARS["sodium.jar"])
+
+    with patch.object(settings, "MODS_IMPORT_ROOT", ""):
+        assert client.post("/api/mods/import/files", data={"path": "server/mods"}).status_code == 400
+
+    with patch.object(settings, "MODS_IMPORT_ROOT", str(tmp_path / "server")):
+        assert client.post("/api/mods/import/files", data={"path": "../"}).status_code == 400
+        response = client.post("/api/mods/import/files", data={"path": "mods"})
+        assert response.status_code == 200
+
+    db = TestingSessionLocal()
+    assert db.query(TrackedMod).filter_by(slug="sodium").count() == 1
+    db.close()
+
+def test_rejects_non_zip_upload():
+    response = client.post("/api/mods/import/files", files={"file": ("mods.zip", b"not a zip", "application/zip")})
+    assert response.status_code == 400
@@ -0,0 +1,105 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion, OutcomeTransition
+from app.services.outcomes import record_outcomes
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_history.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+RELEASE = datetime(2024, 6, 1)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    db = TestingSessionLocal()
+    db.add_all([
+        MCVersion(version="1.21", loader="fabric", release_time=RELEASE),
+        MCVersion(version="1.21", loader="forge", release_time=RELEASE),
+    ])
+    db.add_all([
+        TrackedMod(slug="mod-a", side="server", channel="release"),
+        TrackedMod(slug="mod-b", side="client", channel="release"),
+    ])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def record(at, slug, **outcomes):
+    db = TestingSessionLocal()
+    ids = {v.loader: v.id for v in db.query(MCVersion).all()}
+    with patch("app.services.outcomes.datetime") as clock:
+        clock.utcnow.return_value = at
+        record_outcomes(db, slug, **{state: [ids[loader] for loader in loaders] for state, loaders in outcomes.items()})
+    db.commit()
+    db.close()
+
+def test_only_state_changes_are_recorded():
+    record(datetime(2024, 6, 1, 12), "mod-a", incompatible=["fabric"], errored=["forge"])
+    record(datetime(2024, 6, 2, 12), "mod-a", incompatible=["fabric"], compatible=["forge"])
+    record(datetime(2024, 6, 3, 12), "mod-a", compatible=["fabric", "forge"])
+    record(datetime(2024, 6, 4, 12), "mod-a", compatible=["fabric", "forge"])
+
+    db = TestingSessionLocal()
+    assert db.query(OutcomeTransition).count() == 4
+    db.close()
+
+    # Deleting a target or a mod forgets its history
+    forge_id = client.get("/api/versions").json()
+    forge_id = next(v["id"] for v in forge_id if v["loader"] == "forge")
+    client.delete(f"/api/versions/{forge_id}")
+    db = TestingSessionLocal()
+    assert db.query(OutcomeTransition).count() == 2
+    db.close()
+    client.delete("/api/mods/mod-a")
+    db = TestingSessionLocal()
+    assert db.query(OutcomeTransition).count() == 0
+    db.close()
+
+def test_readiness_and_time_to_compatible():
+    record(datetime(2024, 6, 1, 12), "mod-a", incompatible=["fabric"])
+    record(datetime(2024, 6, 1, 12), "mod-b", errored=["fabric"])
+    record(datetime(2024, 6, 3), "mod-a", compatible=["fabric"])
+    record(datetime(2024, 6, 5), "mod-b", incompatible=["fabric"])
+
+    history = client.get("/api/results/history/readiness", params={"mc_version": "1.21", "loader": "fabric"}).json()
+    points = [(p["at"], p["compatible"], p["incompatible"], p["error"]) for p in history["points"]]
+    assert points == [
+        ("2024-06-01T12:00:00Z", 0, 1, 1),
+        ("2024-06-03T00:00:00Z", 1, 0, 1),
+        ("2024-06-05T00:00:00Z", 1, 1, 0),
+    ]
+
+    server = client.get("/api/results/history/readiness",
+                        params={"mc_version": "1.21", "loader": "fabric", "side": "server"}).json()
+    assert [p["compatible"] for p in server["points"]] == [0, 1]
+
+    times = {t["slug"]: t for t in client.get(
+        "/api/results/history/time-to-compatible", params={"mc_version": "1.21", "loader": "fabric"}
+    ).json()}
+    assert times["mod-a"]["first_checked_at"] == "2024-06-01T12:00:00Z"
+    assert times["mod-a"]["compatible_at"] == "2024-06-03T00:00:00Z"
+    assert times["mod-a"]["seconds_to_compatible"] == 2 * 24 * 3600
+    assert times["mod-b"]["compatible_at"] is None and times["mod-b"]["seconds_to_compatible"] is None
+
+    assert client.get("/api/results/history/readiness",
+                      params={"mc_version": "1.99", "loader": "fabric"}).status_code == 404
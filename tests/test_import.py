@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_import.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+COMPOSE_YAML = """
+services:
+  mc:
+    environment:
+      MODRINTH_PROJECTS: |
+        lithium:abc123
+        sodium
+        ferrite-core:def456
+"""
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    db = TestingSessionLocal()
+    db.add(TrackedMod(slug="sodium", side="client", channel="release"))
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def test_import_returns_job_and_inserts_in_background():
+    details = {
+        "lithium": {"client_side": "optional", "server_side": "optional"},
+        "ferrite-core": None,
+    }
+    with patch("app.services.background.SessionLocal", TestingSessionLocal), \
+         patch("app.services.background.get_mods_details", AsyncMock(return_value=details)) as mock_details, \
+         patch("app.services.background._check_mods", AsyncMock()) as mock_check:
+        response = client.post("/api/mods/import", json={"yaml": COMPOSE_YAML})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["queued"] == 2
+        assert data["skipped"] == 1
+
+        # Metadata for all new mods is fetched in one call and checked as one batch
+        mock_details.assert_awaited_once_with(["lithium", "ferrite-core"])
+        mock_check.assert_awaited_once()
+        assert mock_check.await_args.args[1] == ["lithium", "ferrite-core"]
+
+    job = client.get(f"/api/jobs/{data['job_id']}").json()
+    assert job["status"] == "completed"
+    assert job["result"] == {"added": 2, "skipped": 0}
+
+    db = TestingSessionLocal()
+    lithium = db.query(TrackedMod).filter_by(slug="lithium").first()
+    assert lithium.side == "server"
+    assert lithium.supported_server_side == "optional"
+    assert db.query(TrackedMod).filter_by(slug="ferrite-core").first().supported_client_side is None
+    db.close()
+
+def test_import_without_projects():
+    response = client.post("/api/mods/import", json={"yaml": "services:\n  mc:\n    environment: {}\n"})
+    assert response.status_code == 400
+
+def test_unknown_job():
+    assert client.get("/api/jobs/missing").status_code == 404
@@ -0,0 +1,101 @@
+import httpx
+import pytest
+from datetime import datetime
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.all import MCVersion, TrackedMod
+from app.services import background, mojang
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_manifest_watch.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def manifest(*releases):
+    return {
+        "latest": {"release": releases[-1], "snapshot": releases[-1]},
+        "versions": [
+            {"id": v, "type": "release", "url": f"https://example.com/{v}.json",
+             "releaseTime": f"2024-0{i + 1}-01T10:00:00+00:00"}
+            for i, v in reversed(list(enumerate(releases)))
+        ]
+    }
+
+class FakeMojang:
+    """Serves a manifest with an ETag, answering matching conditional GETs with 304"""
+
+    def __init__(self, body):
+        self.body = body
+        self.etag = '"1"'
+        self.full = 0
+        self.not_modified = 0
+
+    def publish(self, body):
+        self.body = body
+        self.etag = f'"{int(self.etag.strip(chr(34))) + 1}"'
+
+    def handler(self, request):
+        if request.headers.get("If-None-Match") == self.etag:
+            self.not_modified += 1
+            return httpx.Response(304)
+        self.full += 1
+        return httpx.Response(200, json=self.body, headers={"ETag": self.etag})
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    db = TestingSessionLocal()
+    db.add(MCVersion(version="1.20", loader="fabric", type="release", is_current=True,
+                     release_time=datetime(2024, 1, 1, 10)))
+    db.add(TrackedMod(slug="test-mod", side="both", channel="release"))
+    db.commit()
+    db.close()
+    mojang._manifest, mojang._validators = None, {}
+    background._watched_release = None
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+@pytest.fixture
+def fake_mojang():
+    fake = FakeMojang(manifest("1.20"))
+    transport = httpx.MockTransport(fake.handler)
+    real_client = httpx.AsyncClient
+    with patch("app.services.mojang.httpx.AsyncClient", lambda **kw: real_client(transport=transport, **kw)):
+        yield fake
+
+@pytest.mark.asyncio
+async def test_unchanged_manifest_is_not_modified(fake_mojang):
+    assert (await mojang.poll_version_manifest())[1] is True
+    for _ in range(3):
+        body, changed = await mojang.poll_version_manifest()
+        assert changed is False and body["latest"]["release"] == "1.20"
+    assert fake_mojang.full == 1 and fake_mojang.not_modified == 3
+
+@pytest.mark.asyncio
+async def test_new_release_checks_only_the_new_target(fake_mojang):
+    checked = []
+    check = AsyncMock(side_effect=lambda db, mod, targets: checked.append(
+        (mod.slug, [(t.version, t.loader) for t in targets])
+    ))
+    with patch("app.services.background.SessionLocal", TestingSessionLocal), \
+         patch("app.services.background.check_mod_against_targets", check):
+        # The first poll only records the release, the startup sweep checks it
+        await background.check_new_release()
+        await background.check_new_release()
+        check.assert_not_called()
+
+        fake_mojang.publish(manifest("1.20", "1.21"))
+        await background.check_new_release()
+
+        assert checked == [("test-mod", [("1.21", "fabric")])]
+
+        # Later polls are conditional and don't check again
+        await background.check_new_release()
+        check.assert_called_once()
+
+    db = TestingSessionLocal()
+    assert db.query(MCVersion).filter_by(version="1.21").count() == 1
+    db.close()
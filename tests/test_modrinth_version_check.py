@@ -1,67 +1,54 @@
 import pytest
-import asyncio
-from unittest.mock import MagicMock, AsyncMock, patch
-from app.services.modrinth import find_mod_version_for_mc
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.all import TrackedMod, MCVersion
+from app.services.catalog import store_catalog, resolve_targets
 
-@pytest.mark.asyncio
-async def test_find_mod_version_found():
-    # Mock httpx client response
-    mock_response = MagicMock()
-    mock_response.json.return_value = [
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_version_check.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine_test)
+    session = TestingSessionLocal()
+    session.add(MCVersion(version="1.21.1", loader="fabric"))
+    session.add(TrackedMod(slug="slug-123", side="both", channel="release"))
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine_test)
+
+def find_mod_version(db, versions, channel="release"):
+    """Resolve the mod for 1.21.1 (fabric) from a stored catalog of the given versions"""
+    mod = db.query(TrackedMod).first()
+    store_catalog(db, mod, [
+        dict(v, game_versions=["1.21.1"], loaders=["fabric"]) for v in versions
+    ])
+    db.commit()
+    target = db.query(MCVersion).first()
+    return resolve_targets(db, mod, [target], channel)[target.id]
+
+def test_find_mod_version_found(db):
+    ver_data = find_mod_version(db, [
         {"id": "ver_release_123", "version_number": "1.2.3", "version_type": "release", "date_published": "2023-01-02T00:00:00Z"},
         {"id": "ver_release_old", "version_number": "1.2.2", "version_type": "release", "date_published": "2023-01-01T00:00:00Z"},
         {"id": "ver_beta_123", "version_number": "1.2.4-beta", "version_type": "beta", "date_published": "2023-01-03T00:00:00Z"}
-    ]
-    mock_response.raise_for_status = MagicMock()
-    
-    with patch("httpx.AsyncClient") as MockClient:
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        MockClient.return_value.__aenter__.return_value = mock_client_instance
-        
-        # Test finding latest release
-        ver_data = await find_mod_version_for_mc("slug-123", "fabric", "1.21.1")
-        
-        assert ver_data == {"id": "ver_release_123", "version_number": "1.2.3"}
-        print("\nSUCCESS: Found latest stable version dict")
+    ], channel="beta")
 
-@pytest.mark.asyncio
-async def test_find_mod_version_fallback_beta():
-    # Only beta versions available
-    mock_response = MagicMock()
-    mock_response.json.return_value = [
-         {"id": "ver_beta_123", "version_number": "1.2.4-beta", "version_type": "beta", "date_published": "2023-01-03T00:00:00Z"}
-    ]
-    mock_response.raise_for_status = MagicMock()
+    # The latest release wins over a newer beta, even when the channel allows betas
+    assert (ver_data["id"], ver_data["version_number"]) == ("ver_release_123", "1.2.3")
 
-    with patch("httpx.AsyncClient") as MockClient:
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        MockClient.return_value.__aenter__.return_value = mock_client_instance
-        
-        # Should fallback to the beta version
-        ver_data = await find_mod_version_for_mc("slug-123", "fabric", "1.21.1")
-        
-        assert ver_data == {"id": "ver_beta_123", "version_number": "1.2.4-beta"}
-        print("\nSUCCESS: Fallback to beta version works")
-
-@pytest.mark.asyncio
-async def test_find_mod_version_none():
-    # No versions found
-    mock_response = MagicMock()
-    mock_response.json.return_value = []
-    mock_response.raise_for_status = MagicMock()
-
-    with patch("httpx.AsyncClient") as MockClient:
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        MockClient.return_value.__aenter__.return_value = mock_client_instance
-        
-        version_id = await find_mod_version_for_mc("slug-123", "fabric", "1.21.1")
-        
-        assert version_id is None
-        print("\nSUCCESS: Returns None when no versions found")
+def test_find_mod_version_fallback_beta(db):
+    versions = [
+        {"id": "ver_beta_123", "version_number": "1.2.4-beta", "version_type": "beta", "date_published": "2023-01-03T00:00:00Z"}
+    ]
+    # Only the beta channel falls back to the beta version
+    assert find_mod_version(db, versions) is None
+    ver_data = find_mod_version(db, versions, channel="beta")
+    assert (ver_data["id"], ver_data["version_number"], ver_data["channel"]) == ("ver_beta_123", "1.2.4-beta", "beta")
 
-if __name__ == "__main__":
-    import sys
-    sys.exit(pytest.main(["-v", "tests/test_modrinth_version_check.py"]))
+def test_find_mod_version_none(db):
+    assert find_mod_version(db, []) is None
@@ -26,8 +26,15 @@ def mock_session_local():
     
 @pytest.fixture
 def mock_modrinth():
-    with patch("app.services.background.get_mod_compatible_versions") as mock:
-        mock.return_value = (["1.21.1"], None)
+    with patch("app.services.background.get_mod_versions") as mock:
+        mock.return_value = ([{
+            "id": "v1",
+            "version_number": "1.0.0",
+            "version_type": "release",
+            "game_versions": ["1.21.1"],
+            "loaders": ["fabric"],
+            "date_published": "2024-06-13T10:00:00.000000Z"
+        }], None)
         yield mock
 
 @pytest.mark.asyncio
@@ -78,9 +85,7 @@ async def test_background_check_runs_with_current_version(db, mock_session_local
     db.commit()
     
     # Run background check
-    # Also mock find_mod_version_for_mc to avoid real API calls
-    with patch("app.services.background.find_mod_version_for_mc", return_value={"id": "v1", "version_number": "1.0.0"}):
-        await check_all_mods()
+    await check_all_mods()
     
     # Check logs
     log = db.query(LogEntry).filter(LogEntry.message.contains("Starting checks against: 1.21.1 (fabric)")).first()
@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion, ModOutcome
+from app.services.background import check_mod_against_targets
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_outcomes.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    db = TestingSessionLocal()
+    db.add_all([
+        MCVersion(version="1.21", loader="fabric"),
+        MCVersion(version="1.21", loader="forge"),
+        MCVersion(version="1.20", loader="fabric"),
+    ])
+    db.add_all([
+        TrackedMod(slug="mod-a", side="server", channel="release"),
+        TrackedMod(slug="mod-b", side="client", channel="release"),
+        TrackedMod(slug="mod-c", side="both", channel="release"),
+    ])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+async def check(slug, compatible_versions, error=None):
+    """Run a check with Modrinth mocked: one catalog version per loader supporting the given game versions"""
+    catalog = [
+        {"id": f"{slug}-{loader}", "version_number": "1.0", "version_type": "release",
+         "game_versions": game_versions, "loaders": [loader], "date_published": "2024-01-01T00:00:00Z"}
+        for loader, game_versions in compatible_versions.items()
+    ]
+    db = TestingSessionLocal()
+    with patch("app.services.background.get_mod_versions", AsyncMock(return_value=([], error) if error else (catalog, None))):
+        mod = db.query(TrackedMod).filter_by(slug=slug).first()
+        await check_mod_against_targets(db, mod, db.query(MCVersion).all())
+    db.close()
+
+@pytest.mark.asyncio
+async def test_incompatible_and_errored_outcomes_are_kept():
+    await check("mod-a", {}, error="HTTP 500")
+    await check("mod-b", {"fabric": ["1.20"], "forge": ["1.21"]})
+
+    await check("mod-c", {"fabric": ["1.21"]})
+
+    states = {(o["slug"], o["mc_version"], o["loader"]): o["state"] for o in client.get("/api/results/outcomes").json()}
+    assert states[("mod-a", "1.21", "fabric")] == "error"
+    assert states[("mod-b", "1.20", "fabric")] == "compatible"
+    assert states[("mod-b", "1.21", "fabric")] == "incompatible"
+    assert states[("mod-c", "1.21", "fabric")] == "compatible"
+    assert states[("mod-c", "1.21", "forge")] == "incompatible"
+
+    incompatible = client.get("/api/results/outcomes", params={"state": "incompatible", "loader": "fabric"}).json()
+    assert {(o["slug"], o["mc_version"]) for o in incompatible} == {("mod-b", "1.21"), ("mod-c", "1.20")}
+    assert client.get("/api/results/outcomes", params={"state": "maybe"}).status_code == 400
+
+    # Totals count checked mods, so an incompatible one is no longer invisible
+    summaries = {(s["mc_version"], s["loader"]): s for s in client.get("/api/results/summaries").json()}
+    fabric = summaries[("1.21", "fabric")]
+    assert fabric["compatible"] == 1 and fabric["total"] == 3
+    assert fabric["server_compatible"] == 1 and fabric["server_total"] == 2
+    assert summaries[("1.21", "forge")]["compatible"] == 1
+
+    matrix = client.get("/api/results/matrix", params={"mc_version": "1.21"}).json()
+    width = len(matrix["targets"])
+    loaders = [t["loader"] for t in matrix["targets"]]
+    row = matrix["slugs"].index("mod-b")
+    cells = {loaders[j]: matrix["statuses"][matrix["status_codes"][row * width + j]] for j in range(width)}
+    assert cells == {"fabric": "incompatible", "forge": "compatible"}
+
+@pytest.mark.asyncio
+async def test_recheck_replaces_outcome():
+    await check("mod-c", {"fabric": ["1.21"]})
+    await check("mod-c", {"fabric": ["1.20"]})
+
+    states = {(o["mc_version"], o["loader"]): o["state"]
+              for o in client.get("/api/results/outcomes", params={"side": "both"}).json()}
+    # The newer outcome replaces the earlier one
+    assert states[("1.21", "fabric")] == "incompatible"
+    assert states[("1.20", "fabric")] == "compatible"
+
+    # Deleting a target forgets it in every bitset, and removing the mod drops its row
+    db = TestingSessionLocal()
+    forge_id = db.query(MCVersion).filter_by(loader="forge").first().id
+    db.close()
+    client.delete(f"/api/versions/{forge_id}")
+    client.delete("/api/mods/mod-c")
+    db = TestingSessionLocal()
+    assert db.query(ModOutcome).count() == 0
+    db.close()
@@ -0,0 +1,213 @@
+import pytest
+import yaml
+from datetime import datetime
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion, Profile, ProfileMod, LogEntry
+from app.services import background
+from app.services.dependencies import clear_dependency_memo
+from app.services.profiles import resolve_profile, profile_targets
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_profiles.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+def version(version_id, version_type, game_versions, dependencies=()):
+    return {"id": version_id, "version_number": version_id, "version_type": version_type,
+            "game_versions": game_versions, "loaders": ["fabric"], "date_published": "2024-01-01T00:00:00Z",
+            "dependencies": list(dependencies)}
+
+API = {"project_id": "API", "version_id": None, "dependency_type": "required"}
+
+CATALOGS = {
+    "shared-mod": [version("shared-rel", "release", ["1.20"]), version("shared-beta", "beta", ["1.20", "1.21"])],
+    "server-mod": [version("server-rel", "release", ["1.20", "1.21"], [API])],
+}
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    clear_dependency_memo()
+    db = TestingSessionLocal()
+    db.add_all([
+        MCVersion(version="1.20", loader="fabric", type="release", release_time=datetime(2024, 1, 1)),
+        MCVersion(version="1.21", loader="fabric", type="release", release_time=datetime(2024, 6, 1)),
+    ])
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def create_profile(name, mods):
+    profile = client.post("/api/profiles", json={"name": name, "mc_version": "1.20", "loader": "fabric"}).json()
+    with patch("app.routers.profiles.check_single_mod_task", AsyncMock()):
+        for slug, side, channel in mods:
+            response = client.post(f"/api/profiles/{profile['id']}/mods", json={"slug": slug, "side": side, "channel": channel})
+            assert response.status_code == 200
+    return response.json()
+
+async def sweep():
+    fetch = AsyncMock(side_effect=lambda slug, project_id=None: (CATALOGS[slug], None))
+    with patch("app.services.background.SessionLocal", TestingSessionLocal), \
+         patch("app.services.background.sync_versions", AsyncMock()), \
+         patch("app.services.background.get_mods_details", AsyncMock(return_value={})), \
+         patch("app.services.background.get_mod_versions", fetch):
+        await background.check_all_mods()
+    return fetch
+
+@pytest.mark.asyncio
+async def test_profiles_share_one_fetch_per_project():
+    stable = create_profile("stable", [("shared-mod", "both", "release"), ("server-mod", "server", "release")])
+    testing = create_profile("testing", [("shared-mod", "both", "beta")])
+    assert [m["slug"] for m in stable["mods"]] == ["shared-mod", "server-mod"]
+
+    fetch = await sweep()
+    assert sorted(call.args[0] for call in fetch.call_args_list) == ["server-mod", "shared-mod"]
+
+    # Each profile resolves the shared catalog with its own channel
+    def statuses(profile):
+        results = client.get(f"/api/profiles/{profile['id']}/results").json()
+        return {(r["mod_slug"], r["mc_version"]): (r["status"], r["version_id"]) for r in results}
+
+    assert statuses(stable) == {
+        ("shared-mod", "1.20"): ("compatible", "shared-rel"),
+        ("shared-mod", "1.21"): ("incompatible", None),
+        ("server-mod", "1.20"): ("compatible", "server-rel"),
+        ("server-mod", "1.21"): ("compatible", "server-rel"),
+    }
+    assert statuses(testing) == {
+        ("shared-mod", "1.20"): ("compatible", "shared-rel"),
+        ("shared-mod", "1.21"): ("compatible", "shared-beta"),
+    }
+
+    # Exports add the missing dependencies like the global export
+    api_versions = AsyncMock(return_value=([version("api-1", "release", ["1.20"])], None))
+    with patch("app.services.dependencies.get_mod_versions", api_versions), \
+         patch("app.services.dependencies.get_mods_details", AsyncMock(return_value={"API": {"slug": "fabric-api"}})):
+        data = client.get(f"/api/profiles/{stable['id']}/export").json()
+    env = yaml.safe_load(data["yaml"])["services"]["mc"]["environment"]
+    assert env["MODRINTH_PROJECTS"].split() == ["shared-mod:shared-rel", "server-mod:server-rel", "fabric-api:api-1"]
+    assert data["dependencies"]["missing"][0]["required_by"] == ["server-mod"]
+
+    response = client.get(f"/api/profiles/{stable['id']}/export", params={"mc_version": "1.21", "loader": "fabric"})
+    assert response.status_code == 400
+    assert "shared-mod" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_project_id_reuses_the_tracked_mod():
+    db = TestingSessionLocal()
+    db.add(TrackedMod(slug="shared-mod", project_id="P1", project_id_checked_at=datetime.utcnow(), side="both"))
+    db.commit()
+    db.close()
+    create_profile("stable", [("shared-mod", "both", "release")])
+    other = create_profile("other", [("P1", "server", "release")])
+    assert other["mods"] == [{"slug": "shared-mod", "side": "server", "channel": "release"}]
+
+    fetch = await sweep()
+    fetch.assert_called_once()
+
+    for profile in client.get("/api/profiles").json():
+        results = client.get(f"/api/profiles/{profile['id']}/results").json()
+        assert [r["status"] for r in results if r["mc_version"] == "1.20"] == ["compatible"]
+
+@pytest.mark.asyncio
+async def test_profile_only_mods_stay_out_of_global_views():
+    profile = create_profile("stable", [("server-mod", "server", "release")])
+    db = TestingSessionLocal()
+    db.query(MCVersion).filter_by(version="1.20").update({"is_current": True})
+    db.commit()
+    db.close()
+    fetch = await sweep()
+    fetch.assert_called_once()
+
+    # Fetched for the profile, but not listed, checked or exported globally
+    assert client.get("/api/mods").json() == []
+    assert client.get("/api/results").json() == []
+    assert client.get("/api/mods/export", params={"mc_version": "1.20", "loader": "fabric"}).status_code == 400
+    assert client.patch("/api/mods/server-mod/side", json={"side": "both"}).status_code == 404
+    assert client.get(f"/api/profiles/{profile['id']}/results").json()[0]["status"] == "compatible"
+
+    # Removing it from its last profile stops tracking it
+    client.delete(f"/api/profiles/{profile['id']}/mods/server-mod")
+    db = TestingSessionLocal()
+    assert db.query(TrackedMod).count() == 0
+    db.close()
+
+def test_profile_only_mods_are_adopted_and_dropped_with_their_profiles():
+    first = create_profile("first", [("server-mod", "server", "release")])
+    second = create_profile("second", [("server-mod", "server", "release"), ("shared-mod", "both", "release")])
+
+    # Deleting a profile keeps the mods another profile still uses
+    client.delete(f"/api/profiles/{second['id']}")
+    db = TestingSessionLocal()
+    assert [m.slug for m in db.query(TrackedMod).all()] == ["server-mod"]
+    db.close()
+
+    # Adding it globally adopts the row with the global side and channel
+    with patch("app.routers.mods.check_single_mod_task", AsyncMock()):
+        response = client.post("/api/mods", json={"slug": "server-mod", "side": "both", "channel": "beta"})
+    assert response.status_code == 200
+    assert [(m["slug"], m["side"]) for m in client.get("/api/mods").json()] == [("server-mod", "both")]
+    client.delete(f"/api/profiles/{first['id']}")
+    assert [m["slug"] for m in client.get("/api/mods").json()] == ["server-mod"]
+
+    # Removing a tracked mod removes it from profiles as well
+    third = create_profile("third", [("server-mod", "server", "release")])
+    client.delete("/api/mods/server-mod")
+    db = TestingSessionLocal()
+    assert db.query(ProfileMod).count() == 0
+    db.close()
+    assert client.get("/api/profiles").json()[0]["id"] == third["id"]
+
+def test_profile_mod_updates_are_logged():
+    profile = create_profile("stable", [("server-mod", "server", "release")])
+    response = client.patch(f"/api/profiles/{profile['id']}/mods/server-mod", json={"channel": "beta"})
+    assert response.json()["mods"] == [{"slug": "server-mod", "side": "server", "channel": "beta"}]
+    db = TestingSessionLocal()
+    assert db.query(LogEntry).filter(LogEntry.message.like("Mod server-mod in profile stable updated%")).count() == 1
+    db.close()
+
+@pytest.mark.asyncio
+async def test_profile_resolves_all_mods_in_one_query():
+    profile = create_profile("stable", [("shared-mod", "both", "release"), ("server-mod", "server", "release")])
+    await sweep()
+
+    db = TestingSessionLocal()
+    stored = db.get(Profile, profile["id"])
+    targets = profile_targets(db, stored)
+    mods = list(stored.mods)
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine_test, "before_cursor_execute", listener)
+    try:
+        resolved = resolve_profile(db, stored, targets)
+    finally:
+        event.remove(engine_test, "before_cursor_execute", listener)
+    db.close()
+
+    assert len(statements) == 1
+    assert set(resolved) == {m.mod_slug for m in mods}
+
+def test_version_and_loader_go_together():
+    response = client.post("/api/profiles", json={"name": "half", "mc_version": "1.20"})
+    assert response.status_code == 400
+    profile = create_profile("stable", [("server-mod", "server", "release")])
+    response = client.get(f"/api/profiles/{profile['id']}/export", params={"loader": "fabric"})
+    assert response.status_code == 400
@@ -0,0 +1,69 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.all import LogEntry, MCVersion, TrackedMod
+from app.services.background import check_mod_against_targets, refresh_project_ids
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_project_ids.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    db = TestingSessionLocal()
+    db.add_all([
+        TrackedMod(slug="sodium", side="client", channel="release"),
+        TrackedMod(slug="old-name", side="both", channel="release", project_id="AANobbMI",
+                   project_id_checked_at=datetime.utcnow() - timedelta(days=2)),
+        TrackedMod(slug="lithium", side="both", channel="release", project_id="gvQqBUqZ",
+                   project_id_checked_at=datetime.utcnow()),
+    ])
+    db.add(MCVersion(version="1.21", loader="fabric"))
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def project(project_id, slug):
+    return {"id": project_id, "slug": slug, "client_side": "required", "server_side": "optional"}
+
+@pytest.mark.asyncio
+async def test_refresh_resolves_missing_and_stale_ids():
+    details = AsyncMock(return_value={
+        "sodium": project("P7dR8mSH", "sodium"),
+        "AANobbMI": project("AANobbMI", "new-name"),
+    })
+    db = TestingSessionLocal()
+    with patch("app.services.background.get_mods_details", details):
+        await refresh_project_ids(db, db.query(TrackedMod).all())
+
+    # Known ids are looked up by id, fresh ones aren't revalidated
+    assert sorted(details.call_args.args[0]) == ["AANobbMI", "sodium"]
+
+    mods = {m.slug: m for m in db.query(TrackedMod).all()}
+    assert mods["sodium"].project_id == "P7dR8mSH"
+    assert mods["sodium"].supported_client_side == "required"
+    assert mods["old-name"].project_id == "AANobbMI"
+    assert db.query(LogEntry).filter(LogEntry.message == "Mod old-name was renamed to new-name on Modrinth").count() == 1
+
+    # Nothing is stale any more
+    details.reset_mock()
+    await refresh_project_ids(db, db.query(TrackedMod).all())
+    details.assert_not_called()
+    db.close()
+
+@pytest.mark.asyncio
+async def test_versions_are_fetched_by_project_id():
+    versions = AsyncMock(return_value=([], None))
+    db = TestingSessionLocal()
+    with patch("app.services.background.get_mod_versions", versions):
+        mod = db.query(TrackedMod).filter_by(slug="old-name").first()
+        await check_mod_against_targets(db, mod, db.query(MCVersion).all())
+    versions.assert_called_once_with("old-name", "AANobbMI")
+    db.close()
@@ -0,0 +1,142 @@
+import time
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion, ModVersion, CompatibilityResult
+from app.routers.results import _results_from_model, _results_from_sql, RESULT_FIELDS
+from app.services.outcomes import load_outcomes
+from app.services.read_model import get_read_model
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_read_model.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def wait_for_model(db, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        model = get_read_model(db)
+        if model is not None:
+            return model
+        time.sleep(0.02)
+    raise AssertionError("read model did not warm up")
+
+def seed():
+    db = TestingSessionLocal()
+    base = datetime(2024, 1, 1)
+    targets = [
+        MCVersion(version="1.20", loader="fabric", release_time=base),
+        MCVersion(version="1.21", loader="fabric", release_time=base + timedelta(days=100)),
+        MCVersion(version="1.21", loader="forge"),
+    ]
+    db.add_all(targets)
+    sides = ["server", "client", "both"]
+    for i in range(9):
+        db.add(TrackedMod(slug=f"mod-{i}", side=sides[i % 3], channel="release"))
+    db.flush()
+    for i in range(9):
+        for j, target in enumerate(targets):
+            if (i + j) % 4 == 0:
+                continue
+            mv = ModVersion(mod_slug=f"mod-{i}", version_id=f"v{i}-{j}", version_number="1.0",
+                            mc_version_id=target.id, loader=target.loader, channel="release")
+            db.add(mv)
+            db.flush()
+            db.add(CompatibilityResult(
+                mod_version_id=mv.id, mc_version_id=target.id,
+                status=["compatible", "incompatible", "error"][(i * j) % 3],
+                checked_at=base + timedelta(hours=i % 2)
+            ))
+    db.commit()
+    db.close()
+
+def test_model_matches_sql():
+    seed()
+    db = TestingSessionLocal()
+    model = wait_for_model(db)
+    selected = list(RESULT_FIELDS)
+
+    filters = [
+        {},
+        {"mc_version": "1.21", "loader": "fabric"},
+        {"loader": "forge", "side": "server"},
+        {"mod_slug": "mod-4", "status": "compatible"},
+        {"side": "both"},
+        {"side": "client", "status": "error"},
+    ]
+    for f in filters:
+        args = [f.get(k) for k in ("mc_version", "loader", "side", "status", "mod_slug")]
+        assert _results_from_model(model, selected, *args, None, None, None) == \
+            _results_from_sql(db, selected, *args, None, None, None)
+
+    # Walking pages gives the same rows and cursors on both paths
+    cursor = None
+    while True:
+        from_model = _results_from_model(model, selected, None, None, None, None, None, None, 4, cursor)
+        from_sql = _results_from_sql(db, selected, None, None, None, None, None, None, 4, cursor)
+        assert from_model == from_sql
+        cursor = from_model[1]
+        if not cursor:
+            break
+    db.close()
+
+    response = client.get("/api/results/summaries").json()
+    assert [s["mc_version"] for s in response] == ["1.20", "1.21", "1.21"]
+
+def test_model_follows_commits():
+    seed()
+    db = TestingSessionLocal()
+    before = wait_for_model(db)
+
+    client.delete("/api/mods/mod-0")
+    assert get_read_model(db) is None or get_read_model(db).version != before.version
+
+    model = wait_for_model(db)
+    assert "mod-0" not in model.by_slug
+    assert all(r["mod_slug"] != "mod-0" for r in client.get("/api/results").json())
+    db.close()
+
+def test_commits_patch_the_model_in_place():
+    seed()
+    db = TestingSessionLocal()
+    before = wait_for_model(db)
+
+    # A commit touching one mod reloads only that mod's results, without a full rebuild
+    with patch("app.services.read_model.build_read_model", side_effect=AssertionError("rebuilt")):
+        result = db.query(CompatibilityResult).join(ModVersion).filter(ModVersion.mod_slug == "mod-1").first()
+        result.status = "compatible"
+        mv = result.mod_version
+        db.add(ModVersion(mod_slug="mod-1", version_id="installed", version_number="0.9",
+                          mc_version_id=mv.mc_version_id, loader=mv.loader, channel="release", installed=True))
+        db.commit()
+        model = wait_for_model(db)
+
+    assert model.version != before.version
+    assert model.by_slug["mod-2"][0] is before.by_slug["mod-2"][0]
+    selected = list(RESULT_FIELDS)
+    assert _results_from_model(model, selected, None, None, None, None, None, None, None, None) == \
+        _results_from_sql(db, selected, None, None, None, None, None, None, None, None)
+    assert model.outcomes.counts(mv.mc_version_id) == load_outcomes(db).counts(mv.mc_version_id)
+    db.close()
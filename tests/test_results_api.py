@@ -0,0 +1,162 @@
+import base64
+import csv
+import io
+import json
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, ModVersion, MCVersion, CompatibilityResult
+from app.services.read_model import get_read_model
+from datetime import datetime, timedelta
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_pagination.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    db = TestingSessionLocal()
+
+    now = datetime.utcnow()
+    v_old = MCVersion(version="1.21.1", loader="fabric", type="release", release_time=now - timedelta(days=30))
+    v_new = MCVersion(version="1.21.2", loader="fabric", type="release", release_time=now)
+    v_manual = MCVersion(version="1.21.3", loader="fabric", type="release", release_time=None)
+    db.add_all([v_old, v_new, v_manual])
+    db.commit()
+
+    for i in range(5):
+        slug = f"mod-{i}"
+        db.add(TrackedMod(slug=slug, side="server" if i % 2 else "client", channel="release"))
+        db.flush()
+        for mc_ver in [v_old, v_new, v_manual]:
+            mv = ModVersion(mod_slug=slug, version_id=f"{slug}-{mc_ver.id}", version_number="1.0.0",
+                            mc_version_id=mc_ver.id, loader="fabric", channel="release")
+            db.add(mv)
+            db.flush()
+            db.add(CompatibilityResult(mod_version_id=mv.id, mc_version_id=mc_ver.id,
+                                       status="compatible" if i != 4 else "error", checked_at=now))
+    db.commit()
+    db.close()
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def test_keyset_pagination_matches_full_listing():
+    full = client.get("/api/results").json()
+    assert len(full) == 15
+
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": 4}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/results", params=params)
+        assert response.status_code == 200
+        pages.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert [r["id"] for r in pages] == [r["id"] for r in full]
+
+def test_fields_projection():
+    response = client.get("/api/results?fields=mod_slug,status")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 15
+    assert set(data[0].keys()) == {"mod_slug", "status"}
+
+    response = client.get("/api/results?fields=mod_slug,bogus")
+    assert response.status_code == 400
+
+def test_status_and_slug_filters():
+    data = client.get("/api/results?status=error").json()
+    assert len(data) == 3
+    assert all(r["mod_slug"] == "mod-4" for r in data)
+
+    data = client.get("/api/results?mod_slug=mod-1&side=server").json()
+    assert len(data) == 3
+    assert client.get("/api/results?mod_slug=mod-1&side=client").json() == []
+
+def test_invalid_cursor():
+    response = client.get("/api/results?limit=2&cursor=not-a-cursor")
+    assert response.status_code == 400
+
+def test_cursor_with_timezone():
+    def cursor(offset):
+        payload = ["mod-1", f"2024-01-01T00:00:00{offset}", f"2024-01-01T00:00:00{offset}", 1]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    # Served from SQL first, then from the warmed read model; aware timestamps compare as UTC on both
+    db = TestingSessionLocal()
+    for _ in range(2):
+        naive = client.get("/api/results", params={"limit": 1, "cursor": cursor("")})
+        aware = client.get("/api/results", params={"limit": 1, "cursor": cursor("+00:00")})
+        assert aware.status_code == 200
+        assert aware.json() == naive.json()
+        deadline = time.time() + 5
+        while get_read_model(db) is None and time.time() < deadline:
+            time.sleep(0.02)
+    assert get_read_model(db) is not None
+    db.close()
+
+def test_streaming_export_ndjson():
+    response = client.get("/api/results/export?format=ndjson&status=error")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 3
+    assert all(line["mod_slug"] == "mod-4" for line in lines)
+
+def test_streaming_export_csv():
+    response = client.get("/api/results/export?format=csv")
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 15
+    assert [int(r["id"]) for r in rows] == [r["id"] for r in client.get("/api/results").json()]
+
+    assert client.get("/api/results/export?format=xml").status_code == 400
+
+def test_matrix_columns():
+    response = client.get("/api/results/matrix")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["slugs"] == [f"mod-{i}" for i in range(5)]
+    # Newest release first, versions without a release time last
+    assert [t["version"] for t in data["targets"]] == ["1.21.2", "1.21.1", "1.21.3"]
+
+    width = len(data["targets"])
+    assert len(data["status_codes"]) == len(data["slugs"]) * width
+
+    def cell(slug, version):
+        i = data["slugs"].index(slug)
+        j = [t["version"] for t in data["targets"]].index(version)
+        code = data["status_codes"][i * width + j]
+        return data["statuses"][code], data["version_ids"][data["version_codes"][i * width + j]]
+
+    status, version_id = cell("mod-1", "1.21.1")
+    assert status == "compatible"
+    assert version_id.startswith("mod-1-")
+    assert cell("mod-4", "1.21.2")[0] == "error"
+
+    server_only = client.get("/api/results/matrix?side=server&mc_version=1.21.1").json()
+    assert server_only["slugs"] == ["mod-1", "mod-3"]
+    assert len(server_only["targets"]) == 1
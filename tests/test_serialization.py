@@ -0,0 +1,68 @@
+import pytest
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.core.serialization import dumps
+from app.models.all import TrackedMod, MCVersion, LogEntry
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_serialization.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def test_naive_datetimes_are_utc():
+    assert dumps({"at": datetime(2024, 1, 2, 3, 4, 5)}) == b'{"at":"2024-01-02T03:04:05Z"}'
+
+def test_list_endpoints_keep_schema_format():
+    db = TestingSessionLocal()
+    db.add(MCVersion(version="1.21", loader="fabric", release_time=datetime(2024, 6, 13, 8, 0, 0), is_current=True))
+    db.add(TrackedMod(slug="mod-a", side="server", channel="release", created_at=datetime(2024, 1, 1)))
+    db.add(LogEntry(level="INFO", message="hello", created_at=datetime(2024, 1, 1, 12, 0, 0)))
+    db.commit()
+    db.close()
+
+    versions = client.get("/api/versions").json()
+    assert versions == [{
+        "id": 1, "version": "1.21", "loader": "fabric", "type": None,
+        "release_time": "2024-06-13T08:00:00Z", "is_current": True
+    }]
+
+    mods = client.get("/api/mods").json()
+    assert mods[0]["slug"] == "mod-a"
+    assert mods[0]["created_at"] == "2024-01-01T00:00:00Z"
+
+    logs = client.get("/api/logs").json()
+    assert logs[0]["created_at"] == "2024-01-01T12:00:00Z"
+
+def test_large_responses_are_compressed():
+    db = TestingSessionLocal()
+    db.add_all([TrackedMod(slug=f"mod-{i}", side="server", channel="release") for i in range(100)])
+    db.commit()
+    db.close()
+
+    response = client.get("/api/mods", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()) == 100
+
+    response = client.get("/api/versions", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
@@ -0,0 +1,78 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, ModVersion, MCVersion, CompatibilityResult
+from datetime import datetime
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_summaries.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def test_summaries_all_versions():
+    db = TestingSessionLocal()
+
+    v1 = MCVersion(version="1.21.1", loader="fabric", type="release", release_time=datetime.utcnow())
+    v2 = MCVersion(version="1.21.1", loader="forge", type="release", release_time=datetime.utcnow())
+    v3 = MCVersion(version="1.21.2", loader="fabric", type="release", release_time=datetime.utcnow())
+    db.add_all([v1, v2, v3])
+    db.add_all([
+        TrackedMod(slug="mod-server", side="server", channel="release"),
+        TrackedMod(slug="mod-both", side="both", channel="release"),
+        TrackedMod(slug="mod-client", side="client", channel="release"),
+    ])
+    db.commit()
+
+    # 1.21.1 fabric: all three compatible, 1.21.1 forge: only the client mod
+    for mc_ver, slugs in [(v1, ["mod-server", "mod-both", "mod-client"]), (v2, ["mod-client"])]:
+        for slug in slugs:
+            mv = ModVersion(mod_slug=slug, version_id=f"{slug}-{mc_ver.id}", version_number="1.0.0",
+                            mc_version_id=mc_ver.id, loader=mc_ver.loader, channel="release")
+            db.add(mv)
+            db.flush()
+            db.add(CompatibilityResult(mod_version_id=mv.id, mc_version_id=mc_ver.id, status="compatible"))
+    db.commit()
+    db.close()
+
+    response = client.get("/api/results/summaries")
+    assert response.status_code == 200
+    data = {(s["mc_version"], s["loader"]): s for s in response.json()}
+
+    # Every tracked version is listed, even without results
+    assert len(data) == 3
+
+    fabric = data[("1.21.1", "fabric")]
+    assert fabric["compatible"] == 3 and fabric["total"] == 3
+    assert fabric["server_compatible"] == 2 and fabric["server_total"] == 2
+    assert fabric["client_compatible"] == 2 and fabric["client_total"] == 2
+
+    forge = data[("1.21.1", "forge")]
+    assert forge["server_total"] == 0
+    assert forge["client_compatible"] == 1 and forge["client_total"] == 1
+
+    assert data[("1.21.2", "fabric")]["total"] == 0
+
+    # Matches the per-version endpoint
+    single = client.get("/api/results/summary?mc_version=1.21.1&loader=fabric").json()
+    for key, value in single.items():
+        assert fabric[key] == value
@@ -0,0 +1,105 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.core.database import Base, get_db
+from app.models.all import TrackedMod, MCVersion, ModVersion, CompatibilityResult, LogEntry
+
+# Setup test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_sync.db"
+engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_db():
+    Base.metadata.create_all(bind=engine_test)
+    yield
+    Base.metadata.drop_all(bind=engine_test)
+
+def backdate(since):
+    """Move every existing row before the given point"""
+    old = since - timedelta(minutes=1)
+    db = TestingSessionLocal()
+    db.query(MCVersion).update({MCVersion.updated_at: old})
+    db.query(TrackedMod).update({TrackedMod.updated_at: old})
+    db.query(CompatibilityResult).update({CompatibilityResult.updated_at: old})
+    db.query(LogEntry).update({LogEntry.created_at: old})
+    db.commit()
+    db.close()
+
+def test_mods_delta_with_tombstones():
+    db = TestingSessionLocal()
+    db.add_all([TrackedMod(slug=slug, side="server", channel="release") for slug in ["mod-a", "mod-b", "mod-c"]])
+    db.commit()
+    db.close()
+
+    response = client.get("/api/mods")
+    assert len(response.json()) == 3
+    token = response.headers["X-Sync-Token"]
+    backdate(datetime.fromisoformat(token.rstrip("Z")))
+
+    client.patch("/api/mods/mod-a/side", json={"side": "both"})
+    client.delete("/api/mods/mod-b")
+
+    delta = client.get("/api/mods", params={"since": token}).json()
+    assert [m["slug"] for m in delta["changed"]] == ["mod-a"]
+    assert delta["changed"][0]["side"] == "both"
+    assert delta["deleted"] == ["mod-b"]
+    assert delta["sync_token"].endswith("Z")
+
+def test_versions_and_results_delta():
+    db = TestingSessionLocal()
+    v1 = MCVersion(version="1.21", loader="fabric", is_current=True)
+    v2 = MCVersion(version="1.20", loader="fabric")
+    mod = TrackedMod(slug="mod-a", side="server", channel="release")
+    db.add_all([v1, v2, mod])
+    db.flush()
+    mv = ModVersion(mod_slug="mod-a", version_id="v1", version_number="1.0", mc_version_id=v1.id, loader="fabric", channel="release")
+    mv2 = ModVersion(mod_slug="mod-a", version_id="v2", version_number="0.9", mc_version_id=v2.id, loader="fabric", channel="release")
+    db.add_all([mv, mv2])
+    db.flush()
+    db.add(CompatibilityResult(mod_version_id=mv.id, mc_version_id=v1.id, status="compatible"))
+    db.add(CompatibilityResult(mod_version_id=mv2.id, mc_version_id=v2.id, status="compatible"))
+    db.commit()
+    v2_id = v2.id
+    db.close()
+
+    since = datetime.utcnow()
+    backdate(since)
+
+    assert client.get("/api/versions", params={"since": since.isoformat()}).json()["changed"] == []
+    assert client.get("/api/results", params={"since": since.isoformat()}).json()["changed"] == []
+
+    client.delete(f"/api/versions/{v2_id}")
+    delta = client.get("/api/versions", params={"since": since.isoformat()}).json()
+    assert delta["changed"] == []
+    assert delta["deleted"] == [v2_id]
+    # The deleted version's results leave tombstones
+    assert client.get("/api/results", params={"since": since.isoformat()}).json()["deleted"] == [2]
+
+    # Removing the mod cascades to its results, which leave tombstones too
+    client.delete("/api/mods/mod-a")
+    delta = client.get("/api/results", params={"since": since.isoformat()}).json()
+    assert delta["changed"] == []
+    assert delta["deleted"] == [2, 1]
+
+    logs = client.get("/api/logs", params={"since": since.isoformat()}).json()
+    assert {log["message"] for log in logs["changed"]} >= {"Version 1.20 (fabric) deleted"}
+    assert logs["deleted"] == []
+
+def test_expired_token():
+    response = client.get("/api/mods", params={"since": "2000-01-01T00:00:00Z"})
+    assert response.status_code == 410
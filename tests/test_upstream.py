@@ -0,0 +1,141 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import modrinth
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    modrinth._coalescing.clear()
+    yield
+    modrinth._coalescing.clear()
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_request():
+    requests = []
+
+    async def fetch(slug, project_id):
+        requests.append(project_id or slug)
+        await asyncio.sleep(0.01)
+        return [{"id": "v1"}], None
+
+    with patch("app.services.modrinth._fetch_mod_versions", fetch):
+        results = await asyncio.gather(
+            modrinth.get_mod_versions("sodium", "AANobbMI"),
+            modrinth.get_mod_versions("sodium", "AANobbMI"),
+            modrinth.get_mod_versions("lithium"),
+        )
+        # Once finished, the next call is a new request
+        await modrinth.get_mod_versions("sodium", "AANobbMI")
+
+    assert requests == ["AANobbMI", "lithium", "AANobbMI"]
+    assert results[0] is results[1]
+    assert modrinth.coalescing_stats() == {"project_versions": {"calls": 4, "deduplicated": 1}}
+
+    stats = client.get("/api/upstream/stats").json()
+    assert stats["coalescing"]["project_versions"] == {"calls": 4, "deduplicated": 1}
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_and_not_cached():
+    calls = 0
+
+    async def fetch(slug):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    with patch("app.services.modrinth._fetch_mod_details", fetch):
+        results = await asyncio.gather(
+            modrinth.get_mod_details("sodium"), modrinth.get_mod_details("sodium"), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        with pytest.raises(RuntimeError):
+            await modrinth.get_mod_details("sodium")
+    assert calls == 2
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_leaves_shared_batch_running():
+    async def get(client, endpoint, url, **kwargs):
+        await asyncio.sleep(0.02)
+        # The shared request must not depend on a client owned by a caller that left
+        assert not client.is_closed
+        return FakeResponse([{"id": "v1"}])
+
+    with patch("app.services.modrinth.hedged_get", get):
+        first = asyncio.ensure_future(modrinth.get_versions(["v1"]))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(modrinth.get_versions(["v1"]))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        assert await second == {"v1": {"id": "v1"}}
+    assert modrinth.coalescing_stats() == {"versions": {"calls": 2, "deduplicated": 1}}
+
+class SlowOnce:
+    """Fake client whose first request hangs for `delay` seconds, later ones answer at once"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    async def get(self, url, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(self.delay)
+            return "slow"
+        return "fast"
+
+@pytest.fixture
+def hedging():
+    modrinth._latencies.clear()
+    modrinth._hedging.clear()
+    modrinth._requests_total = modrinth._hedges_total = 0
+    with patch.object(modrinth.settings, "HEDGE_REQUESTS", True), \
+         patch.object(modrinth.settings, "HEDGE_MAX_RATIO", 0.5):
+        modrinth._latencies["project"] = modrinth.deque([0.01] * modrinth.LATENCY_MIN_SAMPLES)
+        yield
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged(hedging):
+    # Pad the request count so the cap leaves room for a hedge
+    modrinth._requests_total = 10
+    fake = SlowOnce(delay=1)
+    assert await modrinth.hedged_get(fake, "project", "https://example.com") == "fast"
+    assert fake.calls == 2
+    assert modrinth.hedging_stats()["project"]["hedge_wins"] == 1
+    # The winning hedge is sampled from its own start, not from the primary's
+    assert modrinth._latencies["project"][-1] < 0.01
+
+    stats = client.get("/api/upstream/stats").json()
+    assert stats["hedging_enabled"] is True
+    assert stats["hedging"]["project"]["hedged"] == 1
+
+@pytest.mark.asyncio
+async def test_hedges_are_capped(hedging):
+    # A first request has no budget: one hedge would be all of one request, the cap is half
+    fake = SlowOnce(delay=0.05)
+    assert await modrinth.hedged_get(fake, "project", "https://example.com") == "slow"
+    assert fake.calls == 1
+    assert modrinth.hedging_stats()["project"]["hedged"] == 0
+
+@pytest.mark.asyncio
+async def test_no_hedging_without_enough_samples(hedging):
+    modrinth._requests_total = 10
+    modrinth._latencies.clear()
+    fake = SlowOnce(delay=0.05)
+    assert await modrinth.hedged_get(fake, "project", "https://example.com") == "slow"
+    assert fake.calls == 1